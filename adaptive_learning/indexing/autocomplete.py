@@ -0,0 +1,117 @@
+"""
+Autocomplete Module
+
+This module provides the prefix index behind type-ahead topic suggestions in the Adaptive
+Learning System. Suggestions are requested on every keystroke, so completions come from a
+compact sorted array searched by bisection, and the answers for the shortest (and most
+common) prefixes are precomputed.
+
+Key Responsibilities:
+- Store weighted terms in a sorted array keyed by their accent-folded form.
+- Return the highest weighted completions of a prefix, ignoring case and accents.
+- List every term sharing a prefix, for keyword lookups.
+- Precompute the top completions of short prefixes, whose ranges span most of the array.
+
+Dependencies:
+- bisect: For locating the range of terms sharing a prefix.
+- heapq: For selecting the highest weighted terms of a range.
+"""
+
+import bisect
+import heapq
+from typing import Dict, List, Tuple
+
+from .fuzzy import fold_accents
+
+# Sorts after any character that may follow a prefix, closing its range in the array
+_PREFIX_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    """
+    A sorted-array prefix index over weighted terms.
+
+    Terms are kept sorted by their folded form, so all terms sharing a prefix occupy one
+    contiguous range found with two binary searches.
+    """
+
+    def __init__(
+        self,
+        weights: Dict[str, float],
+        top_n: int = 10,
+        precomputed_prefix_length: int = 3,
+    ):
+        """
+        Build the index.
+
+        Args:
+            weights (Dict[str, float]): Terms mapped to their weight (e.g. frequency).
+            top_n (int): Number of completions precomputed per short prefix.
+            precomputed_prefix_length (int): Prefixes up to this length are precomputed.
+        """
+        entries = sorted(
+            (fold_accents(term), term, weight) for term, weight in weights.items()
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.terms = [term for _, term, _ in entries]
+        self.weights = [weight for _, _, weight in entries]
+        self.top_n = top_n
+        self.precomputed_prefix_length = precomputed_prefix_length
+        self._top: Dict[str, List[Tuple[str, float]]] = {}
+        prefixes = {
+            key[:length]
+            for key in self.keys
+            for length in range(1, precomputed_prefix_length + 1)
+        }
+        for prefix in prefixes:
+            self._top[prefix] = self._scan(prefix, top_n)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _scan(self, prefix: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Select the highest weighted terms in the range of a folded prefix.
+        """
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + _PREFIX_END, start)
+        best = heapq.nsmallest(
+            limit,
+            range(start, end),
+            key=lambda i: (-self.weights[i], self.keys[i]),
+        )
+        return [(self.terms[i], self.weights[i]) for i in best]
+
+    def prefix_terms(self, prefix: str) -> List[str]:
+        """
+        Return every term starting with a prefix, ignoring case and accents.
+
+        Args:
+            prefix (str): Prefix to look up.
+
+        Returns:
+            List[str]: Terms in the range of the folded prefix, in folded order.
+        """
+        folded = fold_accents(prefix)
+        start = bisect.bisect_left(self.keys, folded)
+        end = bisect.bisect_left(self.keys, folded + _PREFIX_END, start)
+        return self.terms[start:end]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Return the highest weighted terms starting with a prefix.
+
+        Args:
+            prefix (str): Typed prefix; case and accents are ignored.
+            limit (int): Maximum number of completions.
+
+        Returns:
+            List[Tuple[str, float]]: (term, weight) pairs, highest weight first and
+                alphabetically among equal weights.
+        """
+        folded = fold_accents(prefix.strip())
+        if not folded:
+            return []
+        if len(folded) <= self.precomputed_prefix_length and limit <= self.top_n:
+            return self._top.get(folded, [])[:limit]
+        return self._scan(folded, limit)
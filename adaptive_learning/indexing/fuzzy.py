@@ -0,0 +1,243 @@
+"""
+Fuzzy Matching Module
+
+This module resolves misspelled query terms to terms of a known vocabulary for the Adaptive
+Learning System, so queries such as "loopes", "funcao" or "heranca" still reach the
+documents about loops, funções and herança.
+
+It follows the SymSpell approach: every vocabulary term is stored under all strings obtained
+by deleting up to N characters from it, and a query term is looked up under its own
+deletions. Candidates sharing a deletion are then verified with an edit distance bounded
+by N, so a lookup only compares the query against a handful of terms instead of the whole
+vocabulary.
+
+Key Responsibilities:
+- Fold case and accents so Portuguese terms typed without diacritics match exactly.
+- Build a deletion dictionary over a vocabulary with term frequencies, and extend it with
+  new terms.
+- Return the vocabulary terms within a configurable edit distance, closest and most
+  frequent first.
+
+Dependencies:
+- copy: For matchers sharing a deletion dictionary.
+- unicodedata: For removing diacritics from terms.
+"""
+
+import copy
+import unicodedata
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+DEFAULT_MAX_EDIT_DISTANCE = 2
+# Terms up to this length are matched within a single edit
+SHORT_TERM_LENGTH = 4
+
+
+def fold_accents(text: str) -> str:
+    """
+    Lowercase text and strip its diacritics (e.g. "Função" -> "funcao").
+
+    Args:
+        text (str): Text to fold.
+
+    Returns:
+        str: Folded text.
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in normalized if not unicodedata.combining(char))
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """
+    Compute the optimal string alignment distance between two strings.
+
+    Insertions, deletions, substitutions and transpositions of adjacent characters each
+    cost one edit. The computation stops as soon as the distance exceeds max_distance.
+
+    Args:
+        source (str): First string.
+        target (str): Second string.
+        max_distance (int): Largest distance of interest.
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger than max_distance.
+    """
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if (
+                i > 1
+                and j > 1
+                and source[i - 1] == target[j - 2]
+                and source[i - 2] == target[j - 1]
+            ):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class FuzzyMatcher:
+    """
+    A SymSpell-style deletion dictionary over a vocabulary of terms.
+
+    Only the first prefix_length characters of each term are indexed, which bounds the
+    number of deletions per term while still finding misspellings in longer words. Terms of
+    SHORT_TERM_LENGTH characters or fewer are matched within a single edit.
+    """
+
+    def __init__(
+        self,
+        frequencies: Mapping[str, int],
+        max_edit_distance: int = DEFAULT_MAX_EDIT_DISTANCE,
+        prefix_length: int = 7,
+    ):
+        """
+        Build the deletion dictionary for a vocabulary.
+
+        Args:
+            frequencies (Mapping[str, int]): Vocabulary terms mapped to their frequency,
+                used to rank candidates at the same distance.
+            max_edit_distance (int): Largest edit distance supported by lookups.
+            prefix_length (int): Number of leading characters indexed per term.
+        """
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.frequencies = frequencies
+        # Folded term -> vocabulary terms that fold to it (e.g. "funcao" -> ["função"])
+        self.terms: Dict[str, List[str]] = {}
+        self.deletes: Dict[str, List[str]] = {}
+        self.add_terms(frequencies)
+
+    def add_terms(self, terms: Iterable[str]) -> None:
+        """
+        Add terms to the deletion dictionary.
+
+        The dictionaries are only appended to, so matchers sharing them with
+        with_frequencies can keep looking terms up meanwhile.
+
+        Args:
+            terms (Iterable[str]): Terms to add; terms already present are skipped.
+        """
+        for term in terms:
+            folded = fold_accents(term)
+            if folded in self.terms:
+                if term not in self.terms[folded]:
+                    self.terms[folded].append(term)
+                continue
+            self.terms[folded] = [term]
+            prefix = folded[: self.prefix_length]
+            # Short terms are only reachable within one edit; with two, almost every
+            # short word would be a candidate for every query
+            term_distance = self.max_edit_distance
+            if len(folded) <= SHORT_TERM_LENGTH:
+                term_distance = min(term_distance, 1)
+            for variant in self._variants(prefix, term_distance):
+                self.deletes.setdefault(variant, []).append(folded)
+
+    def with_frequencies(self, frequencies: Mapping[str, int]) -> "FuzzyMatcher":
+        """
+        Return a matcher sharing this one's dictionaries, restricted to other terms.
+
+        Args:
+            frequencies (Mapping[str, int]): Terms that may be returned, mapped to their
+                frequency; dictionary terms missing from it are skipped.
+
+        Returns:
+            FuzzyMatcher: The restricted matcher.
+        """
+        matcher = copy.copy(self)
+        matcher.frequencies = frequencies
+        return matcher
+
+    def _variants(self, word: str, distance: int) -> Set[str]:
+        """
+        Return the word and every string obtained by deleting up to distance characters.
+        """
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {
+                candidate[:i] + candidate[i + 1 :]
+                for candidate in frontier
+                if len(candidate) > 1
+                for i in range(len(candidate))
+            }
+            variants.update(frontier)
+        return variants
+
+    def lookup(
+        self, word: str, max_edit_distance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Find the vocabulary terms within an edit distance of a word.
+
+        Distances are measured after folding case and accents, so a term that differs
+        only in diacritics is returned with distance 0.
+
+        Args:
+            word (str): Word to look up.
+            max_edit_distance (Optional[int]): Largest distance accepted; defaults to, and
+                is capped by, the distance the dictionary was built for.
+
+        Returns:
+            List[Tuple[str, int]]: (term, distance) pairs ordered by distance, then by
+                descending frequency.
+        """
+        distance = self.max_edit_distance
+        if max_edit_distance is not None:
+            distance = min(distance, max_edit_distance)
+        folded = fold_accents(word)
+        if not folded:
+            return []
+
+        candidates: Set[str] = set()
+        for variant in self._variants(folded[: self.prefix_length], distance):
+            candidates.update(self.deletes.get(variant, ()))
+        matches = []
+        for candidate in candidates:
+            candidate_max = distance
+            if len(candidate) <= SHORT_TERM_LENGTH:
+                candidate_max = min(candidate_max, 1)
+            candidate_distance = edit_distance(folded, candidate, candidate_max)
+            if candidate_distance <= candidate_max:
+                for term in self.terms[candidate]:
+                    if term not in self.frequencies:
+                        continue
+                    matches.append((term, candidate_distance))
+        matches.sort(
+            key=lambda match: (match[1], -self.frequencies[match[0]], match[0])
+        )
+        return matches
+
+    def best_match(
+        self, word: str, max_edit_distance: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Return the closest, most frequent vocabulary term for a word.
+
+        Short words tolerate a single edit only, since two edits turn most of them into
+        unrelated terms.
+
+        Args:
+            word (str): Word to look up.
+            max_edit_distance (Optional[int]): Largest distance accepted.
+
+        Returns:
+            Optional[str]: Best matching term, or None if no term is close enough.
+        """
+        distance = (
+            self.max_edit_distance if max_edit_distance is None else max_edit_distance
+        )
+        if len(word) <= SHORT_TERM_LENGTH:
+            distance = min(distance, 1)
+        matches = self.lookup(word, distance)
+        return matches[0][0] if matches else None
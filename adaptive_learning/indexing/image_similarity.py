@@ -0,0 +1,280 @@
+"""
+Image Similarity Module
+
+This module finds near-identical and similar images among the indexed resources of the
+Adaptive Learning System by the perceptual hashes computed at ingestion (pHash and dHash).
+Images whose hashes differ in only a few bits look like copies of the same picture at
+another resolution or in another format, and are grouped under the first of them in index
+order when similar images are listed. Search results report such a copy once, unless the
+text recognized in the copy and in the first image differ: looking alike does not make
+images interchangeable when their text differs (slides or screenshots differing by a few
+words hash alike). Copies with the same file bytes are always reported once.
+
+Hashes are stored in a BK-tree (Burkhard-Keller tree) under the Hamming distance. Each
+child of a node sits at a known distance from it, so by the triangle inequality a query
+within distance N only descends into children at distance d - N to d + N of a node, and
+visits a small part of the tree instead of comparing the query with every image.
+
+Key Responsibilities:
+- Compute Hamming distances between 64-bit hashes.
+- Store hashes in a BK-tree and find those within a distance of a query hash.
+- Group near-identical images, confirming pHash matches with their dHash.
+- Tell which copies are interchangeable (same bytes, or near-identical without conflicting
+  recognized text), for search results.
+- Extend the index of a snapshot with the images appended to the next one.
+
+Dependencies:
+- copy: For indexes sharing their tree with the index they extend.
+- threading: For extending a shared tree from concurrent readers.
+"""
+
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Images whose pHash and dHash both differ by at most this many bits are the same image
+DUPLICATE_MAX_DISTANCE = 6
+# Default distance within which images are reported as similar
+SIMILAR_MAX_DISTANCE = 12
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Return the number of bits in which two hashes differ.
+
+    Args:
+        a (int): First hash.
+        b (int): Second hash.
+
+    Returns:
+        int: Hamming distance between the hashes.
+    """
+    return bin(a ^ b).count("1")
+
+
+def recognized_text(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the text recognized in an indexed image, or None if it was not recognized.
+
+    Args:
+        entry (Dict[str, Any]): Index entry of an image.
+
+    Returns:
+        Optional[str]: The recognized text, which follows the first line of the content.
+    """
+    if "ocr" not in entry.get("metadata", {}):
+        return None
+    return entry.get("content", "").partition("\n")[2]
+
+
+class BKTree:
+    """
+    A BK-tree of integer hashes under the Hamming distance, each carrying its items.
+    """
+
+    def __init__(self):
+        # Nodes are [hash, items, {distance: child node}]
+        self.root: Optional[list] = None
+
+    def add(self, value: int, item: Any) -> None:
+        """
+        Add an item under its hash.
+
+        Args:
+            value (int): Hash of the item.
+            item (Any): Item returned by searches matching the hash.
+        """
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        Find the items whose hash is within a distance of a query hash.
+
+        Args:
+            value (int): Query hash.
+            max_distance (int): Largest Hamming distance to report.
+
+        Returns:
+            List[Tuple[int, Any]]: (distance, item) pairs, closest first.
+        """
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= max_distance:
+                results.extend((distance, item) for item in node[1])
+            # Copied, as an index sharing the tree may be adding children meanwhile
+            for child_distance, child in list(node[2].items()):
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+class ImageHashIndex:
+    """
+    The perceptual hashes of the images of an index snapshot, grouped into near-identical
+    images.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        """
+        Index the images of a list of entries.
+
+        Args:
+            entries (List[Dict[str, Any]]): Index entries; those with a "phash" in their
+                metadata are indexed by document id (position in the list).
+        """
+        self.tree = BKTree()
+        self.dhashes: Dict[int, Optional[int]] = {}
+        # Document id of the image each near-identical copy is grouped under, for display
+        self.canonical: Dict[int, int] = {}
+        self.duplicates: Dict[int, List[int]] = {}
+        # Document id of the first image each copy is interchangeable with
+        self.identical: Dict[int, int] = {}
+        self._texts: Dict[int, Optional[str]] = {}
+        self._first_with_bytes: Dict[str, int] = {}
+        # Entries indexed into the structures, shared with extended indexes, and number
+        # of entries of this index
+        self._indexed: List[Dict[str, Any]] = []
+        self.size = 0
+        self._lock = threading.Lock()
+        self._add_entries(entries)
+
+    def extended(self, entries: List[Dict[str, Any]]) -> "ImageHashIndex":
+        """
+        Return the index of entries made by appending to the indexed ones.
+
+        The tree and groups are shared with this index rather than copied: an appended
+        image is only compared with earlier ones, so the groups of the indexed images do
+        not change, and every index ignores the images past its own entries.
+
+        Args:
+            entries (List[Dict[str, Any]]): The indexed entries followed by new ones.
+
+        Returns:
+            ImageHashIndex: Index of the entries.
+        """
+        with self._lock:
+            shared = min(len(entries), len(self._indexed))
+            if any(
+                entries[i] is not self._indexed[i] for i in range(self.size, shared)
+            ):
+                # Another index extended the structures with different entries
+                return ImageHashIndex(entries)
+        index = copy.copy(self)
+        index._add_entries(entries)
+        return index
+
+    def _add_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Index the entries not indexed yet into the shared structures.
+        """
+        with self._lock:
+            for doc_id in range(len(self._indexed), len(entries)):
+                self._add(doc_id, entries[doc_id])
+                self._indexed.append(entries[doc_id])
+        self.size = len(entries)
+
+    def _add(self, doc_id: int, entry: Dict[str, Any]) -> None:
+        """
+        Index one image, grouping it with the earlier image it is a copy of.
+        """
+        metadata = entry.get("metadata", {})
+        try:
+            phash = int(metadata["phash"], 16)
+            dhash = int(metadata["dhash"], 16) if metadata.get("dhash") else None
+        except (KeyError, TypeError, ValueError):
+            return
+        original = self._find_original(phash, dhash)
+        if original is not None:
+            self.canonical[doc_id] = original
+            self.duplicates.setdefault(original, []).append(doc_id)
+        self.dhashes[doc_id] = dhash
+        self.tree.add(phash, doc_id)
+
+        text = self._texts[doc_id] = recognized_text(entry)
+        same = self._first_with_bytes.get(metadata.get("sha256"))
+        if same is None and original is not None:
+            # A resized or re-encoded copy, unless its recognized text tells them apart
+            other = self._texts[original]
+            if text is None or other is None or text == other:
+                same = original
+        if same is not None:
+            self.identical[doc_id] = self.identical.get(same, same)
+        elif metadata.get("sha256"):
+            self._first_with_bytes[metadata["sha256"]] = doc_id
+
+    def _find_original(self, phash: int, dhash: Optional[int]) -> Optional[int]:
+        """
+        Return the closest indexed image that is not itself a copy and whose hashes are
+        within DUPLICATE_MAX_DISTANCE of the given ones.
+        """
+        for _, doc_id in self.tree.search(phash, DUPLICATE_MAX_DISTANCE):
+            if doc_id in self.canonical:
+                continue
+            other = self.dhashes[doc_id]
+            if (
+                dhash is None
+                or other is None
+                or hamming_distance(dhash, other) <= DUPLICATE_MAX_DISTANCE
+            ):
+                return doc_id
+        return None
+
+    def canonical_of(self, doc_id: int) -> int:
+        """
+        Return the document id of the image a copy is grouped under, or doc_id itself.
+        """
+        return self.canonical.get(doc_id, doc_id)
+
+    def duplicates_of(self, doc_id: int) -> List[int]:
+        """
+        Return the document ids of the near-identical copies grouped under an image.
+        """
+        return [i for i in self.duplicates.get(doc_id, []) if i < self.size]
+
+    def identical_of(self, doc_id: int) -> int:
+        """
+        Return the document id of the first image a copy is interchangeable with, or
+        doc_id itself.
+        """
+        return self.identical.get(doc_id, doc_id)
+
+    def similar(
+        self, phash: str, max_distance: int = SIMILAR_MAX_DISTANCE
+    ) -> List[Tuple[int, int]]:
+        """
+        Find the images similar to a pHash, one per group of near-identical copies.
+
+        Args:
+            phash (str): Query pHash as hexadecimal digits.
+            max_distance (int): Largest Hamming distance to report.
+
+        Returns:
+            List[Tuple[int, int]]: (distance, document id) pairs, closest first, where a
+                group is reported under the document id of its first image and the
+                distance of its closest copy.
+        """
+        best: Dict[int, int] = {}
+        for distance, doc_id in self.tree.search(int(phash, 16), max_distance):
+            if doc_id >= self.size:
+                continue
+            doc_id = self.canonical_of(doc_id)
+            if doc_id not in best or distance < best[doc_id]:
+                best[doc_id] = distance
+        return sorted((distance, doc_id) for doc_id, distance in best.items())
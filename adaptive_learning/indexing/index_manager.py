@@ -9,68 +9,618 @@ Key Responsibilities:
 - Index content and metadata for efficient keyword and semantic search.
 - Ensure all processing is local and privacy-respecting.
 - Support retrieval by type, topic, and relevance.
+- Return query-focused snippets so results do not need to carry whole documents.
+- Resolve misspelled or unaccented query words to indexed terms.
+- Suggest completions of partially typed terms for type-ahead search.
+- Map matches inside video transcripts to the time ranges in which they were spoken.
+- Report copies of an image once and find similar images by perceptual hash.
+- Serve consistent reads from immutable index snapshots while the index is rebuilt.
+- Update the derived indexes of a new snapshot for its changed entries only.
+- Share one memory-mapped embedding matrix and one embedding model per process.
+- Save only the entries and embeddings changed since the previous save.
 
 Dependencies:
-- json: For storing index data in a simple JSON format (initial implementation).
+- json: For storing index data in a simple JSON format, with a log of later changes.
 - os: For file and directory operations.
+- threading: For serializing writers that publish new index snapshots.
+- sentence-transformers: For generating embeddings for semantic search.
 """
 
 import os
 import json
-from typing import Dict, List, Any, Optional
+import bisect
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Set
 from datetime import datetime
 
+from .keyword_index import KeywordIndex, build_snippet, tokenize
+from .fuzzy import DEFAULT_MAX_EDIT_DISTANCE, FuzzyMatcher
+from .autocomplete import PrefixIndex
+from .image_similarity import SIMILAR_MAX_DISTANCE, ImageHashIndex
+from .vector_store import (
+    EmbeddingBuffer,
+    VectorIndex,
+    VectorStore,
+    document_rows,
+    entry_fingerprint,
+    fingerprint_entries,
+    format_fingerprint,
+)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# Changes a snapshot carries to update the derived indexes of an earlier one; beyond
+# this, its derived indexes are rebuilt
+MAX_PENDING_CHANGES = 1024
+
+# Embedding models loaded by this process, shared by all IndexManager instances
+_shared_embedders: Dict[str, Any] = {}
+_shared_embedders_lock = threading.Lock()
+
+
+def get_shared_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Any:
+    """
+    Load a SentenceTransformer model once per process and share it.
+
+    Args:
+        model_name (str): Name of the SentenceTransformer model.
+
+    Returns:
+        Any: The loaded embedding model.
+    """
+    with _shared_embedders_lock:
+        if model_name not in _shared_embedders:
+            from sentence_transformers import SentenceTransformer
+
+            _shared_embedders[model_name] = SentenceTransformer(model_name)
+        return _shared_embedders[model_name]
+
+
+def page_at(pages: List[Dict[str, Any]], offset: int) -> Optional[int]:
+    """
+    Return the number of the page containing a character offset of a resource's content.
+
+    Args:
+        pages (List[Dict[str, Any]]): Page records with start offsets, in page order.
+        offset (int): Offset into the content.
+
+    Returns:
+        Optional[int]: The page number, or None if the resource has no pages.
+    """
+    i = bisect.bisect_right([page["start"] for page in pages], offset) - 1
+    return pages[max(i, 0)]["page"] if pages else None
+
+
+def phrase_at(phrases: List[Dict[str, Any]], offset: int) -> int:
+    """
+    Return the index of the transcript phrase containing a character offset of the content.
+
+    Args:
+        phrases (List[Dict[str, Any]]): Phrase records with start offsets, in time order.
+        offset (int): Offset into the content.
+
+    Returns:
+        int: Index of the phrase.
+    """
+    return max(bisect.bisect_right([p["start"] for p in phrases], offset) - 1, 0)
+
+
+def time_range_at(resource: Dict[str, Any], offset: int) -> Optional[Dict[str, Any]]:
+    """
+    Return the time range in which a character offset of a transcript was spoken.
+
+    The range starts at the word at the offset and ends with its phrase.
+
+    Args:
+        resource (Dict[str, Any]): Indexed resource with "phrases" (and "words") records.
+        offset (int): Offset into the content.
+
+    Returns:
+        Optional[Dict[str, Any]]: "start" and "end" in seconds and the phrase "text", or
+            None if the resource has no transcript phrases.
+    """
+    phrases = resource.get("phrases")
+    if not phrases:
+        return None
+    phrase = phrases[phrase_at(phrases, offset)]
+    content = resource.get("content", "")
+    start = phrase["time_start"]
+    words = resource.get("words")
+    if words:
+        # Words of a phrase are separated by single spaces
+        word = phrase["word"] + content[phrase["start"] : offset].count(" ")
+        if word < len(words["starts"]):
+            start = words["starts"][word] / words["time_scale"]
+    return {
+        "start": start,
+        "end": phrase["time_end"],
+        "text": content[phrase["start"] : phrase["end"]],
+    }
+
+
+class IndexSnapshot:
+    """
+    An immutable, versioned view of the index.
+
+    Readers pin a snapshot for the duration of an operation while writers build the next
+    version off to the side and publish it by swapping a single reference. The entries,
+    embeddings and vector index of a published snapshot are never modified; writers only
+    append embedding rows past those a snapshot covers.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        entries: List[Dict[str, Any]],
+        embeddings: Any = None,
+        vector_version: Optional[int] = None,
+        row_docs: Any = None,
+    ):
+        """
+        Initialize a snapshot.
+
+        Args:
+            version (int): Monotonically increasing snapshot version.
+            entries (List[Dict[str, Any]]): Indexed resources, in document id order.
+            embeddings (Any): Optional numpy array or read-only memmap with one embedding
+                row per entry.
+            vector_version (Optional[int]): Version of the VectorStore file the embeddings
+                are mapped from, or None if they only live in this process.
+            row_docs (Any): Optional int64 array with the document id of each embedding
+                row, or -1 for rows of replaced documents. Row i embeds entry i when
+                omitted.
+        """
+        self.version = version
+        self.entries = entries
+        self.embeddings = embeddings
+        self.vector_version = vector_version
+        self.row_docs = row_docs
+        self.vector_index = (
+            VectorIndex(embeddings, row_docs) if embeddings is not None else None
+        )
+        self._keyword_index: Optional[KeywordIndex] = None
+        self._fuzzy_matcher: Optional[FuzzyMatcher] = None
+        self._image_hash_index: Optional[ImageHashIndex] = None
+        self._keyword_lock = threading.Lock()
+        # Derived indexes of an earlier snapshot, and the entry each document id changed
+        # since then had in it (None for appended ones), to update them from
+        self._base_keyword_index: Optional[KeywordIndex] = None
+        self._base_image_hash_index: Optional[ImageHashIndex] = None
+        self._changes: Dict[int, Optional[Dict[str, Any]]] = {}
+
+    def follow(self, previous: "IndexSnapshot", changed: List[int]) -> None:
+        """
+        Record that the snapshot was made from a previous one by changing some entries.
+
+        The derived indexes are then updated for the changed entries from those of the
+        previous snapshot, or of the last snapshot that built them, instead of being
+        rebuilt over every entry. Must be called before the snapshot is published.
+
+        Args:
+            previous (IndexSnapshot): Snapshot the entries were derived from.
+            changed (List[int]): Document ids that were added or replaced.
+        """
+        keyword_index = previous._keyword_index
+        image_hash_index = previous._image_hash_index
+        changes: Dict[int, Optional[Dict[str, Any]]] = {}
+        if keyword_index is None and image_hash_index is None:
+            keyword_index = previous._base_keyword_index
+            image_hash_index = previous._base_image_hash_index
+            changes = dict(previous._changes)
+        for i in changed:
+            changes.setdefault(
+                i, previous.entries[i] if i < len(previous.entries) else None
+            )
+        # Long runs of unread snapshots rebuild instead of carrying their changes along
+        if len(changes) > MAX_PENDING_CHANGES:
+            return
+        self._base_keyword_index = keyword_index
+        self._base_image_hash_index = image_hash_index
+        self._changes = changes
+
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """
+        Positional keyword index over the snapshot entries, built on first use.
+
+        Returns:
+            KeywordIndex: Keyword index for this snapshot.
+        """
+        if self._keyword_index is None:
+            with self._keyword_lock:
+                if self._keyword_index is None:
+                    base = self._base_keyword_index
+                    if base is not None and not self._changes:
+                        keyword_index = base
+                    elif base is not None:
+                        keyword_index = base.updated(
+                            [
+                                (i, entry.get("content", ""))
+                                for i, entry in self._changes.items()
+                                if entry is not None
+                            ],
+                            [
+                                (i, self.entries[i].get("content", ""))
+                                for i in self._changes
+                            ],
+                        )
+                    else:
+                        keyword_index = KeywordIndex()
+                        for i, entry in enumerate(self.entries):
+                            keyword_index.add_document(i, entry.get("content", ""))
+                    self._keyword_index = keyword_index
+                    self._base_keyword_index = None
+        return self._keyword_index
+
+    @property
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """
+        Fuzzy matcher over the keyword index vocabulary, built on first use.
+
+        Terms are weighted by the number of documents containing them.
+
+        Returns:
+            FuzzyMatcher: Fuzzy matcher for this snapshot.
+        """
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = self.keyword_index.fuzzy_matcher()
+        return self._fuzzy_matcher
+
+    @property
+    def image_hash_index(self) -> ImageHashIndex:
+        """
+        Perceptual hashes of the snapshot's images, grouped into near-identical copies,
+        built on first use.
+
+        Returns:
+            ImageHashIndex: Image hash index for this snapshot.
+        """
+        if self._image_hash_index is None:
+            with self._keyword_lock:
+                if self._image_hash_index is None:
+                    base = self._base_image_hash_index
+                    # Replacing an image may regroup any later copy, so only appends
+                    # extend the earlier index
+                    if (
+                        base is not None
+                        and all(
+                            entry is None or "phash" not in entry["metadata"]
+                            for entry in self._changes.values()
+                        )
+                        and all(
+                            i >= base.size or "phash" not in self.entries[i]["metadata"]
+                            for i in self._changes
+                        )
+                    ):
+                        self._image_hash_index = base.extended(self.entries)
+                    else:
+                        self._image_hash_index = ImageHashIndex(self.entries)
+                    self._base_image_hash_index = None
+        return self._image_hash_index
+
 
 class IndexManager:
     """
     A class to manage the indexing and retrieval of ingested resources.
+
+    Reads are served from the current IndexSnapshot without locking. Writes are
+    serialized, applied to a copy of the current snapshot's entry list and published
+    atomically. New embeddings are appended to a growing matrix instead of copying it, so
+    adding a resource costs the same however large the index is. Embeddings are
+    persisted to a VectorStore next to the index file and memory-mapped, so every process
+    serving the same index shares the matrix through the page cache.
+
+    Saves append the entries added or replaced since the previous save to a log next to
+    the index file (<index>.log.jsonl), and their embedding rows to the current
+    VectorStore file. The index file is only rewritten, with the log folded in, after
+    removals or once the log outgrows it, so saving periodically while indexing a corpus
+    costs time proportional to the corpus, not to its square.
     """
 
-    def __init__(self, index_file_path: str = "index_data/simple_index.json"):
+    def __init__(
+        self,
+        index_file_path: str = "index_data/simple_index.json",
+        embedder: Any = None,
+    ):
         """
         Initialize the IndexManager with a path to store the index file.
 
         Args:
             index_file_path (str): Path to the JSON file where the index will be stored.
+            embedder (Any): Optional sentence embedding model. The process-wide
+                SentenceTransformer model is loaded on first use when omitted.
         """
         self.index_file_path = index_file_path
-        self.index_data: List[Dict[str, Any]] = []
-        self.embedder = None
-        self.vector_index = None
+        self.embedder = embedder
+        self.embedding_model = (
+            DEFAULT_EMBEDDING_MODEL if embedder is None else type(embedder).__name__
+        )
+        self._vector_store = VectorStore(
+            os.path.join(os.path.dirname(index_file_path), "vectors")
+        )
+        self._snapshot = IndexSnapshot(0, [])
+        self._latest_vector_version = 0
+        # Append-only matrix of this writer and the view of it the snapshot holds
+        self._vectors: Optional[EmbeddingBuffer] = None
+        self._vectors_view: Any = None
+        # Document id of each file path, valid for the snapshot version it was built for
+        self._positions: Dict[str, int] = {}
+        self._positions_version: Optional[int] = None
+        # Sum of the entry hashes of the fingerprint, valid for the snapshot version
+        self._fingerprint_total = 0
+        self._fingerprint_version: Optional[int] = None
+        # Document ids changed since the last save, and whether the index file must be
+        # rewritten instead of appending them to the log
+        self._unsaved: Set[int] = set()
+        self._rewrite_index_file = False
+        # Leading rows of the append-only matrix stored in the VectorStore
+        self._persisted_rows = 0
+        self._suggestion_terms = PrefixIndex({})
+        self._write_lock = threading.RLock()
+        self._vectors_initialized = False
         self.load_index()
-        self.initialize_vector_index()
+        # Only a build persisted for these entries is mapped; encoding the corpus is left
+        # to the first semantic search or write, so read-only managers never write
+        self._map_persisted_vectors()
+
+    @property
+    def log_file_path(self) -> str:
+        """
+        Path of the log of entries saved after the index file was last written.
+        """
+        return f"{os.path.splitext(self.index_file_path)[0]}.log.jsonl"
+
+    @property
+    def index_data(self) -> List[Dict[str, Any]]:
+        """
+        Entries of the current snapshot. The list must be treated as read-only.
+        """
+        return self._snapshot.entries
+
+    @property
+    def vector_index(self) -> Optional[VectorIndex]:
+        """
+        Vector index of the current snapshot, or None if semantic search is unavailable.
+        """
+        return self._snapshot.vector_index
+
+    def snapshot(self) -> IndexSnapshot:
+        """
+        Pin the current index snapshot for a series of consistent reads.
+
+        Returns:
+            IndexSnapshot: The snapshot currently published.
+        """
+        return self._snapshot
 
     def load_index(self) -> None:
         """
         Load the existing index from the file if it exists.
         """
+        entries = self._read_index_file()
+        with self._write_lock:
+            embeddings, vector_version, row_docs = None, None, None
+            if self._snapshot.embeddings is not None:
+                embeddings, vector_version, row_docs = self._vectors_for(entries)
+            self._publish(entries, embeddings, vector_version, row_docs)
+            self._mark_saved()
+
+    def _read_index_file(self) -> List[Dict[str, Any]]:
+        """
+        Read the index entries stored in the index file and its log.
+
+        Returns:
+            List[Dict[str, Any]]: Stored entries, or an empty list if none could be read.
+        """
         try:
             if os.path.exists(self.index_file_path):
                 with open(self.index_file_path, "r", encoding="utf-8") as f:
-                    self.index_data = json.load(f)
-                print(f"Loaded index with {len(self.index_data)} entries.")
-            else:
-                print(
-                    f"No existing index found at {self.index_file_path}. Starting fresh."
-                )
-                self.index_data = []
+                    entries = json.load(f)
+                    stamp = self._file_stamp(os.fstat(f.fileno()))
+                self._replay_log(entries, stamp)
+                print(f"Loaded index with {len(entries)} entries.")
+                return entries
+            print(f"No existing index found at {self.index_file_path}. Starting fresh.")
         except Exception as e:
             print(f"Error loading index from {self.index_file_path}: {e}")
-            self.index_data = []
+        return []
+
+    @staticmethod
+    def _file_stamp(stat: os.stat_result) -> List[int]:
+        """
+        Identify a version of the index file, so a log is only applied to the file it was
+        written for.
+        """
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _replay_log(self, entries: List[Dict[str, Any]], stamp: List[int]) -> None:
+        """
+        Apply the entries saved to the log after the index file was written.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries read from the index file, updated in
+                place.
+            stamp (List[int]): Stamp of the index file the entries were read from.
+        """
+        try:
+            f = open(self.log_file_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return
+            if header.get("index_file") != stamp:
+                # Left over from before the index file was rewritten
+                return
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A save interrupted mid-line, or still being written
+                    continue
+                doc_id = record["doc"]
+                if doc_id < len(entries):
+                    entries[doc_id] = record["entry"]
+                elif doc_id == len(entries):
+                    entries.append(record["entry"])
 
     def save_index(self) -> None:
         """
-        Save the current index to the file.
+        Save the changes made to the index since it was last saved or loaded.
+
+        Added and replaced entries are appended to the log and their embedding rows to
+        the vector store. The index file is rewritten with all entries when resources
+        were removed, when it does not exist yet, or when the log has grown larger than it.
         """
+        with self._write_lock:
+            snapshot = self._snapshot
+            entries = snapshot.entries
+            try:
+                self._save_entries(entries)
+                print(
+                    f"Saved index with {len(entries)} entries to {self.index_file_path}."
+                )
+            except Exception as e:
+                print(f"Error saving index to {self.index_file_path}: {e}")
+                return
+
+            # Persist embeddings changed in memory so other processes can map them
+            if snapshot.embeddings is None or snapshot.vector_version is not None:
+                return
+            try:
+                self._save_vectors(snapshot)
+            except Exception as e:
+                print(f"Error saving vector index: {e}")
+
+    def _save_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Append the unsaved entries to the log, or rewrite the index file.
+
+        Callers must hold the write lock.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries of the current snapshot.
+        """
+        os.makedirs(os.path.dirname(self.index_file_path) or ".", exist_ok=True)
+        if not self._rewrite_index_file and os.path.exists(self.index_file_path):
+            if self._unsaved:
+                stamp = self._file_stamp(os.stat(self.index_file_path))
+                header = None
+                try:
+                    with open(self.log_file_path, "r", encoding="utf-8") as f:
+                        header = json.loads(f.readline())
+                except (OSError, ValueError):
+                    pass
+                if header is None or header.get("index_file") != stamp:
+                    with open(self.log_file_path, "w", encoding="utf-8") as f:
+                        f.write(json.dumps({"index_file": stamp}) + "\n")
+                with open(self.log_file_path, "a+b") as f:
+                    # Keep a line cut short by an interrupted save on its own
+                    f.seek(0, os.SEEK_END)
+                    if f.tell():
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            f.write(b"\n")
+                    for doc_id in sorted(self._unsaved):
+                        record = {"doc": doc_id, "entry": entries[doc_id]}
+                        f.write(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+                        f.write(b"\n")
+            # Rewriting the file once the log outgrows it keeps each entry's share of
+            # the rewrites constant
+            if not os.path.exists(self.log_file_path) or os.path.getsize(
+                self.log_file_path
+            ) <= os.path.getsize(self.index_file_path):
+                self._mark_saved()
+                return
+
+        temp_path = f"{self.index_file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.index_file_path)
+        # A log left behind by a failed removal no longer matches the file's stamp
         try:
-            os.makedirs(os.path.dirname(self.index_file_path), exist_ok=True)
-            with open(self.index_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.index_data, f, ensure_ascii=False, indent=2)
-            print(
-                f"Saved index with {len(self.index_data)} entries to {self.index_file_path}."
+            os.remove(self.log_file_path)
+        except FileNotFoundError:
+            pass
+        self._mark_saved()
+
+    def _mark_saved(self) -> None:
+        """
+        Record that the current entries match the index file and its log.
+        """
+        self._unsaved = set()
+        self._rewrite_index_file = False
+
+    def _save_vectors(self, snapshot: IndexSnapshot) -> None:
+        """
+        Persist the snapshot's in-memory embeddings and publish them as mapped from the
+        new VectorStore version.
+
+        Rows the store already holds from an earlier save of the writer's append-only
+        matrix are not written again.
+
+        Callers must hold the write lock.
+
+        Args:
+            snapshot (IndexSnapshot): The current snapshot.
+        """
+        fingerprint = self._entries_fingerprint(snapshot)
+        buffered = snapshot.embeddings is self._vectors_view
+        pointer = None
+        if buffered and self._persisted_rows:
+            start = self._persisted_rows
+            pointer = self._vector_store.append(
+                snapshot.embeddings[start:],
+                start,
+                fingerprint,
+                len(snapshot.entries),
+                None if snapshot.row_docs is None else snapshot.row_docs[start:],
             )
-        except Exception as e:
-            print(f"Error saving index to {self.index_file_path}: {e}")
+        if pointer is None:
+            pointer = self._vector_store.save(
+                snapshot.embeddings,
+                fingerprint,
+                self.embedding_model,
+                snapshot.row_docs,
+                len(snapshot.entries),
+            )
+        self._persisted_rows = len(snapshot.embeddings) if buffered else 0
+        # The writer keeps its append-only matrix, so later writes do not copy the
+        # persisted rows back into memory
+        self._publish(
+            snapshot.entries,
+            snapshot.embeddings,
+            pointer["version"],
+            snapshot.row_docs,
+            changed=[],
+        )
+        if self._fingerprint_version == snapshot.version:
+            self._fingerprint_version = self._snapshot.version
+        if self._positions_version == snapshot.version:
+            self._positions_version = self._snapshot.version
+
+    def _entries_fingerprint(self, snapshot: IndexSnapshot) -> str:
+        """
+        Return the fingerprint of a snapshot's entries.
+
+        The sum of the entry hashes is kept across writes that update it, and only
+        computed from all entries after other changes (loads, removals).
+
+        Callers must hold the write lock.
+
+        Args:
+            snapshot (IndexSnapshot): The current snapshot.
+
+        Returns:
+            str: Fingerprint of the entries.
+        """
+        if self._fingerprint_version != snapshot.version:
+            self._fingerprint_total = sum(
+                entry_fingerprint(i, entry) for i, entry in enumerate(snapshot.entries)
+            )
+            self._fingerprint_version = snapshot.version
+        return format_fingerprint(self._fingerprint_total)
 
     def add_resource(self, resource: Dict[str, Any]) -> None:
         """
@@ -79,24 +629,48 @@ class IndexManager:
         Args:
             resource (Dict[str, Any]): Dictionary containing metadata, content, and processed content of the resource.
         """
-        # Add timestamp for indexing
-        resource["metadata"]["indexed_at"] = datetime.now().isoformat()
-        # Check for duplicates based on file_path
-        file_path = resource["metadata"].get("file_path", "")
-        if any(
-            entry["metadata"].get("file_path", "") == file_path
-            for entry in self.index_data
-        ):
-            print(f"Duplicate resource found for {file_path}. Updating existing entry.")
-            self.update_resource(file_path, resource)
-        else:
-            self.index_data.append(resource)
-            print(
-                f"Added resource {resource['metadata'].get('file_name', 'unknown')} to index."
-            )
-            # Add to vector index if initialized
-            if hasattr(self, "vector_index") and hasattr(self, "embedder"):
-                self.add_to_vector_index(resource, len(self.index_data) - 1)
+        self.add_resources([resource])
+
+    def add_resources(self, resources: List[Dict[str, Any]]) -> None:
+        """
+        Add several resources to the index and publish them as a single new snapshot.
+
+        Resources whose file_path is already indexed replace the existing entry. Batching
+        avoids publishing a snapshot and encoding embeddings once per resource.
+
+        Args:
+            resources (List[Dict[str, Any]]): Resources to add or update.
+        """
+        with self._write_lock:
+            self._ensure_vector_index()
+            current = self._snapshot
+            entries = list(current.entries)
+            positions = self._file_positions(current)
+            # Positions are updated in place, so they are stale until the publish
+            self._positions_version = None
+            changed = []
+            for resource in resources:
+                # Add timestamp for indexing
+                resource["metadata"]["indexed_at"] = datetime.now().isoformat()
+                # Check for duplicates based on file_path
+                file_path = resource["metadata"].get("file_path", "")
+                if file_path in positions:
+                    print(
+                        f"Duplicate resource found for {file_path}. Updating existing entry."
+                    )
+                    resource["metadata"]["updated_at"] = datetime.now().isoformat()
+                    entries[positions[file_path]] = resource
+                    print(
+                        f"Updated resource {resource['metadata'].get('file_name', 'unknown')} in index."
+                    )
+                else:
+                    positions[file_path] = len(entries)
+                    entries.append(resource)
+                    print(
+                        f"Added resource {resource['metadata'].get('file_name', 'unknown')} to index."
+                    )
+                changed.append(positions[file_path])
+            self._publish_changes(current, entries, changed)
 
     def update_resource(self, file_path: str, updated_resource: Dict[str, Any]) -> None:
         """
@@ -106,16 +680,167 @@ class IndexManager:
             file_path (str): Path to the file to identify the resource.
             updated_resource (Dict[str, Any]): Updated dictionary with resource data.
         """
-        for i, entry in enumerate(self.index_data):
-            if entry["metadata"].get("file_path", "") == file_path:
+        with self._write_lock:
+            self._ensure_vector_index()
+            current = self._snapshot
+            positions = self._file_positions(current)
+            if file_path in positions:
+                i = positions[file_path]
+                entries = list(current.entries)
                 updated_resource["metadata"]["updated_at"] = datetime.now().isoformat()
-                self.index_data[i] = updated_resource
+                entries[i] = updated_resource
+                self._positions_version = None
+                del positions[file_path]
+                positions[updated_resource["metadata"].get("file_path", "")] = i
+                self._publish_changes(current, entries, [i])
                 print(
                     f"Updated resource {updated_resource['metadata'].get('file_name', 'unknown')} in index."
                 )
                 return
-        # If not found, add as new
-        self.add_resource(updated_resource)
+            # If not found, add as new
+            self.add_resource(updated_resource)
+
+    def remove_resource(self, file_path: str) -> None:
+        """
+        Remove a resource from the index based on file_path.
+
+        Args:
+            file_path (str): Path to the file to identify the resource.
+        """
+        self.remove_resources([file_path])
+
+    def remove_resources(self, file_paths: List[str]) -> None:
+        """
+        Remove several resources from the index and publish a single new snapshot.
+
+        The embedding rows of the remaining entries are kept, so nothing is re-encoded.
+        Records split from a removed file (such as the exercises of a bank) are removed
+        with it.
+
+        Args:
+            file_paths (List[str]): Paths of the files whose resources are removed.
+        """
+        file_paths = set(file_paths)
+
+        def removed(entry: Dict[str, Any]) -> bool:
+            metadata = entry["metadata"]
+            return (
+                metadata.get("file_path", "") in file_paths
+                or metadata.get("parent_file_path") in file_paths
+            )
+
+        with self._write_lock:
+            current = self._snapshot
+            kept = [i for i, entry in enumerate(current.entries) if not removed(entry)]
+            if len(kept) == len(current.entries):
+                return
+            for entry in current.entries:
+                if removed(entry):
+                    print(
+                        f"Removed resource {entry['metadata'].get('file_name', 'unknown')} from index."
+                    )
+            embeddings = None
+            if current.embeddings is not None:
+                rows = kept
+                if current.row_docs is not None:
+                    rows = document_rows(current.row_docs, len(current.entries))[kept]
+                # Fancy indexing copies the kept rows, so a mapped matrix is never modified
+                embeddings = current.embeddings[rows]
+            self._publish([current.entries[i] for i in kept], embeddings)
+            # Document ids shift, so the saved entries cannot be updated by id
+            self._rewrite_index_file = True
+
+    def _publish(
+        self,
+        entries: List[Dict[str, Any]],
+        embeddings: Any = None,
+        vector_version: Optional[int] = None,
+        row_docs: Any = None,
+        changed: Optional[List[int]] = None,
+    ) -> IndexSnapshot:
+        """
+        Build the next snapshot from new entries and embeddings and swap it in.
+
+        Callers must hold the write lock. The reference assignment is atomic, so readers
+        see either the previous snapshot or the new one, never a partial state.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries of the new snapshot.
+            embeddings (Any): Embedding rows matching the entries, or None.
+            vector_version (Optional[int]): VectorStore version the embeddings are mapped
+                from, or None if they only live in memory.
+            row_docs (Any): Document id of each embedding row, or None if row i embeds
+                entry i.
+            changed (Optional[List[int]]): Document ids added or replaced since the
+                current snapshot, whose derived indexes are then updated rather than
+                rebuilt; None if other entries changed or moved.
+
+        Returns:
+            IndexSnapshot: The published snapshot.
+        """
+        snapshot = IndexSnapshot(
+            self._snapshot.version + 1, entries, embeddings, vector_version, row_docs
+        )
+        if changed is not None:
+            snapshot.follow(self._snapshot, changed)
+        if vector_version is not None:
+            self._latest_vector_version = max(
+                self._latest_vector_version, vector_version
+            )
+        self._snapshot = snapshot
+        return snapshot
+
+    def _publish_changes(
+        self, current: IndexSnapshot, entries: List[Dict[str, Any]], changed: List[int]
+    ) -> None:
+        """
+        Publish entries made from the current snapshot's by adding or replacing some.
+
+        The embeddings, the fingerprint and the unsaved document ids are updated for the
+        changed entries only. Callers must hold the write lock and have updated the file
+        positions for the new entries.
+
+        Args:
+            current (IndexSnapshot): Snapshot the entries were derived from.
+            entries (List[Dict[str, Any]]): Entries of the snapshot being built.
+            changed (List[int]): Document ids that were added or replaced.
+        """
+        changed = sorted(set(changed))
+        fingerprinted = self._fingerprint_version == current.version
+        if fingerprinted:
+            for i in changed:
+                if i < len(current.entries):
+                    self._fingerprint_total -= entry_fingerprint(i, current.entries[i])
+                self._fingerprint_total += entry_fingerprint(i, entries[i])
+        embeddings, row_docs = self._updated_embeddings(current, entries, changed)
+        self._publish(entries, embeddings, row_docs=row_docs, changed=changed)
+        self._positions_version = self._snapshot.version
+        if fingerprinted:
+            self._fingerprint_version = self._snapshot.version
+        self._unsaved.update(changed)
+
+    def _file_positions(self, snapshot: IndexSnapshot) -> Dict[str, int]:
+        """
+        Return the document id of each file path of a snapshot.
+
+        The mapping is kept across writes that update it in place, and only rebuilt after
+        other changes (loads, removals), so adding resources does not scan the index.
+
+        Callers must hold the write lock.
+
+        Args:
+            snapshot (IndexSnapshot): The current snapshot.
+
+        Returns:
+            Dict[str, int]: Document id of each indexed file path.
+        """
+        if self._positions_version != snapshot.version:
+            self._positions = {
+                entry["metadata"].get("file_path", ""): i
+                for i, entry in enumerate(snapshot.entries)
+            }
+            self._positions_version = snapshot.version
+        return self._positions
 
     def search_by_keyword(
         self, keyword: str, resource_type: Optional[str] = None
@@ -130,21 +855,281 @@ class IndexManager:
         Returns:
             List[Dict[str, Any]]: List of matching resources.
         """
+        snapshot = self._snapshot
+        return [
+            entry for _, entry in self._match_keyword(snapshot, keyword, resource_type)
+        ]
+
+    def search_fuzzy(
+        self,
+        keyword: str,
+        resource_type: Optional[str] = None,
+        max_edit_distance: int = DEFAULT_MAX_EDIT_DISTANCE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index by keyword, tolerating misspellings and missing accents.
+
+        The keyword is searched as is first; only if nothing matches are its words
+        replaced by the closest vocabulary terms and the search repeated.
+
+        Args:
+            keyword (str): Keyword to search for.
+            resource_type (Optional[str]): Filter by resource type (e.g., '.txt', '.pdf').
+            max_edit_distance (int): Largest number of edits allowed per word.
+
+        Returns:
+            List[Dict[str, Any]]: List of matching resources.
+        """
+        snapshot = self._snapshot
+        results = [
+            entry for _, entry in self._match_keyword(snapshot, keyword, resource_type)
+        ]
+        if results:
+            return results
+        corrected = self.correct_query(keyword, max_edit_distance, snapshot)
+        # The correction is made of terms, so it is compared with the keyword's terms
+        if corrected == " ".join(term for term, _, _ in tokenize(keyword.lower())):
+            return []
+        print(f"No matches for '{keyword}'. Searching for '{corrected}' instead.")
+        return [
+            entry
+            for _, entry in self._match_keyword(snapshot, corrected, resource_type)
+        ]
+
+    def correct_query(
+        self,
+        keyword: str,
+        max_edit_distance: int = DEFAULT_MAX_EDIT_DISTANCE,
+        snapshot: Optional[IndexSnapshot] = None,
+    ) -> str:
+        """
+        Replace the words of a query that are not indexed by the closest indexed terms.
+
+        Args:
+            keyword (str): Query to correct.
+            max_edit_distance (int): Largest number of edits allowed per word.
+            snapshot (Optional[IndexSnapshot]): Snapshot pinned by the caller; the current
+                snapshot is used when omitted.
+
+        Returns:
+            str: Lowercase query with misspelled words replaced. Words without a close
+                enough term are kept unchanged.
+        """
+        snapshot = snapshot or self._snapshot
+        postings = snapshot.keyword_index.postings
+        words = []
+        for term, _, _ in tokenize(keyword.lower()):
+            if term not in postings:
+                term = (
+                    snapshot.fuzzy_matcher.best_match(term, max_edit_distance) or term
+                )
+            words.append(term)
+        return " ".join(words)
+
+    def set_suggestion_terms(self, terms: Iterable[str]) -> None:
+        """
+        Set curated terms (e.g. a topic lexicon) offered by suggest before corpus terms.
+
+        Args:
+            terms (Iterable[str]): Terms to suggest in addition to the index vocabulary.
+        """
+        terms = set(terms)
+        if terms != set(self._suggestion_terms.terms):
+            self._suggestion_terms = PrefixIndex({term: 0 for term in terms})
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Suggest completions of a partially typed word or topic.
+
+        Curated suggestion terms come first, then indexed terms; each group is ordered by
+        the number of documents containing the term.
+
+        Args:
+            prefix (str): Typed prefix; case and accents are ignored.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            List[str]: Suggested terms.
+        """
+        snapshot = self._snapshot
+        keyword_index = snapshot.keyword_index
+        postings = keyword_index.postings
+        curated = sorted(
+            (
+                term
+                for term, _ in self._suggestion_terms.complete(
+                    prefix, len(self._suggestion_terms)
+                )
+            ),
+            key=lambda term: -len(postings.get(term, ())),
+        )[:limit]
+        suggestions = list(curated)
+        for term, _ in keyword_index.complete(prefix, limit + len(curated)):
+            if len(suggestions) >= limit:
+                break
+            if term not in curated:
+                suggestions.append(term)
+        return suggestions
+
+    def _match_keyword(
+        self, snapshot: IndexSnapshot, keyword: str, resource_type: Optional[str]
+    ) -> List[tuple]:
+        """
+        Find the entries of a snapshot matching a keyword.
+
+        Args:
+            snapshot (IndexSnapshot): Snapshot pinned by the caller.
+            keyword (str): Keyword to search for.
+            resource_type (Optional[str]): Filter by resource type (e.g., '.txt', '.pdf').
+
+        Returns:
+            List[tuple]: List of (document id, entry) pairs in index order, with
+                identical copies of an image reported once.
+        """
         keyword = keyword.lower()
         results = []
-        for entry in self.index_data:
+        candidates = snapshot.keyword_index.candidate_documents(keyword)
+        for i, entry in enumerate(snapshot.entries):
             if (
                 resource_type
                 and entry["metadata"].get("file_type", "").lower()
                 != resource_type.lower()
             ):
                 continue
-            content = entry.get("content", "").lower()
             file_name = entry["metadata"].get("file_name", "").lower()
-            if keyword in content or keyword in file_name:
-                results.append(entry)
+            if keyword in file_name:
+                results.append((i, entry))
+                continue
+            # Only documents sharing the keyword's terms need their content checked
+            if candidates is not None and i not in candidates:
+                continue
+            if keyword in entry.get("content", "").lower():
+                results.append((i, entry))
+        return self._collapse_duplicates(snapshot, results)
+
+    def _collapse_duplicates(
+        self, snapshot: IndexSnapshot, results: List[tuple]
+    ) -> List[tuple]:
+        """
+        Report the copies of an image once: copies with the same bytes, and resized or
+        re-encoded copies whose recognized text does not differ from the first image's.
+
+        Only copies matching the first of them are dropped, and each result keeps its
+        own entry: a copy that matched on its own content is reported as itself.
+
+        Args:
+            snapshot (IndexSnapshot): Snapshot pinned by the caller.
+            results (List[tuple]): (document id, entry) pairs in index order.
+
+        Returns:
+            List[tuple]: The pairs without the later identical copies, in index order.
+        """
+        image_hash_index = snapshot.image_hash_index
+        if not image_hash_index.identical:
+            return results
+        collapsed = []
+        seen = set()
+        for i, entry in results:
+            original = image_hash_index.identical_of(i)
+            if original not in seen:
+                seen.add(original)
+                collapsed.append((i, entry))
+        return collapsed
+
+    def search_with_snippets(
+        self, keyword: str, resource_type: Optional[str] = None, window: int = 200
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index by keyword and return a query-focused snippet for each match.
+
+        Results carry the resource metadata and the best-scoring window of its content
+        instead of the whole document. Snippets of paginated resources (PDFs) also carry
+        the number of the page they start on, and snippets of video transcripts the time
+        range in which their first match is spoken.
+
+        Args:
+            keyword (str): Keyword to search for.
+            resource_type (Optional[str]): Filter by resource type (e.g., '.txt', '.pdf').
+            window (int): Maximum snippet length in characters.
+
+        Returns:
+            List[Dict[str, Any]]: List of dictionaries with the metadata and snippet of each match.
+        """
+        snapshot = self._snapshot
+        keyword_index = snapshot.keyword_index
+        matched_terms = self._matched_terms(snapshot, keyword)
+        results = []
+        for doc_id, entry in self._match_keyword(snapshot, keyword, resource_type):
+            positions = keyword_index.term_positions(doc_id, matched_terms)
+            snippet = build_snippet(entry.get("content", ""), positions, window)
+            if entry.get("pages"):
+                snippet["page"] = page_at(entry["pages"], snippet["start"])
+            elif entry["metadata"].get("page"):
+                # A page split from its document
+                snippet["page"] = entry["metadata"]["page"]
+            if entry.get("phrases"):
+                # Deep-link to the first highlighted match rather than the window start
+                offset = snippet["start"]
+                if snippet["highlights"]:
+                    offset += snippet["highlights"][0][0]
+                time_range = time_range_at(entry, offset)
+                snippet["time"] = {
+                    "start": time_range["start"],
+                    "end": time_range["end"],
+                }
+            results.append({"metadata": entry["metadata"], "snippet": snippet})
+        return results
+
+    def search_time_ranges(
+        self, keyword: str, file_path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search video transcripts by keyword and return when each match is spoken.
+
+        Args:
+            keyword (str): Keyword to search for.
+            file_path (Optional[str]): Only search the transcript of this video.
+
+        Returns:
+            List[Dict[str, Any]]: The metadata of each matching video and its "ranges",
+                one per phrase containing a match, with "start" and "end" in seconds and
+                the phrase "text", in time order.
+        """
+        snapshot = self._snapshot
+        keyword_index = snapshot.keyword_index
+        matched_terms = self._matched_terms(snapshot, keyword)
+        results = []
+        for doc_id, entry in self._match_keyword(snapshot, keyword, None):
+            if not entry.get("phrases"):
+                continue
+            if file_path and entry["metadata"].get("file_path") != file_path:
+                continue
+            ranges = {}
+            for start, _, _ in keyword_index.term_positions(doc_id, matched_terms):
+                # The first match of a phrase sets where its range starts
+                phrase = phrase_at(entry["phrases"], start)
+                if phrase not in ranges:
+                    ranges[phrase] = time_range_at(entry, start)
+            if ranges:
+                results.append(
+                    {
+                        "metadata": entry["metadata"],
+                        "ranges": [ranges[phrase] for phrase in sorted(ranges)],
+                    }
+                )
         return results
 
+    def _matched_terms(self, snapshot: IndexSnapshot, keyword: str) -> set:
+        """
+        Find the indexed terms matching the words of a keyword query.
+        """
+        keyword_index = snapshot.keyword_index
+        return {
+            term
+            for query_term, _, _ in tokenize(keyword.lower())
+            for term in keyword_index.matching_terms(query_term)
+        }
+
     def search_by_type(self, resource_type: str) -> List[Dict[str, Any]]:
         """
         Search the index for resources of a specific type.
@@ -153,14 +1138,74 @@ class IndexManager:
             resource_type (str): Resource type to filter by (e.g., '.txt', '.pdf').
 
         Returns:
-            List[Dict[str, Any]]: List of matching resources.
+            List[Dict[str, Any]]: List of matching resources, with identical copies of
+                an image reported once.
         """
         resource_type = resource_type.lower()
-        return [
-            entry
-            for entry in self.index_data
+        snapshot = self._snapshot
+        results = [
+            (i, entry)
+            for i, entry in enumerate(snapshot.entries)
             if entry["metadata"].get("file_type", "").lower() == resource_type
         ]
+        return [entry for _, entry in self._collapse_duplicates(snapshot, results)]
+
+    def search_similar_images(
+        self,
+        file_path: Optional[str] = None,
+        image_hash: Optional[str] = None,
+        max_distance: int = SIMILAR_MAX_DISTANCE,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the indexed images that look like an indexed image or a perceptual hash.
+
+        Images are looked up in a BK-tree of their pHashes, so a query only compares the
+        hash with a fraction of the indexed images. Near-identical copies are reported
+        once, under their first copy.
+
+        Args:
+            file_path (Optional[str]): Path of an indexed image to find images like.
+            image_hash (Optional[str]): pHash (16 hexadecimal digits) to search for when
+                no file_path is given.
+            max_distance (int): Largest number of differing pHash bits.
+            limit (int): Maximum number of results.
+
+        Returns:
+            List[Dict[str, Any]]: The metadata of each similar image, its pHash
+                "distance" and the file paths of its near-identical copies
+                ("duplicates"), closest first. The queried image and its copies are
+                not included.
+        """
+        snapshot = self._snapshot
+        image_hash_index = snapshot.image_hash_index
+        query = None
+        if file_path is not None:
+            for i, entry in enumerate(snapshot.entries):
+                if entry["metadata"].get("file_path") == file_path:
+                    query = image_hash_index.canonical_of(i)
+                    image_hash = entry["metadata"].get("phash")
+                    break
+        if not image_hash:
+            return []
+
+        results = []
+        for distance, i in image_hash_index.similar(image_hash, max_distance):
+            if i == query:
+                continue
+            results.append(
+                {
+                    "metadata": snapshot.entries[i]["metadata"],
+                    "distance": distance,
+                    "duplicates": [
+                        snapshot.entries[j]["metadata"].get("file_path", "")
+                        for j in image_hash_index.duplicates_of(i)
+                    ],
+                }
+            )
+            if len(results) >= limit:
+                break
+        return results
 
     def get_all_resources(self) -> List[Dict[str, Any]]:
         """
@@ -169,95 +1214,280 @@ class IndexManager:
         Returns:
             List[Dict[str, Any]]: List of all resources.
         """
-        return self.index_data
+        return self._snapshot.entries
 
-    def initialize_vector_index(self) -> None:
+    def _map_persisted_vectors(self) -> None:
         """
-        Initialize the FAISS vector index and embedder for semantic search.
+        Memory-map the embeddings persisted for the current entries by the active model.
+
+        Nothing is encoded or written: without a matching build, semantic search stays
+        unavailable until the vector index is initialized.
         """
         try:
-            import faiss
-            from sentence_transformers import SentenceTransformer
+            with self._write_lock:
+                entries = self._snapshot.entries
+                persisted = self._persisted_vectors(entries)
+                if persisted is not None:
+                    self._vectors_initialized = True
+                    self._publish(entries, *persisted, changed=[])
+        except Exception as e:
+            print(f"Error mapping vector index: {e}")
+
+    def _ensure_vector_index(self) -> None:
+        """
+        Initialize the vector index before the first write, so the embeddings of new
+        resources are appended to it. Initialization is attempted once.
+
+        Callers must hold the write lock.
+        """
+        if self._snapshot.embeddings is None and not self._vectors_initialized:
+            self.initialize_vector_index()
+
+    def initialize_vector_index(self) -> None:
+        """
+        Initialize the vector index for semantic search.
 
-            # Initialize the embedder model
-            self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
-            # Initialize FAISS index (dimension based on the model's output)
-            dimension = self.embedder.get_sentence_embedding_dimension()
-            self.vector_index = faiss.IndexFlatL2(dimension)
-            print("Initialized FAISS vector index for semantic search.")
-            # Build vector index if data already exists
-            if self.index_data:
-                self.build_vector_index()
+        Embeddings persisted for the current entries are memory-mapped without loading the
+        embedding model; otherwise they are encoded, persisted and then mapped.
+        """
+        self._vectors_initialized = True
+        try:
+            with self._write_lock:
+                entries = self._snapshot.entries
+                self._publish(entries, *self._vectors_for(entries), changed=[])
+            print("Initialized vector index for semantic search.")
         except Exception as e:
             print(f"Error initializing vector index: {e}")
-            self.embedder = None
-            self.vector_index = None
 
     def build_vector_index(self) -> None:
         """
-        Build the FAISS vector index from the current index data.
+        Build the vector index from the current index data.
+
+        The new matrix is encoded off to the side, written as a new VectorStore version and
+        published as a new snapshot, so semantic search keeps answering from the previous
+        index during the rebuild.
         """
-        if not self.embedder or not self.vector_index:
-            print("Vector index or embedder not initialized. Skipping build.")
-            return
+        with self._write_lock:
+            try:
+                entries = self._snapshot.entries
+                self._publish(
+                    entries,
+                    *self._persist_vectors(entries, self._encode_resources(entries)),
+                    changed=[],
+                )
+                print(f"Built vector index with {len(entries)} embeddings.")
+            except Exception as e:
+                print(f"Error building vector index: {e}")
 
-        try:
-            import numpy as np
+    def refresh_vectors(self) -> None:
+        """
+        Swap to a newer vector build published by another process, if one has landed.
 
-            # Reset the index
-            self.vector_index.reset()
-            # Generate embeddings for all resources
-            embeddings = []
-            for resource in self.index_data:
-                content = resource.get("content", "")
-                if content:
-                    embedding = self.embedder.encode(
-                        content[:1000]
-                    )  # Limit content for performance
-                    embeddings.append(embedding)
-                else:
-                    embeddings.append(
-                        np.zeros(self.embedder.get_sentence_embedding_dimension())
+        Only a stat of the pointer file is paid when nothing changed. If the new build was
+        made from different entries, the entries are reloaded from the index file first.
+        A build made with another embedding model is not comparable with the queries of
+        this one, so its entries are encoded again with this model instead. Changes made
+        in this process and not saved yet take precedence over other builds.
+        """
+        snapshot = self._snapshot
+        if snapshot.embeddings is not None and snapshot.vector_version is None:
+            return
+        if not self._vector_store.has_changed():
+            return
+        pointer = self._vector_store.read_pointer()
+        if not pointer or pointer["version"] <= self._latest_vector_version:
+            return
+        with self._write_lock:
+            try:
+                current = self._snapshot
+                entries = current.entries
+                if pointer["fingerprint"] != fingerprint_entries(entries):
+                    entries = self._read_index_file()
+                    if pointer["fingerprint"] != fingerprint_entries(entries):
+                        return
+                    self._mark_saved()
+                if pointer.get("model") == self.embedding_model:
+                    embeddings, row_docs = self._vector_store.load(pointer)
+                    self._publish(
+                        entries,
+                        embeddings,
+                        pointer["version"],
+                        row_docs,
+                        changed=[] if entries is current.entries else None,
                     )
-            # Add embeddings to FAISS index
-            if embeddings:
-                embeddings_array = np.array(embeddings).astype("float32")
-                self.vector_index.add(embeddings_array)
-                print(f"Built vector index with {len(embeddings)} embeddings.")
-        except Exception as e:
-            print(f"Error building vector index: {e}")
+                    print(f"Swapped to vector index version {pointer['version']}.")
+                elif entries is not current.entries or current.embeddings is None:
+                    self._publish(
+                        entries,
+                        *self._persist_vectors(
+                            entries, self._encode_resources(entries)
+                        ),
+                    )
+                    print(
+                        f"Encoded vector index version {pointer['version']} of "
+                        f"{pointer.get('model')} again with {self.embedding_model}."
+                    )
+            except Exception as e:
+                print(f"Error refreshing vector index: {e}")
 
-    def add_to_vector_index(self, resource: Dict[str, Any], index: int) -> None:
+    def _vectors_for(self, entries: List[Dict[str, Any]]) -> tuple:
         """
-        Add a single resource's embedding to the FAISS vector index.
+        Return memory-mapped embeddings for entries, reusing a persisted build if it matches.
 
         Args:
-            resource (Dict[str, Any]): The resource to add.
-            index (int): The index of the resource in the index_data list.
+            entries (List[Dict[str, Any]]): Entries that need embeddings.
+
+        Returns:
+            tuple: (embeddings, vector store version, row map) for the entries.
         """
-        if not self.embedder or not self.vector_index:
-            return
+        persisted = self._persisted_vectors(entries)
+        if persisted is not None:
+            return persisted
+        return self._persist_vectors(entries, self._encode_resources(entries))
+
+    def _persisted_vectors(self, entries: List[Dict[str, Any]]) -> Optional[tuple]:
+        """
+        Map the persisted build of the active model for entries, if there is one.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries that need embeddings.
+
+        Returns:
+            Optional[tuple]: (memory-mapped embeddings, vector store version, row map), or
+                None if no build matches the entries and the embedding model.
+        """
+        pointer = self._vector_store.read_pointer()
+        if (
+            pointer
+            and pointer.get("model") == self.embedding_model
+            and pointer.get("documents") == len(entries)
+            and pointer.get("fingerprint") == fingerprint_entries(entries)
+        ):
+            embeddings, row_docs = self._vector_store.load(pointer)
+            return embeddings, pointer["version"], row_docs
+        return None
+
+    def _persist_vectors(self, entries: List[Dict[str, Any]], embeddings: Any) -> tuple:
+        """
+        Write embeddings to the vector store and map them back read-only.
+
+        Args:
+            entries (List[Dict[str, Any]]): Entries the embeddings were built from.
+            embeddings (Any): Embedding matrix to persist.
+
+        Returns:
+            tuple: (memory-mapped embeddings, vector store version, row map).
+        """
+        pointer = self._vector_store.save(
+            embeddings, fingerprint_entries(entries), self.embedding_model
+        )
+        embeddings, row_docs = self._vector_store.load(pointer)
+        return embeddings, pointer["version"], row_docs
+
+    def _get_embedder(self) -> Any:
+        """
+        Return the embedding model, loading the process-wide shared model on first use.
+
+        Returns:
+            Any: Embedding model with encode() and get_sentence_embedding_dimension().
+        """
+        if self.embedder is None:
+            self.embedder = get_shared_embedder(self.embedding_model)
+        return self.embedder
+
+    def _encode_resources(self, resources: List[Dict[str, Any]]) -> Any:
+        """
+        Encode the content of resources into an embedding matrix in a single batch.
+
+        Args:
+            resources (List[Dict[str, Any]]): Resources to encode.
+
+        Returns:
+            Any: float32 numpy array with one row per resource. Resources without content
+                get a zero vector.
+        """
+        import numpy as np
+
+        embedder = self._get_embedder()
+        dimension = embedder.get_sentence_embedding_dimension()
+        embeddings = np.zeros((len(resources), dimension), dtype="float32")
+        texts = [resource.get("content", "") for resource in resources]
+        non_empty = [i for i, text in enumerate(texts) if text]
+        if non_empty:
+            encoded = embedder.encode(
+                [texts[i][:1000] for i in non_empty]
+            )  # Limit content for performance
+            embeddings[non_empty] = np.asarray(encoded, dtype="float32")
+        return embeddings
+
+    def _updated_embeddings(
+        self, current: IndexSnapshot, entries: List[Dict[str, Any]], changed: List[int]
+    ) -> tuple:
+        """
+        Derive the embeddings for new entries from the current snapshot's embeddings.
+
+        Only the changed entries are encoded, and their rows are appended to the writer's
+        append-only matrix; rows of replaced entries are left in place and unmapped. The
+        rows of the current snapshot are never copied or modified, except to start the
+        matrix from a mapped one, or to drop unused rows once they outnumber the others.
+
+        Args:
+            current (IndexSnapshot): Snapshot the entries were derived from.
+            entries (List[Dict[str, Any]]): Entries of the snapshot being built.
+            changed (List[int]): Document ids that were added or replaced.
+
+        Returns:
+            tuple: (embeddings, row_docs) for the entries, or (None, None) if vectors are
+                not active.
+        """
+        if current.embeddings is None:
+            return None, None
 
         try:
             import numpy as np
 
-            content = resource.get("content", "")
-            if content:
-                embedding = self.embedder.encode(
-                    content[:1000]
-                )  # Limit content for performance
-            else:
-                embedding = np.zeros(self.embedder.get_sentence_embedding_dimension())
-            embedding_array = np.array([embedding]).astype("float32")
-            if index < self.vector_index.ntotal:
-                # Replace existing embedding
-                self.vector_index.remove_ids(np.array([index]))
-                self.vector_index.add_with_ids(embedding_array, np.array([index]))
-            else:
-                # Add new embedding
-                self.vector_index.add_with_ids(embedding_array, np.array([index]))
+            changed = sorted(set(changed))
+            encoded = self._encode_resources([entries[i] for i in changed])
+            if self._vectors_view is not current.embeddings:
+                self._vectors = EmbeddingBuffer.from_rows(current.embeddings)
+                # A mapped matrix is stored already; appends to it are only accepted if
+                # this process wrote it
+                self._persisted_rows = (
+                    len(current.embeddings) if current.vector_version is not None else 0
+                )
+            start = len(self._vectors)
+            self._vectors.append(encoded)
+
+            row_docs = current.row_docs
+            replaced = [i for i in changed if i < len(current.entries)]
+            if replaced or row_docs is not None:
+                # Appended rows embed the changed entries; replaced rows are unmapped
+                if row_docs is None:
+                    row_docs = np.arange(start, dtype="int64")
+                else:
+                    row_docs = row_docs.copy()
+                if replaced:
+                    doc_rows = document_rows(row_docs, len(current.entries))
+                    row_docs[doc_rows[replaced]] = -1
+                row_docs = np.concatenate(
+                    [row_docs, np.asarray(changed, dtype="int64")]
+                )
+            # Otherwise all changed entries were appended in order, so row i is entry i
+
+            if row_docs is not None and len(row_docs) > 2 * len(entries):
+                self._vectors = EmbeddingBuffer.from_rows(
+                    self._vectors.view()[document_rows(row_docs, len(entries))]
+                )
+                row_docs = None
+                self._persisted_rows = 0
+            self._vectors_view = self._vectors.view()
+            return self._vectors_view, row_docs
         except Exception as e:
             print(f"Error adding resource to vector index: {e}")
+            # Rows may have been appended past the view, so the matrix starts over
+            self._vectors, self._vectors_view = None, None
+            self._persisted_rows = 0
+            return None, None
 
     def search_by_similarity(
         self, query: str, k: int = 5, resource_type: Optional[str] = None
@@ -273,33 +1503,45 @@ class IndexManager:
         Returns:
             List[Dict[str, Any]]: List of matching resources ordered by similarity.
         """
-        if not self.embedder or not self.vector_index:
+        self.refresh_vectors()
+        if self.vector_index is None:
             print("Semantic search not available. Initializing vector index now...")
             self.initialize_vector_index()
-            if not self.embedder or not self.vector_index:
+            if self.vector_index is None:
                 print("Failed to initialize vector index for semantic search.")
                 return []
 
+        snapshot = self._snapshot
         try:
             import numpy as np
 
             # Generate embedding for the query
-            query_embedding = self.embedder.encode(query)
+            query_embedding = self._get_embedder().encode(query)
             query_array = np.array([query_embedding]).astype("float32")
             # Search for top k similar embeddings
-            distances, indices = self.vector_index.search(query_array, k)
+            distances, indices = snapshot.vector_index.search(query_array, k)
+            image_hash_index = snapshot.image_hash_index
             results = []
+            seen = set()
             for i, idx in enumerate(indices[0]):
-                if idx >= 0 and idx < len(self.index_data):
-                    entry = self.index_data[idx]
+                if idx >= 0 and idx < len(snapshot.entries):
+                    # Identical copies of an image are reported once, as the closest
+                    idx = int(idx)
+                    original = image_hash_index.identical_of(idx)
+                    if original in seen:
+                        continue
+                    seen.add(original)
+                    entry = snapshot.entries[idx]
                     if (
                         resource_type
                         and entry["metadata"].get("file_type", "").lower()
                         != resource_type.lower()
                     ):
                         continue
-                    entry["similarity_score"] = float(distances[0][i])
-                    results.append(entry)
+                    # Copy so the shared snapshot entry is never written by readers
+                    result = dict(entry)
+                    result["similarity_score"] = float(distances[0][i])
+                    results.append(result)
             return results
         except Exception as e:
             print(f"Error performing similarity search: {e}")
@@ -307,60 +1549,44 @@ class IndexManager:
 
 
 def build_index_from_resources(
-    resources: List[Dict[str, Any]],
+    resources: Iterable[Dict[str, Any]],
     index_file_path: str = "index_data/simple_index.json",
 ) -> IndexManager:
     """
-    Build an index from a list of ingested resources.
+    Build an index from ingested resources.
+
+    Resources are indexed in batches as the iterable produces them, so a generator of
+    ingested resources is never held in memory as a whole.
 
     Args:
-        resources (List[Dict[str, Any]]): List of resources to index.
+        resources (Iterable[Dict[str, Any]]): Resources to index, e.g. a generator.
         index_file_path (str): Path to save the index file.
 
     Returns:
         IndexManager: Initialized IndexManager with the indexed resources.
     """
+    from .pipeline import stream_into_index
+
     indexer = IndexManager(index_file_path)
-    for resource in resources:
-        indexer.add_resource(resource)
-    indexer.save_index()
+    if stream_into_index(resources, indexer) == 0:
+        indexer.save_index()
     return indexer
 
 
 if __name__ == "__main__":
     # Example usage for testing
-    from ..ingestion.text_ingestor import ingest_text_directory
-    from ..ingestion.pdf_ingestor import ingest_pdf_directory
-    from ..ingestion.video_ingestor import ingest_video_directory
-    from ..ingestion.image_ingestor import ingest_image_directory
+    from ..ingestion.resource_ingestor import ResourceIngestor
 
     resources_dir = "../../resources"
-    all_resources = []
-
-    # Ingest all types of resources
-    text_data = ingest_text_directory(os.path.join(resources_dir, "text"))
-    all_resources.extend(text_data)
-    print(f"Added {len(text_data)} text resources.")
-
-    pdf_data = ingest_pdf_directory(os.path.join(resources_dir, "pdf"))
-    all_resources.extend(pdf_data)
-    print(f"Added {len(pdf_data)} PDF resources.")
-
-    video_data = ingest_video_directory(os.path.join(resources_dir, "video"))
-    all_resources.extend(video_data)
-    print(f"Added {len(video_data)} video resources.")
-
-    image_data = ingest_image_directory(os.path.join(resources_dir, "image"))
-    all_resources.extend(image_data)
-    print(f"Added {len(image_data)} image resources.")
 
-    # Build and save index
-    indexer = build_index_from_resources(all_resources)
+    # Ingest all types of resources, indexing them as they are ingested
+    indexer = build_index_from_resources(ResourceIngestor(resources_dir).iter_all())
     print(f"Total resources indexed: {len(indexer.get_all_resources())}")
 
     # Test search functionality
     test_keyword = "programming"
     search_results = indexer.search_by_keyword(test_keyword)
     print(f"Search results for '{test_keyword}': {len(search_results)} matches.")
-    for result in search_results:
+    for result in indexer.search_with_snippets(test_keyword):
         print(f" - {result['metadata'].get('file_name', 'unknown')}")
+        print(f"   {result['snippet']['text']}")
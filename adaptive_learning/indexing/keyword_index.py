@@ -0,0 +1,482 @@
+"""
+Keyword Index Module
+
+This module provides a position-aware inverted index for the Adaptive Learning System.
+Postings record the character offsets of every term occurrence, so keyword lookups no
+longer need to scan every document and search results can carry a query-focused snippet
+instead of the whole document.
+
+Key Responsibilities:
+- Tokenize content into normalized terms while keeping their character offsets.
+- Maintain postings (term -> document -> offsets) for indexed resources.
+- Derive the index of changed documents from the previous one, copying only the postings
+  of the terms they contain.
+- Share fuzzy and prefix lookups over the vocabulary between derived indexes.
+- Resolve keyword queries to candidate documents through the vocabulary.
+- Generate the best-scoring snippet window with highlight spans for a query.
+- Build the snippet of a single document for a query from its content alone.
+
+Dependencies:
+- re: For splitting content into word tokens.
+- threading: For extending the shared vocabulary structures from concurrent readers.
+"""
+
+import re
+import threading
+from typing import Dict, List, Any, Iterable, Iterator, Mapping, Optional, Set, Tuple
+
+from .fuzzy import FuzzyMatcher, fold_accents
+from .autocomplete import PrefixIndex
+
+# Word characters only; Unicode aware so accented Portuguese terms stay whole.
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text into lowercase terms with their character offsets.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        List[Tuple[str, int, int]]: List of (term, start, end) tuples, where start and end
+            are offsets into the original text.
+    """
+    return [
+        (match.group().lower(), match.start(), match.end())
+        for match in TOKEN_PATTERN.finditer(text)
+    ]
+
+
+# The prefix index of a vocabulary is rebuilt once this many documents, or an eighth of
+# the documents it was built for, have changed since it was built
+PREFIX_REBUILD_CHANGES = 64
+
+
+class DocumentFrequencies(Mapping):
+    """
+    A read-only view of the number of documents containing each term of some postings.
+    """
+
+    def __init__(self, postings: Dict[str, Dict[int, List[int]]]):
+        self.postings = postings
+
+    def __getitem__(self, term: str) -> int:
+        return len(self.postings[term])
+
+    def __contains__(self, term: object) -> bool:
+        return term in self.postings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+
+class _Vocabulary:
+    """
+    The terms of a line of keyword indexes derived from one another, and the lookup
+    structures over them shared by those indexes.
+
+    Terms are only ever appended to the log, so structures built over any part of it stay
+    valid for every index of the line; each index skips the terms it does not contain.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.log: List[str] = list(terms)
+        self.logged: Set[str] = set(self.log)
+        self.lock = threading.Lock()
+        self.fuzzy_matcher: Optional[FuzzyMatcher] = None
+        # Number of logged terms the fuzzy matcher covers
+        self.fuzzy_position = 0
+        self.prefix_index: Optional[PrefixIndex] = None
+        self.prefix_position = 0
+        self.prefix_changes = 0
+        self.prefix_documents = 0
+
+    def append(self, terms: Iterable[str]) -> int:
+        """
+        Log the terms not logged yet and return the length of the log.
+        """
+        with self.lock:
+            for term in terms:
+                if term not in self.logged:
+                    self.logged.add(term)
+                    self.log.append(term)
+            return len(self.log)
+
+
+class KeywordIndex:
+    """
+    An inverted index whose postings keep the offsets of each term occurrence.
+
+    Documents are identified by their position in the IndexManager's index data. An index
+    derived with updated shares the posting lists of unchanged terms and the vocabulary
+    structures with the index it was derived from, neither of which is modified after
+    the index is published.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty keyword index.
+        """
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.document_count = 0
+        # Documents changed along the line of indexes this one was derived through
+        self.changes = 0
+        self._vocabulary: Optional[_Vocabulary] = None
+        # Length of the vocabulary log when this index was derived; its terms precede it
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def add_document(self, doc_id: int, text: str) -> None:
+        """
+        Add the terms of a document to the postings.
+
+        Args:
+            doc_id (int): Position of the document in the index data.
+            text (str): Content of the document.
+        """
+        for term, start, _ in tokenize(text):
+            self.postings.setdefault(term, {}).setdefault(doc_id, []).append(start)
+        self.document_count += 1
+
+    def updated(
+        self,
+        removed: Iterable[Tuple[int, str]],
+        added: Iterable[Tuple[int, str]],
+    ) -> "KeywordIndex":
+        """
+        Derive the index of the documents after some were replaced or appended.
+
+        Only the posting lists of the terms of the changed documents are copied; the
+        others are shared with this index, which is left unchanged.
+
+        Args:
+            removed (Iterable[Tuple[int, str]]): (document id, previous content) of the
+                replaced documents.
+            added (Iterable[Tuple[int, str]]): (document id, content) of the replaced
+                and appended documents.
+
+        Returns:
+            KeywordIndex: The derived index.
+        """
+        vocabulary = self._shared_vocabulary()
+        postings = dict(self.postings)
+        copied: Set[str] = set()
+
+        def own(term: str) -> Dict[int, List[int]]:
+            docs = postings.get(term)
+            if docs is None or term not in copied:
+                docs = postings[term] = dict(docs or {})
+                copied.add(term)
+            return docs
+
+        removed_count = 0
+        for doc_id, text in removed:
+            removed_count += 1
+            for term in {term for term, _, _ in tokenize(text)}:
+                docs = own(term)
+                docs.pop(doc_id, None)
+                if not docs:
+                    del postings[term]
+        added_count = 0
+        for doc_id, text in added:
+            added_count += 1
+            for term, start, _ in tokenize(text):
+                own(term).setdefault(doc_id, []).append(start)
+
+        index = KeywordIndex()
+        index.postings = postings
+        index.document_count = self.document_count + added_count - removed_count
+        index.changes = self.changes + added_count
+        index._vocabulary = vocabulary
+        index._position = vocabulary.append(
+            term for term in copied if term not in self.postings
+        )
+        return index
+
+    def _shared_vocabulary(self) -> _Vocabulary:
+        """
+        Return the vocabulary shared by this index's line, logging its terms first.
+        """
+        if self._vocabulary is None:
+            with self._lock:
+                if self._vocabulary is None:
+                    vocabulary = _Vocabulary(self.postings)
+                    self._position = len(vocabulary.log)
+                    self._vocabulary = vocabulary
+        return self._vocabulary
+
+    def vocabulary(self) -> Iterable[str]:
+        """
+        Return the terms currently present in the index.
+
+        Returns:
+            Iterable[str]: Indexed terms.
+        """
+        return self.postings.keys()
+
+    def document_frequencies(self) -> DocumentFrequencies:
+        """
+        Return the number of documents containing each indexed term.
+
+        Returns:
+            DocumentFrequencies: Read-only term -> document count mapping.
+        """
+        return DocumentFrequencies(self.postings)
+
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """
+        Return a fuzzy matcher over the vocabulary, weighted by document frequency.
+
+        The deletion dictionary is shared along the line of derived indexes and only
+        extended with the terms logged since it was built.
+
+        Returns:
+            FuzzyMatcher: Fuzzy matcher restricted to the terms of this index.
+        """
+        vocabulary = self._shared_vocabulary()
+        with vocabulary.lock:
+            if vocabulary.fuzzy_matcher is None:
+                vocabulary.fuzzy_matcher = FuzzyMatcher(dict.fromkeys(vocabulary.log))
+                vocabulary.fuzzy_position = len(vocabulary.log)
+            elif vocabulary.fuzzy_position < self._position:
+                vocabulary.fuzzy_matcher.add_terms(
+                    vocabulary.log[vocabulary.fuzzy_position :]
+                )
+                vocabulary.fuzzy_position = len(vocabulary.log)
+            matcher = vocabulary.fuzzy_matcher
+        return matcher.with_frequencies(self.document_frequencies())
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Return the terms starting with a prefix that most documents contain.
+
+        Completions come from a prefix index shared along the line of derived indexes,
+        plus the terms logged since it was built. The prefix index is rebuilt once enough
+        documents have changed, so between rebuilds the candidates are those that were
+        most frequent then, ranked by their current frequency.
+
+        Args:
+            prefix (str): Typed prefix; case and accents are ignored.
+            limit (int): Maximum number of completions.
+
+        Returns:
+            List[Tuple[str, int]]: (term, document count) pairs, most frequent first.
+        """
+        prefix_index, recent = self._prefix_lookup()
+        folded = fold_accents(prefix.strip())
+        if not folded:
+            return []
+        candidates = {term for term, _ in prefix_index.complete(prefix, limit)}
+        candidates.update(
+            term for term in recent if fold_accents(term).startswith(folded)
+        )
+        frequencies = [
+            (term, len(self.postings[term]))
+            for term in candidates
+            if term in self.postings
+        ]
+        frequencies.sort(key=lambda item: (-item[1], fold_accents(item[0])))
+        return frequencies[:limit]
+
+    def _prefix_lookup(self) -> Tuple[PrefixIndex, List[str]]:
+        """
+        Return the shared prefix index, rebuilt first if too many documents or terms
+        changed since it was built, and the terms logged for this index since then.
+        """
+        vocabulary = self._shared_vocabulary()
+        with vocabulary.lock:
+            if (
+                vocabulary.prefix_index is None
+                or self.changes - vocabulary.prefix_changes
+                > max(PREFIX_REBUILD_CHANGES, vocabulary.prefix_documents // 8)
+                or self._position - vocabulary.prefix_position
+                > max(PREFIX_REBUILD_CHANGES, len(vocabulary.prefix_index) // 8)
+            ):
+                # Every logged term is kept, so indexes of the line that still
+                # contain a term this one lost can complete it too
+                vocabulary.prefix_index = PrefixIndex(
+                    {term: len(self.postings.get(term, ())) for term in vocabulary.log}
+                )
+                vocabulary.prefix_position = len(vocabulary.log)
+                vocabulary.prefix_changes = self.changes
+                vocabulary.prefix_documents = self.document_count
+            return (
+                vocabulary.prefix_index,
+                vocabulary.log[vocabulary.prefix_position : self._position],
+            )
+
+    def matching_terms(self, query_term: str) -> List[str]:
+        """
+        Find the vocabulary terms that start with a query term.
+
+        Prefix matching keeps "loop" matching "loops", and the terms are found in the
+        range of the query term in the prefix index instead of scanning the vocabulary.
+
+        Args:
+            query_term (str): Lowercase query term.
+
+        Returns:
+            List[str]: Vocabulary terms starting with the query term, in sorted order.
+        """
+        prefix_index, recent = self._prefix_lookup()
+        return sorted(
+            term
+            for term in prefix_index.prefix_terms(query_term) + recent
+            if term.startswith(query_term) and term in self.postings
+        )
+
+    def candidate_documents(self, keyword: str) -> Optional[Set[int]]:
+        """
+        Resolve a keyword to the documents that may contain it.
+
+        A document matches when every word of the keyword starts one of its terms, so the
+        intersection of the per-word document sets holds the documents to check.
+
+        Args:
+            keyword (str): Keyword or phrase to look up.
+
+        Returns:
+            Optional[Set[int]]: Candidate document ids, or None if the keyword has no word
+                characters and cannot be resolved through the postings.
+        """
+        query_terms = [term for term, _, _ in tokenize(keyword)]
+        if not query_terms:
+            return None
+        candidates: Optional[Set[int]] = None
+        for query_term in query_terms:
+            docs: Set[int] = set()
+            for term in self.matching_terms(query_term):
+                docs.update(self.postings[term].keys())
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return set()
+        return candidates
+
+    def term_positions(
+        self, doc_id: int, terms: Iterable[str]
+    ) -> List[Tuple[int, int, str]]:
+        """
+        Collect the offsets of the given terms inside a document.
+
+        Args:
+            doc_id (int): Document id.
+            terms (Iterable[str]): Indexed terms to collect.
+
+        Returns:
+            List[Tuple[int, int, str]]: Sorted list of (start, end, term) spans.
+        """
+        positions = []
+        for term in terms:
+            for start in self.postings.get(term, {}).get(doc_id, []):
+                positions.append((start, start + len(term), term))
+        positions.sort()
+        return positions
+
+
+def build_snippet(
+    content: str,
+    positions: List[Tuple[int, int, str]],
+    window: int = 200,
+) -> Dict[str, Any]:
+    """
+    Select the best-scoring window of the content for a set of term occurrences.
+
+    The window covering the most distinct query terms wins, with the total number of hits
+    as a tie-breaker. Window edges are moved to whitespace so words are not cut in half.
+
+    Args:
+        content (str): Full document content.
+        positions (List[Tuple[int, int, str]]): Sorted (start, end, term) spans to highlight.
+        window (int): Maximum snippet length in characters.
+
+    Returns:
+        Dict[str, Any]: Snippet with its text, its start and end offsets in the content and
+            highlight spans relative to the snippet text.
+    """
+    if not positions:
+        end = _align_end(content, min(window, len(content)))
+        return {"text": content[:end], "start": 0, "end": end, "highlights": []}
+
+    best_start, best_score = positions[0][0], (0, 0)
+    term_counts: Dict[str, int] = {}
+    left = 0
+    # Two-pointer sweep over the hits: the window always starts at positions[left]
+    for right, (_, end, term) in enumerate(positions):
+        term_counts[term] = term_counts.get(term, 0) + 1
+        while end - positions[left][0] > window:
+            left_term = positions[left][2]
+            term_counts[left_term] -= 1
+            if not term_counts[left_term]:
+                del term_counts[left_term]
+            left += 1
+        score = (len(term_counts), right - left + 1)
+        if score > best_score:
+            best_score, best_start = score, positions[left][0]
+
+    # Center the winning hits in the window and snap the edges to word boundaries
+    covered_end = max(
+        end for start, end, _ in positions if best_start <= start < best_start + window
+    )
+    slack = max(0, window - (covered_end - best_start))
+    start = min(_align_start(content, max(0, best_start - slack // 2)), best_start)
+    end = max(_align_end(content, min(len(content), start + window)), covered_end)
+    highlights = [
+        [hit_start - start, hit_end - start]
+        for hit_start, hit_end, _ in positions
+        if hit_start >= start and hit_end <= end
+    ]
+    return {
+        "text": content[start:end],
+        "start": start,
+        "end": end,
+        "highlights": highlights,
+    }
+
+
+def query_snippet(content: str, query: str, window: int = 200) -> Dict[str, Any]:
+    """
+    Select the best-scoring window of a document for a query, without its postings.
+
+    Terms match as in KeywordIndex.matching_terms: a content term matches when it
+    starts with a word of the query.
+
+    Args:
+        content (str): Full document content.
+        query (str): Query text.
+        window (int): Maximum snippet length in characters.
+
+    Returns:
+        Dict[str, Any]: Snippet as returned by build_snippet.
+    """
+    query_terms = {term for term, _, _ in tokenize(query)}
+    positions = [
+        (start, end, term)
+        for term, start, end in tokenize(content)
+        if any(term.startswith(query_term) for query_term in query_terms)
+    ]
+    return build_snippet(content, positions, window)
+
+
+def _align_start(content: str, offset: int) -> int:
+    """
+    Move a snippet start forward to the beginning of the next word.
+    """
+    if offset <= 0:
+        return 0
+    space = content.find(" ", offset - 1, offset + 20)
+    return space + 1 if space != -1 else offset
+
+
+def _align_end(content: str, offset: int) -> int:
+    """
+    Move a snippet end back to the end of the previous word.
+    """
+    if offset >= len(content):
+        return len(content)
+    space = content.rfind(" ", max(0, offset - 20), offset + 1)
+    return space if space > 0 else offset
@@ -0,0 +1,214 @@
+"""
+Indexing Pipeline Module
+
+This module streams ingested resources into the index of the Adaptive Learning System.
+Instead of collecting every ingested document in one list before indexing, resources flow
+from the ingestors through a bounded queue into the IndexManager, which embeds them in
+micro-batches and commits the index to disk periodically. Besides the index itself, which
+holds every entry and embedding in memory, only the queued resources and the current batch
+are held. Each commit saves only the resources indexed since the previous one, so the
+total time spent committing grows linearly with the corpus.
+
+Key Responsibilities:
+- Run the ingestion producer in a background thread feeding a bounded queue.
+- Group queued resources into micro-batches, so embeddings are encoded in batches.
+- Save the index every few resources and report which files each commit persisted.
+- Stop the producer and close its source when indexing fails.
+
+Dependencies:
+- queue: For the bounded hand-off between the producer and the indexer.
+- threading: For running the producer concurrently with indexing.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .index_manager import IndexManager
+
+# Marks the end of the producer's resources in the queue
+_DONE = object()
+# How often a producer waiting for room in the queue checks whether indexing stopped
+_PUT_POLL_SECONDS = 0.1
+
+
+class IndexingPipeline:
+    """
+    Streams resources from an iterable into an IndexManager.
+
+    The iterable (typically a generator over ingested files) is consumed in a background
+    thread, so ingestion of the next files overlaps with embedding the current batch. The
+    producer blocks when queue_size resources are waiting to be indexed.
+    """
+
+    def __init__(
+        self,
+        index_manager: IndexManager,
+        batch_size: int = 16,
+        commit_interval: int = 256,
+        queue_size: int = 32,
+        on_commit: Optional[Callable[[List[str]], None]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            index_manager (IndexManager): Index receiving the resources.
+            batch_size (int): Maximum number of resources added (and embedded) at once.
+            commit_interval (int): Number of resources indexed between index saves.
+            queue_size (int): Maximum number of ingested resources waiting to be indexed.
+            on_commit (Optional[Callable[[List[str]], None]]): Called after each save with
+                the file paths of the resources it persisted.
+        """
+        self.index_manager = index_manager
+        self.batch_size = max(1, batch_size)
+        self.commit_interval = max(1, commit_interval)
+        self.queue_size = max(1, queue_size)
+        self.on_commit = on_commit
+
+    def _produce(
+        self,
+        resources: Iterable[Dict[str, Any]],
+        buffer: queue.Queue,
+        errors: list,
+        stop: threading.Event,
+    ) -> None:
+        """
+        Put resources into the queue, followed by the end marker, until they run out or
+        the indexer stops. The source is closed either way, so a generator releases what
+        it holds (such as ingestion worker processes).
+        """
+        iterator = iter(resources)
+        try:
+            for resource in iterator:
+                if not self._put(buffer, resource, stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    errors.append(e)
+            self._put(buffer, _DONE, stop)
+
+    def _put(self, buffer: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """
+        Put an item into the queue once there is room, unless the indexer stops first.
+
+        Returns:
+            bool: Whether the item was queued.
+        """
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _commit(self, file_paths: List[str]) -> None:
+        """
+        Save the index and report the files it persisted.
+        """
+        self.index_manager.save_index()
+        if self.on_commit:
+            self.on_commit(file_paths)
+
+    def run(self, resources: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index all resources of an iterable.
+
+        A batch is indexed as soon as batch_size resources are queued, or earlier when the
+        producer is slower than the indexer, so resources never wait for a full batch.
+
+        Args:
+            resources (Iterable[Dict[str, Any]]): Ingested resources to index.
+
+        Returns:
+            int: Number of resources indexed.
+
+        Raises:
+            Exception: Any error raised by the iterable, after the resources produced
+                before it have been indexed and saved, or by indexing, after the producer
+                has stopped and closed the iterable.
+        """
+        buffer: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        errors: list = []
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(resources, buffer, errors, stop), daemon=True
+        )
+        producer.start()
+
+        indexed = 0
+        uncommitted: List[str] = []
+        done = False
+        try:
+            while not done:
+                # Wait for the first resource of a batch, then take what is queued
+                batch = []
+                item = buffer.get()
+                while item is not _DONE:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = buffer.get_nowait()
+                    except queue.Empty:
+                        break
+                done = item is _DONE
+
+                if batch:
+                    self.index_manager.add_resources(batch)
+                    indexed += len(batch)
+                    uncommitted.extend(
+                        resource["metadata"].get("file_path", "") for resource in batch
+                    )
+                if uncommitted and (done or len(uncommitted) >= self.commit_interval):
+                    self._commit(uncommitted)
+                    uncommitted = []
+        finally:
+            # If indexing failed, the producer may be waiting for room in the queue
+            stop.set()
+            while True:
+                try:
+                    buffer.get_nowait()
+                except queue.Empty:
+                    break
+            producer.join()
+        if errors:
+            raise errors[0]
+        return indexed
+
+
+def stream_into_index(
+    resources: Iterable[Dict[str, Any]],
+    index_manager: IndexManager,
+    batch_size: int = 16,
+    commit_interval: int = 256,
+    on_commit: Optional[Callable[[List[str]], None]] = None,
+) -> int:
+    """
+    Index resources as they are produced, saving the index periodically.
+
+    Args:
+        resources (Iterable[Dict[str, Any]]): Ingested resources to index.
+        index_manager (IndexManager): Index receiving the resources.
+        batch_size (int): Maximum number of resources added (and embedded) at once.
+        commit_interval (int): Number of resources indexed between index saves.
+        on_commit (Optional[Callable[[List[str]], None]]): Called after each save with
+            the file paths of the resources it persisted.
+
+    Returns:
+        int: Number of resources indexed.
+    """
+    pipeline = IndexingPipeline(
+        index_manager,
+        batch_size=batch_size,
+        commit_interval=commit_interval,
+        on_commit=on_commit,
+    )
+    return pipeline.run(resources)
@@ -0,0 +1,570 @@
+"""
+Vector Store Module
+
+This module persists the embedding matrix of the Adaptive Learning System as a .npy file
+that every process memory-maps read-only. Web workers share the matrix pages through the
+OS page cache instead of each holding a private copy, and pick up new builds through a
+versioned pointer file.
+
+Key Responsibilities:
+- Write embedding matrices as versioned .npy files with an atomic pointer swap.
+- Append the rows of new embeddings to the current file, so saves cost the new rows only.
+- Memory-map the current version read-only and detect when a newer build lands.
+- Run exact L2 nearest-neighbour search directly over the mapped matrix.
+- Grow the in-memory matrix of a writer append-only, so writes never copy published rows.
+
+Dependencies:
+- numpy: For the .npy format, memory mapping and the fallback search kernel.
+- faiss (optional): For the brute-force search kernel over external arrays.
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+
+POINTER_FILE = "CURRENT.json"
+
+# Fingerprints are sums of per-entry hashes modulo 2**FINGERPRINT_BITS
+FINGERPRINT_BITS = 128
+
+
+def entry_fingerprint(doc_id: int, entry: Dict[str, Any]) -> int:
+    """
+    Hash an index entry's document id, path and indexing timestamps.
+
+    Args:
+        doc_id (int): Document id of the entry.
+        entry (Dict[str, Any]): Index entry.
+
+    Returns:
+        int: Hash of the entry, to be summed into a fingerprint.
+    """
+    metadata = entry.get("metadata", {})
+    digest = hashlib.sha1(str(doc_id).encode("utf-8"))
+    for key in ("file_path", "indexed_at", "updated_at"):
+        digest.update(b"\0")
+        digest.update(str(metadata.get(key, "")).encode("utf-8"))
+    return int.from_bytes(digest.digest()[: FINGERPRINT_BITS // 8], "big")
+
+
+def format_fingerprint(total: int) -> str:
+    """
+    Format a sum of entry hashes as a fingerprint.
+
+    Args:
+        total (int): Sum of entry_fingerprint values.
+
+    Returns:
+        str: Hex fingerprint.
+    """
+    return f"{total % (1 << FINGERPRINT_BITS):0{FINGERPRINT_BITS // 4}x}"
+
+
+def fingerprint_entries(entries: List[Dict[str, Any]]) -> str:
+    """
+    Compute a fingerprint identifying a list of index entries.
+
+    Embeddings are only reused for the exact entries they were built from, so the
+    fingerprint covers each entry's path and indexing timestamps with its document id.
+    It is a sum of per-entry hashes, so a writer can update it for the entries it adds or
+    replaces without hashing the whole index again.
+
+    Args:
+        entries (List[Dict[str, Any]]): Index entries.
+
+    Returns:
+        str: Hex fingerprint of the entries.
+    """
+    return format_fingerprint(
+        sum(entry_fingerprint(i, entry) for i, entry in enumerate(entries))
+    )
+
+
+def document_rows(row_docs: Any, count: int) -> Any:
+    """
+    Invert a row map into the embedding row of each document.
+
+    Args:
+        row_docs (Any): int64 array with the document id of each row, or -1 for rows of
+            documents that were replaced.
+        count (int): Number of documents.
+
+    Returns:
+        Any: int64 array with the row of each document id.
+    """
+    import numpy as np
+
+    live = np.flatnonzero(row_docs >= 0)
+    doc_rows = np.zeros(count, dtype="int64")
+    doc_rows[row_docs[live]] = live
+    return doc_rows
+
+
+def live_row_docs(row_ids: Any) -> Any:
+    """
+    Build a row map from the document id each row was appended for.
+
+    A document's rows are appended in order, so only its last row is live.
+
+    Args:
+        row_ids (Any): int64 array with the document id of each row, or -1.
+
+    Returns:
+        Any: int64 array with the document id of each live row and -1 for the others,
+            or None if row i embeds document i.
+    """
+    import numpy as np
+
+    row_ids = np.asarray(row_ids, dtype="int64")
+    if np.array_equal(row_ids, np.arange(len(row_ids))):
+        return None
+    docs, first = np.unique(row_ids[::-1], return_index=True)
+    last = len(row_ids) - 1 - first
+    row_docs = np.full(len(row_ids), -1, dtype="int64")
+    row_docs[last[docs >= 0]] = docs[docs >= 0]
+    return row_docs
+
+
+class EmbeddingBuffer:
+    """
+    An append-only embedding matrix that grows by doubling its capacity.
+
+    Rows are only written past the rows already handed out by view(), so the view held
+    by a published snapshot never changes. Growing the capacity copies the rows into a
+    new array, an amortized constant cost per row, and leaves earlier views on the old
+    array.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            dimension (int): Number of columns of the embeddings.
+            capacity (int): Number of rows allocated up front.
+        """
+        import numpy as np
+
+        self._data = np.zeros((max(1, capacity), dimension), dtype="float32")
+        self._count = 0
+
+    @classmethod
+    def from_rows(cls, rows: Any) -> "EmbeddingBuffer":
+        """
+        Create a buffer holding a copy of existing rows (e.g. a mapped matrix).
+
+        Args:
+            rows (Any): float32 matrix to copy.
+
+        Returns:
+            EmbeddingBuffer: Buffer with the rows and room to grow.
+        """
+        buffer = cls(rows.shape[1], 2 * len(rows))
+        buffer.append(rows)
+        return buffer
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, rows: Any) -> None:
+        """
+        Append rows at the end of the matrix.
+
+        Args:
+            rows (Any): float32 matrix with the buffer's number of columns.
+        """
+        import numpy as np
+
+        end = self._count + len(rows)
+        if end > len(self._data):
+            data = np.zeros(
+                (max(end, 2 * len(self._data)), self._data.shape[1]), dtype="float32"
+            )
+            data[: self._count] = self._data[: self._count]
+            self._data = data
+        self._data[self._count : end] = rows
+        self._count = end
+
+    def view(self) -> Any:
+        """
+        Return the rows appended so far, as a view that later appends never modify.
+
+        Returns:
+            Any: float32 array view of the rows.
+        """
+        return self._data[: self._count]
+
+
+class VectorIndex:
+    """
+    Exact L2 search over an embedding matrix that may be a read-only memory map.
+
+    Mirrors the parts of the faiss.IndexFlatL2 interface used by the IndexManager without
+    copying the matrix into the process. Rows can be mapped to document ids, so the
+    rows of replaced documents stay in an append-only matrix without being returned.
+    """
+
+    def __init__(self, embeddings: Any, row_docs: Any = None):
+        """
+        Initialize the index over an embedding matrix.
+
+        Args:
+            embeddings (Any): float32 numpy array (or memmap) with one row per document.
+            row_docs (Any): Optional int64 array with the document id of each row, or -1
+                for rows that are no longer used. Row i embeds document i when omitted.
+        """
+        self.embeddings = embeddings
+        self.row_docs = row_docs
+        self._dead_rows = 0 if row_docs is None else int((row_docs < 0).sum())
+
+    @property
+    def ntotal(self) -> int:
+        """
+        Number of indexed vectors.
+        """
+        return len(self.embeddings) - self._dead_rows
+
+    def search(self, query_array: Any, k: int) -> Tuple[Any, Any]:
+        """
+        Find the k nearest embeddings of each query by squared L2 distance.
+
+        Args:
+            query_array (Any): float32 array of shape (queries, dimension).
+            k (int): Number of neighbours per query.
+
+        Returns:
+            Tuple[Any, Any]: Distances and document id arrays of shape (queries, k).
+                Missing neighbours are reported with index -1, as FAISS does.
+        """
+        import numpy as np
+
+        distances = np.full((len(query_array), k), np.inf, dtype="float32")
+        indices = np.full((len(query_array), k), -1, dtype="int64")
+        # Unused rows may be among the nearest, so enough rows are searched to skip them
+        found = min(k + self._dead_rows, len(self.embeddings))
+        if found == 0:
+            return distances, indices
+        try:
+            import faiss
+
+            # faiss.knn searches external arrays, so the mapped matrix is not copied
+            found_distances, found_indices = faiss.knn(
+                query_array, self.embeddings, found
+            )
+        except (ImportError, AttributeError):
+            found_distances, found_indices = self._numpy_knn(query_array, found)
+        if self.row_docs is None:
+            distances[:, :found] = found_distances
+            indices[:, :found] = found_indices
+            return distances, indices
+        for query, rows in enumerate(found_indices):
+            docs = np.where(rows >= 0, self.row_docs[rows], -1)
+            live = np.flatnonzero(docs >= 0)[:k]
+            distances[query, : len(live)] = found_distances[query, live]
+            indices[query, : len(live)] = docs[live]
+        return distances, indices
+
+    def _numpy_knn(self, query_array: Any, k: int) -> Tuple[Any, Any]:
+        """
+        Brute-force k nearest neighbour search with numpy.
+        """
+        import numpy as np
+
+        all_distances = (
+            (query_array**2).sum(axis=1)[:, None]
+            - 2 * query_array @ self.embeddings.T
+            + (self.embeddings**2).sum(axis=1)[None, :]
+        )
+        indices = np.argsort(all_distances, axis=1)[:, :k]
+        return np.take_along_axis(all_distances, indices, axis=1), indices
+
+
+class VectorStore:
+    """
+    Versioned on-disk storage for embedding matrices shared between processes.
+
+    Each build is written to its own embeddings-<version>.npy file, next to a
+    rows-<version>.npy file with the document id of each row, and a small pointer file
+    names the current version and how many rows it covers. The writer of a build appends
+    the rows of later saves to its files and then moves the pointer, so rows are never
+    modified once a pointer covers them and processes can keep mapping an older pointer
+    until they swap to the new one.
+    """
+
+    def __init__(self, directory: str, keep_versions: int = 2):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Directory holding the .npy files and the pointer file.
+            keep_versions (int): Number of most recent versions kept on disk.
+        """
+        self.directory = directory
+        self.keep_versions = keep_versions
+        self._pointer_stat: Optional[Tuple[int, int]] = None
+        # Pointer last published by this store, whose files it may append to
+        self._current: Optional[Dict[str, Any]] = None
+
+    @property
+    def pointer_path(self) -> str:
+        return os.path.join(self.directory, POINTER_FILE)
+
+    def read_pointer(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the pointer to the current version.
+
+        Returns:
+            Optional[Dict[str, Any]]: Version, file names, fingerprint, model and shape of
+                the current matrix, or None if nothing has been stored yet.
+        """
+        try:
+            stat = os.stat(self.pointer_path)
+            with open(self.pointer_path, "r", encoding="utf-8") as f:
+                pointer = json.load(f)
+            self._pointer_stat = (stat.st_mtime_ns, stat.st_size)
+            if self._current and self._current["version"] != pointer.get("version"):
+                # Another store published since, so its files are no longer ours to grow
+                self._current = None
+            return pointer
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading vector store pointer {self.pointer_path}: {e}")
+            return None
+
+    def has_changed(self) -> bool:
+        """
+        Check cheaply whether the pointer file changed since it was last read.
+
+        Returns:
+            bool: True if a different version may have been published.
+        """
+        try:
+            stat = os.stat(self.pointer_path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) != self._pointer_stat
+
+    def load(self, pointer: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Memory-map the matrix a pointer refers to.
+
+        Args:
+            pointer (Dict[str, Any]): Pointer returned by read_pointer.
+
+        Returns:
+            Tuple[Any, Any]: Read-only numpy memmap with the embedding rows the pointer
+                covers, and the int64 document id of each row (-1 for rows of replaced
+                documents), or None if row i embeds document i.
+        """
+        import numpy as np
+
+        count, dimension = pointer["count"], pointer["dimension"]
+        path = os.path.join(self.directory, pointer["file"])
+        if count == 0:
+            embeddings = np.zeros((0, dimension), dtype="float32")
+        else:
+            # Rows past the count may be an append that is not published yet
+            embeddings = np.memmap(
+                path,
+                dtype="float32",
+                mode="r",
+                offset=_data_offset(path),
+                shape=(count, dimension),
+            )
+        row_docs = None
+        if pointer.get("rows"):
+            path = os.path.join(self.directory, pointer["rows"])
+            with open(path, "rb") as f:
+                f.seek(_data_offset(path))
+                row_ids = np.fromfile(f, dtype="int64", count=count)
+            row_docs = live_row_docs(row_ids)
+        return embeddings, row_docs
+
+    def save(
+        self,
+        embeddings: Any,
+        fingerprint: str,
+        model: str,
+        row_docs: Any = None,
+        documents: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Write a new version of the matrix and make it current.
+
+        Args:
+            embeddings (Any): float32 embedding matrix.
+            fingerprint (str): Fingerprint of the entries the matrix was built from.
+            model (str): Name of the embedding model.
+            row_docs (Any): Optional int64 array with the document id of each row, or -1
+                for unused rows. Row i embeds document i when omitted.
+            documents (Optional[int]): Number of entries; defaults to the number of rows.
+
+        Returns:
+            Dict[str, Any]: Pointer to the new version.
+        """
+        import numpy as np
+
+        os.makedirs(self.directory, exist_ok=True)
+        version = time.time_ns()
+        suffix = f"{version}-{os.getpid()}.npy"
+        if row_docs is None:
+            row_docs = np.arange(len(embeddings), dtype="int64")
+        for name, array in (
+            (f"embeddings-{suffix}", np.asarray(embeddings, dtype="float32")),
+            (f"rows-{suffix}", np.asarray(row_docs, dtype="int64")),
+        ):
+            temp_path = os.path.join(self.directory, f".{name}.tmp")
+            with open(temp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temp_path, os.path.join(self.directory, name))
+
+        self._write_pointer(
+            {
+                "version": version,
+                "file": f"embeddings-{suffix}",
+                "rows": f"rows-{suffix}",
+                "fingerprint": fingerprint,
+                "model": model,
+                "count": int(len(embeddings)),
+                "documents": int(len(embeddings) if documents is None else documents),
+                "dimension": int(embeddings.shape[1]),
+            }
+        )
+        self._remove_old_versions()
+        return self._current
+
+    def append(
+        self,
+        rows: Any,
+        start: int,
+        fingerprint: str,
+        documents: int,
+        row_docs: Any = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Append rows to the version this store last published and publish them.
+
+        Only the new rows are written, so saving a growing matrix costs the rows added
+        since the previous save rather than the whole matrix.
+
+        Args:
+            rows (Any): float32 embedding rows to append.
+            start (int): Number of rows the appended rows follow, which must be the row
+                count of the current version.
+            fingerprint (str): Fingerprint of the entries the matrix was built from.
+            documents (int): Number of entries.
+            row_docs (Any): Optional int64 document id of each appended row, or -1 for
+                unused rows. Row i embeds document i when omitted.
+
+        Returns:
+            Optional[Dict[str, Any]]: Pointer to the new version, or None if the current
+                version was not published by this store or does not end at start, in
+                which case the whole matrix has to be saved.
+        """
+        import numpy as np
+
+        current = self._current
+        if (
+            current is None
+            or current["count"] != start
+            or not current.get("rows")
+            or self.has_changed()
+        ):
+            return None
+        if row_docs is None:
+            row_docs = np.arange(start, start + len(rows), dtype="int64")
+        count = start + len(rows)
+        for name, array in (
+            (current["file"], np.asarray(rows, dtype="float32")),
+            (current["rows"], np.asarray(row_docs, dtype="int64")),
+        ):
+            path = os.path.join(self.directory, name)
+            offset = _data_offset(path)
+            with open(path, "r+b") as f:
+                # Leftovers of an interrupted append past the published rows are dropped
+                end = offset + start * array.itemsize * int(np.prod(array.shape[1:]))
+                if os.fstat(f.fileno()).st_size > end:
+                    f.truncate(end)
+                f.seek(end)
+                f.write(np.ascontiguousarray(array).tobytes())
+                _update_shape(f, offset, (count,) + array.shape[1:], array.dtype)
+
+        self._write_pointer(
+            dict(
+                current,
+                version=time.time_ns(),
+                fingerprint=fingerprint,
+                count=count,
+                documents=documents,
+            )
+        )
+        return self._current
+
+    def _write_pointer(self, pointer: Dict[str, Any]) -> None:
+        """
+        Atomically replace the pointer file, making a version current.
+        """
+        temp_pointer = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(temp_pointer, "w", encoding="utf-8") as f:
+            json.dump(pointer, f)
+        # Readers see either the previous pointer or the new one, never a partial file
+        os.replace(temp_pointer, self.pointer_path)
+        stat = os.stat(self.pointer_path)
+        self._pointer_stat = (stat.st_mtime_ns, stat.st_size)
+        self._current = pointer
+
+    def _remove_old_versions(self) -> None:
+        """
+        Delete the files of all but the most recent versions. Processes that still map a
+        deleted file keep their pages until they swap; deletion failures (e.g. on
+        Windows) are ignored.
+        """
+        files = [
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(".npy") and name.startswith(("embeddings-", "rows-"))
+        ]
+        versions = sorted({int(name.split("-")[1]) for name in files})
+        removed = set(versions[: -self.keep_versions])
+        for name in files:
+            if int(name.split("-")[1]) in removed:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+def _data_offset(path: str) -> int:
+    """
+    Return the offset of the data of a .npy file, after its header.
+    """
+    import numpy as np
+
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            np.lib.format.read_array_header_1_0(f)
+        else:
+            np.lib.format.read_array_header_2_0(f)
+        return f.tell()
+
+
+def _update_shape(f: Any, offset: int, shape: Tuple[int, ...], dtype: Any) -> None:
+    """
+    Rewrite the header of a .npy file open for update to a new shape, so the file stays
+    loadable with numpy.load after rows are appended. numpy pads headers to leave room
+    for the first dimension to grow; the header is left as is if it would not fit.
+    """
+    import io
+    import numpy as np
+
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, {"descr": np.dtype(dtype).str, "fortran_order": False, "shape": shape}
+    )
+    if len(header.getvalue()) == offset:
+        f.seek(0)
+        f.write(header.getvalue())
@@ -7,9 +7,13 @@ and extracting content and metadata for indexing.
 
 Modules:
 - text_ingestor: Handles ingestion of text files (.txt, .json) using NLP tools.
+- json_ingestor: Streams JSON exercise banks into one resource per exercise.
 - pdf_ingestor: Handles ingestion of PDF files using text extraction libraries.
 - video_ingestor: Handles ingestion of video files by extracting and transcribing audio.
-- image_ingestor: Handles ingestion of image files by extracting metadata.
+- image_ingestor: Handles ingestion of image files by extracting metadata and text (OCR).
+- image_hash: Computes perceptual hashes of images.
+- parallel: Runs the file ingestors across a pool of worker processes.
+- cache: Size-limited on-disk cache of extraction results keyed by file content.
 
 Key Responsibilities:
 - Ingest diverse educational resources for the Adaptive Learning System.
@@ -19,19 +23,22 @@ Key Responsibilities:
 """
 
 from .text_ingestor import ingest_text_file, ingest_text_directory
-from .pdf_ingestor import ingest_pdf_file, ingest_pdf_directory
+from .pdf_ingestor import ingest_pdf_file, ingest_pdf_pages, ingest_pdf_directory
 from .video_ingestor import ingest_video_file, ingest_video_directory
 from .image_ingestor import ingest_image_file, ingest_image_directory
+from .parallel import ingest_files_parallel
 from .resource_ingestor import ResourceIngestor
 
 __all__ = [
     "ingest_text_file",
     "ingest_text_directory",
     "ingest_pdf_file",
+    "ingest_pdf_pages",
     "ingest_pdf_directory",
     "ingest_video_file",
     "ingest_video_directory",
     "ingest_image_file",
     "ingest_image_directory",
+    "ingest_files_parallel",
     "ResourceIngestor",
 ]
@@ -0,0 +1,223 @@
+"""
+Content Cache Module
+
+This module caches the results of expensive extraction (video transcripts, PDF text, OCR,
+text analysis) for the Adaptive Learning System. Results are keyed by the content hash of
+the file and a namespace naming the extractor and its version, so a file that is ingested
+again, moved, renamed or merely touched reuses the results already extracted, and an
+interrupted extraction resumes from the parts it completed.
+
+Key Responsibilities:
+- Store and retrieve extraction results keyed by (namespace, file hash, key).
+- Write each result atomically, so concurrent workers can fill the cache of one file.
+- Separate results produced by different extractors and extractor versions.
+- Bound the size of the cache, evicting the least recently used results first.
+
+Dependencies:
+- json: For storing results.
+- os: For cache directories, atomic file replacement and access times.
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CONTENT_CACHE_DIR", os.environ.get("PAGE_CACHE_DIR", "index_data/content_cache")
+)
+
+# Size limit of the whole cache directory, shared by all namespaces
+DEFAULT_MAX_BYTES = int(float(os.environ.get("CONTENT_CACHE_MAX_MB", "2048")) * 2**20)
+
+# Eviction removes results until the cache is this fraction of its limit, and runs again
+# once a process has written EVICTION_INTERVAL of the limit since its last eviction
+EVICTION_TARGET = 0.9
+EVICTION_INTERVAL = 0.05
+
+# Bytes written by this process since it last checked the size of each cache directory
+_written_since_eviction: Dict[str, int] = {}
+
+
+class ContentCache:
+    """
+    A size-limited directory of results, one JSON file per (namespace, file hash, key).
+
+    Reading a result marks it as recently used by updating its modification time, which
+    is the order in which evict removes results once the cache outgrows its limit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        namespace: str = "content",
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (Optional[str]): Directory where results are stored; defaults to
+                DEFAULT_CACHE_DIR (set by the CONTENT_CACHE_DIR environment variable).
+            namespace (str): Name separating the results of one extractor (and version)
+                from those of others.
+            max_bytes (Optional[int]): Size limit of the cache directory; defaults to
+                DEFAULT_MAX_BYTES (set in MB by the CONTENT_CACHE_MAX_MB environment
+                variable).
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.namespace = namespace
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_MAX_BYTES
+
+    def _entry_path(self, file_hash: str, key: Union[str, int]) -> str:
+        return os.path.join(
+            self.cache_dir, self.namespace, file_hash[:2], file_hash, f"{key}.json"
+        )
+
+    def get(self, file_hash: str, key: Union[str, int]) -> Optional[Any]:
+        """
+        Return a cached result and mark it as recently used.
+
+        Args:
+            file_hash (str): Content hash of the file.
+            key (Union[str, int]): Name of the result within the file (e.g. a page).
+
+        Returns:
+            Optional[Any]: The cached result, or None if it is not cached.
+        """
+        entry_path = self._entry_path(file_hash, key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(entry_path)
+            return result
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cached {key} of {file_hash}: {e}")
+            return None
+
+    def put(self, file_hash: str, key: Union[str, int], result: Any) -> None:
+        """
+        Store a result, evicting least recently used results if the cache is full.
+
+        Args:
+            file_hash (str): Content hash of the file.
+            key (Union[str, int]): Name of the result within the file (e.g. a page).
+            result (Any): JSON-serializable result.
+        """
+        entry_path = self._entry_path(file_hash, key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            temp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            print(f"Error caching {key} of {file_hash}: {e}")
+            return
+
+        # Each process checks the size of the cache when it first writes to it, and then
+        # after every EVICTION_INTERVAL of the limit it writes
+        written = _written_since_eviction.get(self.cache_dir)
+        if written is not None and written + size < self.max_bytes * EVICTION_INTERVAL:
+            _written_since_eviction[self.cache_dir] = written + size
+            return
+        _written_since_eviction[self.cache_dir] = 0
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        List the (last use, size, path) of every result in the cache directory.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:  # Evicted by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used results of all namespaces while the cache
+        directory exceeds its size limit.
+
+        Returns:
+            int: Number of results removed.
+        """
+        try:
+            entries = self._entries()
+        except Exception as e:
+            print(f"Error reading cache directory {self.cache_dir}: {e}")
+            return 0
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        target = self.max_bytes * EVICTION_TARGET
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error evicting cached result {path}: {e}")
+                continue
+            total -= size
+            # Drop the directories of files with no results left
+            directory = os.path.dirname(path)
+            while os.path.normpath(directory) != os.path.normpath(self.cache_dir):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        return removed
+
+
+class PageCache(ContentCache):
+    """
+    A content cache of per-page results, keyed by the 1-based page number.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        namespace: str = "pages",
+        max_bytes: Optional[int] = None,
+    ):
+        super().__init__(cache_dir, namespace, max_bytes)
+
+    def get(self, file_hash: str, page: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result of a page.
+
+        Args:
+            file_hash (str): Content hash of the file.
+            page (int): 1-based page number.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached result, or None if the page is not cached.
+        """
+        return super().get(file_hash, page)
+
+    def put(self, file_hash: str, page: int, result: Dict[str, Any]) -> None:
+        """
+        Store the result of a page.
+
+        Args:
+            file_hash (str): Content hash of the file.
+            page (int): 1-based page number.
+            result (Dict[str, Any]): JSON-serializable page result.
+        """
+        super().put(file_hash, page, result)
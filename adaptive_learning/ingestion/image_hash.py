@@ -0,0 +1,108 @@
+"""
+Image Hash Module
+
+This module computes perceptual hashes of images for the Adaptive Learning System. Unlike a
+hash of the file's bytes, a perceptual hash summarizes what the image looks like, so copies
+of an image that were re-encoded, re-saved with other metadata or converted to another
+format get the same (or a very close) hash.
+
+Key Responsibilities:
+- Compute the 64-bit DCT perceptual hash (pHash) of an image.
+- Compute the 64-bit difference hash (dHash) of an image.
+- Compute both hashes from a single reduced-scale decode of an image file.
+
+Dependencies:
+- PIL (Pillow): For converting and downscaling images.
+- numpy: For the discrete cosine transform of the downscaled image.
+"""
+
+from typing import BinaryIO, Dict, Union
+
+import numpy as np
+from PIL import Image
+
+# The image is downscaled to PHASH_IMAGE_SIZE pixels square, and the lowest
+# PHASH_SIZE x PHASH_SIZE frequencies of its DCT make up the hash
+PHASH_IMAGE_SIZE = 32
+PHASH_SIZE = 8
+
+# The dHash compares neighboring pixels of the image downscaled to (DHASH_SIZE + 1) x
+# DHASH_SIZE pixels
+DHASH_SIZE = 8
+
+# JPEG images are decoded at reduced scale, to about this size, to compute their hashes
+HASH_DRAFT_SIZE = 64
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """
+    Return the orthonormal DCT-II matrix of the given size.
+    """
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+_DCT = _dct_matrix(PHASH_IMAGE_SIZE)
+
+
+def phash(image: Image.Image) -> str:
+    """
+    Compute the perceptual hash of an image.
+
+    The image is converted to grayscale and downscaled, and each bit of the hash tells
+    whether one of the low frequencies of its 2D DCT is above their median.
+
+    Args:
+        image (Image.Image): The image; its pixels are decoded if they were not already.
+
+    Returns:
+        str: The 64-bit hash as 16 hexadecimal digits.
+    """
+    small = image.convert("L").resize(
+        (PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.LANCZOS
+    )
+    pixels = np.asarray(small, dtype=np.float64)
+    frequencies = (_DCT @ pixels @ _DCT.T)[:PHASH_SIZE, :PHASH_SIZE].flatten()
+    bits = frequencies > np.median(frequencies)
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def dhash(image: Image.Image) -> str:
+    """
+    Compute the difference hash of an image.
+
+    The image is converted to grayscale and downscaled, and each bit of the hash tells
+    whether a pixel is brighter than its right-hand neighbor.
+
+    Args:
+        image (Image.Image): The image; its pixels are decoded if they were not already.
+
+    Returns:
+        str: The 64-bit hash as 16 hexadecimal digits.
+    """
+    small = image.convert("L").resize((DHASH_SIZE + 1, DHASH_SIZE), Image.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, :-1] > pixels[:, 1:]).flatten()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def compute_image_hashes(source: Union[str, BinaryIO]) -> Dict[str, str]:
+    """
+    Compute the pHash and dHash of an image file from one decode of its pixels.
+
+    JPEG images are decoded at reduced scale (to about HASH_DRAFT_SIZE pixels), which is
+    several times faster than a full decode and does not change what the hashes capture.
+
+    Args:
+        source (Union[str, BinaryIO]): Path to the image, or the image file opened in
+            binary mode and positioned at its start.
+
+    Returns:
+        Dict[str, str]: The "phash" and "dhash" of the image.
+    """
+    with Image.open(source) as img:
+        img.draft("L", (HASH_DRAFT_SIZE, HASH_DRAFT_SIZE))
+        gray = img.convert("L")
+    return {"phash": phash(gray), "dhash": dhash(gray)}
@@ -2,33 +2,100 @@
 Image Ingestion Module
 
 This module handles the ingestion of image resources for the Adaptive Learning System.
-It extracts metadata and tags from image files for indexing.
+It extracts metadata and tags from image files for indexing from their headers, without
+decoding their pixels. Perceptual hashes and the text of images such as infographics (local
+OCR) need the pixels, so they are opt-in.
 
 Key Responsibilities:
 - Extract metadata (EXIF data) from image files.
+- Read the headers of each image once, from a single open of the file.
+- Optionally compute the perceptual hashes (pHash, dHash) and content hash of each image,
+  used to collapse copies of the same image and find similar images.
 - Generate basic tags or descriptions if possible.
+- Read the headers of the images of a directory concurrently.
+- Recognize the text of images in horizontal tiles on a pool of OCR threads, caching the
+  text by the content hash of the image file.
 - Ensure all processing is local and privacy-respecting.
 
 Dependencies:
 - PIL (Pillow): For reading image files and extracting metadata.
 - exifread: For detailed EXIF data extraction.
+- pytesseract (optional): For OCR with a local Tesseract installation.
+- numpy: For finding blank rows to cut tiles at.
 """
 
 import os
-from typing import Dict, List, Any
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+import numpy as np
 from PIL import Image
 import exifread
 
+from .cache import ContentCache
+from .image_hash import compute_image_hashes
+from .manifest import compute_file_hash
+from .parallel import ingest_or_none, find_files, ingest_files
 
-def ingest_image_file(file_path: str) -> Dict[str, Any]:
+# Bump when the extracted content or metadata changes so the ingestion manifest
+# re-ingests files processed by older versions
+INGESTOR_VERSION = "6"
+
+SUPPORTED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff")
+
+# Size of the read buffer shared by the PIL and EXIF parsers; the headers and EXIF
+# segment of most images fit in it, so each image is read from disk once
+HEADER_BUFFER_SIZE = 256 * 1024
+
+# Threads reading image headers when a directory is ingested in the calling process
+READ_THREADS = min(32, 4 * (os.cpu_count() or 1))
+
+# Metadata is read from the image headers only. Decoding the pixels is opt-in: IMAGE_HASHES=1
+# computes the perceptual and content hashes of each image, and IMAGE_OCR=1 recognizes
+# its text when Tesseract is installed (which also computes the hashes, as they key the
+# cache of recognized text)
+IMAGE_HASHES = os.environ.get("IMAGE_HASHES", "0").lower() in ("1", "true", "yes")
+IMAGE_OCR = os.environ.get("IMAGE_OCR", "0").lower() in ("1", "true", "yes")
+OCR_LANGUAGE = os.environ.get("IMAGE_OCR_LANGUAGE", "eng")
+
+# Images taller than MAX_TILE_HEIGHT are cut into tiles of about TILE_HEIGHT rows, at the
+# blankest row, so tiles rarely split a line of text
+TILE_HEIGHT = 768
+MAX_TILE_HEIGHT = 3 * TILE_HEIGHT // 2
+# Rows whose brightness varies this much more than the blankest row count as blank too
+BLANK_ROW_TOLERANCE = 1.0
+
+# Recognized text is cached per OCR language; bump when the recognition changes
+OCR_CACHE_NAMESPACE = f"image-ocr-v2-{OCR_LANGUAGE}"
+
+_ocr_available: Optional[bool] = None
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+_ocr_lock = threading.Lock()
+
+
+def ingest_image_file(
+    file_path: str, ocr: Optional[bool] = None, hashes: Optional[bool] = None
+) -> Dict[str, Any]:
     """
-    Ingest a single image file and extract its metadata.
+    Ingest a single image file and extract its metadata and text.
+
+    By default only the headers of the image are read; its pixels are decoded only for
+    the hashes and OCR.
 
     Args:
         file_path (str): Path to the image file.
+        ocr (Optional[bool]): Whether to recognize the text of the image; defaults to
+            IMAGE_OCR (set by the IMAGE_OCR environment variable). OCR only runs when
+            Tesseract is installed.
+        hashes (Optional[bool]): Whether to compute the perceptual hashes (phash, dhash)
+            and content hash (sha256) of the image; defaults to IMAGE_HASHES (set by the
+            IMAGE_HASHES environment variable). Always computed for OCR.
 
     Returns:
-        Dict[str, Any]: Dictionary containing metadata and inferred content description.
+        Dict[str, Any]: Dictionary containing metadata and inferred content description,
+            followed by the recognized text.
     """
     file_name = os.path.basename(file_path)
     file_extension = os.path.splitext(file_path)[1].lower()
@@ -42,28 +109,69 @@ def ingest_image_file(file_path: str) -> Dict[str, Any]:
         "height": 0,
         "resource_type": "image",
     }
+    text = ""
+    ocr = (IMAGE_OCR if ocr is None else ocr) and ocr_available()
+    hashes = IMAGE_HASHES if hashes is None else hashes
 
-    # Extract basic image metadata using PIL
+    # The file is opened once and both parsers read its headers from the same buffer;
+    # Image.open only parses the headers, and the pixels are only loaded for the hashes
+    # (at reduced scale for JPEG) and OCR
     try:
-        with Image.open(file_path) as img:
-            metadata["width"], metadata["height"] = img.size
-            metadata["format"] = img.format
-            if hasattr(img, "info") and img.info:
-                for key, value in img.info.items():
-                    if isinstance(value, (str, int, float)):
-                        metadata[f"info_{key}"] = value
+        image_file = open(file_path, "rb", buffering=HEADER_BUFFER_SIZE)
     except Exception as e:
-        print(f"Error reading image metadata with PIL for {file_path}: {e}")
+        print(f"Error opening image {file_path}: {e}")
+        image_file = None
 
-    # Extract detailed EXIF data using exifread
-    try:
-        with open(file_path, "rb") as f:
-            tags = exifread.process_file(f, details=False)
-            for tag, value in tags.items():
-                if isinstance(value, (str, int, float)):
-                    metadata[f"exif_{tag}"] = str(value)
-    except Exception as e:
-        print(f"Error reading EXIF data for {file_path}: {e}")
+    if image_file is not None:
+        with image_file:
+            # Extract basic image metadata using PIL
+            try:
+                with Image.open(image_file) as img:
+                    metadata["width"], metadata["height"] = img.size
+                    metadata["format"] = img.format
+                    if hasattr(img, "info") and img.info:
+                        for key, value in img.info.items():
+                            if isinstance(value, (str, int, float)):
+                                metadata[f"info_{key}"] = value
+            except Exception as e:
+                print(f"Error reading image metadata with PIL for {file_path}: {e}")
+
+            # Extract detailed EXIF data using exifread, rereading the buffered headers
+            try:
+                image_file.seek(0)
+                tags = exifread.process_file(image_file, details=False)
+                for tag, value in tags.items():
+                    if isinstance(value, (str, int, float)):
+                        metadata[f"exif_{tag}"] = str(value)
+            except Exception as e:
+                print(f"Error reading EXIF data for {file_path}: {e}")
+
+            # Perceptual hashes group copies of the image in other sizes and formats; the
+            # content hash tells which copies are byte for byte the same
+            if hashes or ocr:
+                try:
+                    image_file.seek(0)
+                    metadata.update(compute_image_hashes(image_file))
+                    image_file.seek(0)
+                    metadata["sha256"] = _content_hash(image_file)
+                except Exception as e:
+                    print(f"Error computing perceptual hashes for {file_path}: {e}")
+
+            # Recognize the text of the image
+            if ocr:
+                try:
+                    image_file.seek(0)
+                    recognized = recognize_image_text(
+                        image_file,
+                        ContentCache(namespace=OCR_CACHE_NAMESPACE),
+                        metadata.get("phash"),
+                        metadata.get("sha256"),
+                    )
+                    text = recognized.pop("text")
+                    metadata["phash"] = recognized.pop("phash")
+                    metadata["ocr"] = recognized
+                except Exception as e:
+                    print(f"Error performing OCR on image {file_path}: {e}")
 
     # Infer content description and tags from file name and directory structure
     content = f"Image file: {file_name}"
@@ -86,31 +194,214 @@ def ingest_image_file(file_path: str) -> Dict[str, Any]:
         print(f"Error inferring tags for {file_path}: {e}")
         metadata["inferred_tags"] = []
 
+    if text:
+        content = f"{content}\n{text}"
     return {"metadata": metadata, "content": content, "processed_content": content}
 
 
-def ingest_image_directory(directory_path: str) -> List[Dict[str, Any]]:
+def ocr_available() -> bool:
+    """
+    Check once per process whether pytesseract and the Tesseract binary are installed.
+    """
+    global _ocr_available
+    if _ocr_available is None:
+        try:
+            import pytesseract
+
+            pytesseract.get_tesseract_version()
+            _ocr_available = True
+        except Exception:
+            print(
+                "Warning: Tesseract not found. Install pytesseract and Tesseract to make the text of images searchable."
+            )
+            _ocr_available = False
+    return _ocr_available
+
+
+def get_ocr_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide pool of threads recognizing image tiles.
+
+    Each thread waits on a Tesseract process, so the pool bounds the number of those
+    running at once: one per CPU, or one in worker processes that already ingest files
+    in parallel.
+    """
+    global _ocr_executor
+    if _ocr_executor is None:
+        with _ocr_lock:
+            if _ocr_executor is None:
+                workers = 1 if multiprocessing.parent_process() else os.cpu_count()
+                _ocr_executor = ThreadPoolExecutor(max_workers=workers or 1)
+    return _ocr_executor
+
+
+def ocr_tile(tile: Image.Image) -> str:
+    """
+    Recognize the text of one tile of an image with Tesseract.
+    """
+    import pytesseract
+
+    return pytesseract.image_to_string(tile, lang=OCR_LANGUAGE)
+
+
+def _tile_cuts(ink: np.ndarray) -> List[int]:
+    """
+    Return the rows at which an image with the given ink per row is cut into tiles,
+    including its first and last row.
+    """
+    cuts = [0]
+    while len(ink) - cuts[-1] > MAX_TILE_HEIGHT:
+        low = cuts[-1] + TILE_HEIGHT // 2
+        window = ink[low : cuts[-1] + MAX_TILE_HEIGHT]
+        # Of the blankest rows, the one closest to TILE_HEIGHT
+        blank = np.flatnonzero(window <= window.min() + BLANK_ROW_TOLERANCE)
+        cuts.append(low + int(blank[np.argmin(np.abs(blank - TILE_HEIGHT // 2))]))
+    cuts.append(len(ink))
+    return cuts
+
+
+def split_into_tiles(image: Image.Image) -> List[Image.Image]:
+    """
+    Cut a grayscale image into horizontal tiles, top to bottom, at blank rows.
+
+    Tiles span the full width of the image, so each line of text stays in one tile and
+    concatenating the text of the tiles keeps the reading order.
+
+    Args:
+        image (Image.Image): Grayscale image.
+
+    Returns:
+        List[Image.Image]: The tiles in top-to-bottom order.
+    """
+    if image.height <= MAX_TILE_HEIGHT:
+        return [image]
+    # A row without text has (nearly) no variation in brightness
+    ink = np.asarray(image, dtype=np.float32).std(axis=1)
+    cuts = _tile_cuts(ink)
+    return [
+        image.crop((0, top, image.width, bottom)) for top, bottom in zip(cuts, cuts[1:])
+    ]
+
+
+def _to_grayscale(image: Image.Image) -> Image.Image:
+    """
+    Convert an image to grayscale, with transparent areas shown on white.
+    """
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, "white")
+        image = Image.alpha_composite(background, image)
+    return image.convert("L")
+
+
+def _content_hash(source: Union[str, BinaryIO], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 hash of an image file, leaving an open file where it started.
+    """
+    if isinstance(source, str):
+        return compute_file_hash(source, chunk_size)
+    start_position = source.tell()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        digest.update(chunk)
+    source.seek(start_position)
+    return digest.hexdigest()
+
+
+def recognize_image_text(
+    source: Union[str, BinaryIO],
+    cache: Optional[ContentCache] = None,
+    image_hash: Optional[str] = None,
+    content_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Recognize the text of an image, tile by tile on the OCR thread pool.
+
+    The result is cached by the content hash of the file, so a renamed or moved copy is
+    not recognized again. Copies with other metadata are found through the perceptual
+    hash and size of the image, but their text is only reused when their decoded pixels
+    are identical, as images that differ by a few pixels can hold different text.
+
+    Args:
+        source (Union[str, BinaryIO]): Path to the image, or the image file opened in
+            binary mode and positioned at its start.
+        cache (Optional[ContentCache]): Cache of recognized text; None disables caching.
+        image_hash (Optional[str]): The pHash of the image, if already computed.
+        content_hash (Optional[str]): The SHA-256 of the file, if already computed.
+
+    Returns:
+        Dict[str, Any]: The recognized text ("text"), perceptual hash ("phash") and
+            number of tiles ("tiles").
+    """
+    start_position = source.tell() if hasattr(source, "tell") else None
+    if content_hash is None:
+        content_hash = _content_hash(source)
+    cached = cache.get(content_hash, "ocr") if cache else None
+    if cached is not None:
+        return dict(cached, phash=image_hash or cached["phash"])
+
+    if image_hash is None:
+        image_hash = compute_image_hashes(source)["phash"]
+        if start_position is not None:
+            source.seek(start_position)
+    with Image.open(source) as img:
+        grayscale = _to_grayscale(img)
+    pixels_hash = hashlib.sha256(grayscale.tobytes()).hexdigest()
+    similar_key = f"{image_hash}-{grayscale.width}x{grayscale.height}"
+    similar = cache.get(similar_key, "ocr") if cache else None
+    if similar is not None and similar.get("pixels") == pixels_hash:
+        result = {"text": similar["text"], "tiles": similar["tiles"]}
+    else:
+        tiles = split_into_tiles(grayscale)
+        texts = [text.strip() for text in get_ocr_executor().map(ocr_tile, tiles)]
+        result = {
+            "text": "\n".join(text for text in texts if text),
+            "tiles": len(tiles),
+        }
+        if cache:
+            cache.put(similar_key, "ocr", dict(result, pixels=pixels_hash))
+    if cache:
+        cache.put(content_hash, "ocr", dict(result, phash=image_hash))
+    return dict(result, phash=image_hash)
+
+
+def ingest_image_directory(
+    directory_path: str, max_workers: int = 1, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Ingest all image files in a directory and its subdirectories.
 
+    Reading image headers waits on the disk rather than the CPU, so without worker
+    processes or a timeout the files are read by READ_THREADS threads of the calling
+    process instead of one at a time. run.py does not use this function: it ingests
+    images file by file with ingest_image_file, in its worker processes.
+
     Args:
         directory_path (str): Path to the directory containing image files.
+        max_workers (int): Number of worker processes; 1 ingests files in the calling
+            process.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries with metadata for each file.
     """
-    image_data = []
-    supported_extensions = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff")
-
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith(supported_extensions):
-                file_path = os.path.join(root, file)
-                data = ingest_image_file(file_path)
-                if data:
-                    image_data.append(data)
-
-    return image_data
+    file_paths = find_files(directory_path, SUPPORTED_EXTENSIONS)
+    if max_workers <= 1 and not timeout and len(file_paths) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(READ_THREADS, len(file_paths))
+        ) as executor:
+            results = executor.map(
+                lambda file_path: ingest_or_none(ingest_image_file, file_path),
+                file_paths,
+            )
+            return [resource for resource in results if resource]
+    return ingest_files(
+        file_paths,
+        ingest_image_file,
+        "image",
+        max_workers=max_workers,
+        timeout=timeout,
+    )
 
 
 if __name__ == "__main__":
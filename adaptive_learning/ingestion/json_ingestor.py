@@ -0,0 +1,347 @@
+"""
+JSON Exercise Bank Ingestion Module
+
+This module handles the ingestion of structured JSON exercise banks for the Adaptive Learning
+System. Instead of loading a whole bank with json.load and indexing it as one document, the
+array of exercises is parsed incrementally and each exercise becomes its own resource with
+typed fields, so a single exercise can be retrieved and presented without re-parsing the
+bank, and memory use is bounded by the largest exercise rather than by the size of the file.
+
+Key Responsibilities:
+- Parse the exercise array of a JSON file one item at a time.
+- Tell exercise banks from other JSON files by their first item.
+- Keep the small fields preceding the array (bank name, title) as context for the items.
+- Build one resource per exercise with its name, description, difficulty and options.
+- Convert the HTML fragments of the exercises to plain text for indexing.
+
+Dependencies:
+- json: For decoding one JSON value at a time from a buffered stream.
+- html: For unescaping HTML entities.
+"""
+
+import os
+import re
+import json
+import html
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+# Keys of a top-level object whose array value holds the exercises
+ITEMS_KEYS = ("content", "exercises", "questions", "items")
+
+# Characters read from the file at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+NUMBER_CHARACTERS = "0123456789.eE+-"
+
+# Block-level tags separate words; inline tags (<em>, <strong>) are removed in place
+BLOCK_TAG_PATTERN = re.compile(
+    r"</?(?:p|div|br|li|ul|ol|h[1-6]|tr|td|th|table|blockquote)\b[^>]*>", re.I
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class _JsonStream:
+    """
+    Decodes the values of a JSON document one at a time from a text file.
+
+    Only the unread part of the document is buffered, so the buffer stays as small as the
+    read chunk size or the largest single value decoded, whichever is larger.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """
+        Append the next chunk of the file to the unread part of the buffer.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Return the next non-whitespace character without consuming it ("" at the end).
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Consume the next non-whitespace character, which must be char.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number running to the end of the buffer (possibly followed by the
+                # start of its fraction or exponent) may continue in the next chunk
+                rest = self.buffer[end:]
+                truncated = isinstance(value, (int, float)) and not rest.strip(
+                    NUMBER_CHARACTERS
+                )
+                if not truncated or not self._fill():
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def array_items(self) -> Iterator[Any]:
+        """
+        Decode the items of the array starting at the current position one at a time.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("]")
+                return
+
+
+def iter_json_items(
+    file_path: str,
+    header: Optional[Dict[str, Any]] = None,
+    items_keys: tuple = ITEMS_KEYS,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Yield the items of the exercise array of a JSON file without loading the whole file.
+
+    The array is either the document itself or the value of the first of items_keys in a
+    top-level object. The other fields of the object that precede the array are stored in
+    header; fields following it are only available once all items have been read.
+
+    Args:
+        file_path (str): Path to the JSON file.
+        header (Optional[Dict[str, Any]]): Dictionary receiving the other top-level fields.
+        items_keys (tuple): Keys whose array value holds the items.
+        chunk_size (int): Number of characters read from the file at a time.
+
+    Yields:
+        Any: The decoded items of the array, in order.
+
+    Raises:
+        ValueError: If the file is not valid JSON.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        stream = _JsonStream(file, chunk_size)
+        start = stream.peek()
+        if start == "[":
+            yield from stream.array_items()
+            return
+        stream.expect("{")
+        streamed = False
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if not streamed and key in items_keys and stream.peek() == "[":
+                streamed = True
+                yield from stream.array_items()
+            else:
+                value = stream.value()
+                if header is not None:
+                    header[key] = value
+            if stream.peek() == ",":
+                stream.pos += 1
+            else:
+                stream.expect("}")
+                return
+
+
+def html_to_text(fragment: Any) -> str:
+    """
+    Convert an HTML fragment (or an object with an "html" or "text" field) to plain text.
+
+    Args:
+        fragment (Any): HTML string, or dictionary holding one.
+
+    Returns:
+        str: The text with tags removed, entities unescaped and whitespace collapsed.
+    """
+    if isinstance(fragment, dict):
+        fragment = fragment.get("html") or fragment.get("text") or ""
+    if not isinstance(fragment, str):
+        return ""
+    text = TAG_PATTERN.sub("", BLOCK_TAG_PATTERN.sub(" ", fragment))
+    text = html.unescape(text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def build_exercise_resource(
+    item: Dict[str, Any],
+    index: int,
+    file_path: str,
+    header: Dict[str, Any],
+    file_metadata: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Build the resource of one exercise of a bank.
+
+    Args:
+        item (Dict[str, Any]): The exercise as decoded from the bank.
+        index (int): Position of the exercise in the bank's array.
+        file_path (str): Path to the bank.
+        header (Dict[str, Any]): Top-level fields of the bank read so far.
+        file_metadata (Dict[str, Any]): Metadata shared by all exercises of the bank.
+
+    Returns:
+        Dict[str, Any]: Resource with the exercise's metadata, plain-text content and a
+            typed "exercise" record of its question and options.
+    """
+    body = item.get("content") if isinstance(item.get("content"), dict) else item
+    question = html_to_text(
+        body.get("html") or item.get("question") or item.get("description")
+    )
+    options = []
+    for option in body.get("options") or item.get("options") or []:
+        if not isinstance(option, dict):
+            option = {"content": str(option)}
+        options.append(
+            {
+                "text": html_to_text(option.get("content") or option.get("text")),
+                "correct": bool(option.get("correct", False)),
+                "feedback": html_to_text(option.get("feedback")),
+            }
+        )
+
+    name = item.get("title") or item.get("name") or f"Exercise {index + 1}"
+    lines = [name, question]
+    lines.extend(
+        f"{chr(ord('a') + i) if i < 26 else i + 1}) {option['text']}"
+        for i, option in enumerate(options)
+    )
+    # Options often share one explanation, so each distinct feedback is indexed once
+    feedback = list(dict.fromkeys(o["feedback"] for o in options if o["feedback"]))
+    lines.extend(feedback)
+    content = "\n".join(line for line in lines if line)
+
+    metadata = dict(file_metadata)
+    metadata.update(
+        {
+            "file_path": f"{file_path}#exercise={index + 1}",
+            "parent_file_path": file_path,
+            "resource_type": "exercise",
+            "name": name,
+            "topic": header.get("name") or header.get("title"),
+            "description": question,
+            "difficulty": item.get("difficulty", header.get("difficulty")),
+            "question_id": item.get("external_questionId") or item.get("id"),
+            "position": item.get("position", index),
+            "option_count": len(options),
+        }
+    )
+    return {
+        "metadata": metadata,
+        "content": content,
+        "processed_content": content,
+        "exercise": {"question": question, "options": options},
+    }
+
+
+def iter_exercise_resources(
+    file_path: str, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one resource per exercise of a JSON exercise bank as the bank is parsed.
+
+    Args:
+        file_path (str): Path to the JSON exercise bank.
+        chunk_size (int): Number of characters read from the file at a time.
+
+    Yields:
+        Dict[str, Any]: Resource of each exercise, in bank order. Nothing is yielded when
+            the file holds no array of exercise objects. Items after the first exercise
+            that are not objects are skipped with a warning.
+    """
+    file_metadata = {
+        "file_name": os.path.basename(file_path),
+        "file_type": os.path.splitext(file_path)[1].lower(),
+        "size_bytes": os.path.getsize(file_path),
+        "last_modified": os.path.getmtime(file_path),
+    }
+    header: Dict[str, Any] = {}
+    for index, item in enumerate(
+        iter_json_items(file_path, header, chunk_size=chunk_size)
+    ):
+        if not isinstance(item, dict):
+            if index == 0:
+                # An array of other values: not an exercise bank
+                return
+            print(
+                f"Warning: Skipping item {index + 1} of {file_path}, which is not an "
+                "exercise object"
+            )
+            continue
+        yield build_exercise_resource(item, index, file_path, header, file_metadata)
+
+
+def is_exercise_bank(file_path: str) -> bool:
+    """
+    Check whether a JSON file is an exercise bank, decoding no more than its first item.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        bool: True if the file holds an array of exercise objects.
+    """
+    try:
+        for item in iter_json_items(file_path):
+            return isinstance(item, dict)
+    except Exception:
+        pass
+    return False
+
+
+def ingest_exercise_bank(file_path: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Ingest a JSON exercise bank into one resource per exercise.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: Resources of the exercises, or None if the file is
+            not an exercise bank (or cannot be parsed) and should be ingested as a single
+            text document instead.
+    """
+    try:
+        resources = list(iter_exercise_resources(file_path))
+    except Exception as e:
+        print(f"Error reading exercise bank {file_path}: {e}")
+        return None
+    return resources or None
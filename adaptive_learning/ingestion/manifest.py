@@ -0,0 +1,173 @@
+"""
+Ingestion Manifest Module
+
+This module keeps a persistent record of the files ingested by the Adaptive Learning System,
+so that on start only new or changed files are ingested and embedded again, and files that
+were removed from the resources directory are removed from the index.
+
+Key Responsibilities:
+- Record the path, size, modification time, content hash and ingestor version of each file.
+- Detect new, changed and removed files, hashing a file only when its size or mtime changed.
+- Persist the manifest atomically next to the index.
+
+Dependencies:
+- hashlib: For content hashes of ingested files.
+- json: For storing the manifest.
+- os: For file metadata and atomic file replacement.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 hash of a file's content, reading it in chunks.
+
+    Args:
+        file_path (str): Path to the file.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """
+    A persistent record of ingested files, keyed by file path.
+
+    A file is ingested again when it is new, when its content hash changed, or when the
+    ingestor that produced its index entry has a different version. Files whose size and
+    modification time are unchanged are trusted without reading them.
+    """
+
+    def __init__(self, manifest_path: str = "index_data/ingestion_manifest.json"):
+        """
+        Initialize the manifest and load it from disk if it exists.
+
+        Args:
+            manifest_path (str): Path to the JSON file where the manifest is stored.
+        """
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load the manifest from the file if it exists.
+        """
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            print(f"Error loading ingestion manifest from {self.manifest_path}: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """
+        Save the manifest to the file, replacing the previous version atomically.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+            temp_path = f"{self.manifest_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except Exception as e:
+            print(f"Error saving ingestion manifest to {self.manifest_path}: {e}")
+
+    def needs_ingestion(self, file_path: str, ingestor_version: str) -> bool:
+        """
+        Check whether a file must be ingested again.
+
+        The content hash is only computed when the size or modification time differs from
+        the recorded one; if the content turns out to be unchanged, the new size and mtime
+        are recorded so the file is not hashed again on the next start.
+
+        Args:
+            file_path (str): Path to the file.
+            ingestor_version (str): Version of the ingestor that would process the file.
+
+        Returns:
+            bool: True if the file is new, changed or was ingested by another version.
+        """
+        entry = self.entries.get(file_path)
+        if not entry or entry.get("ingestor_version") != ingestor_version:
+            return True
+        try:
+            stat = os.stat(file_path)
+            if (
+                stat.st_size == entry.get("size_bytes")
+                and stat.st_mtime == entry.get("last_modified")
+            ):
+                return False
+            if compute_file_hash(file_path) != entry.get("sha256"):
+                return True
+            entry["size_bytes"] = stat.st_size
+            entry["last_modified"] = stat.st_mtime
+            return False
+        except OSError as e:
+            print(f"Error checking {file_path} against the ingestion manifest: {e}")
+            return True
+
+    def record(self, file_path: str, ingestor_version: str) -> None:
+        """
+        Record a file as ingested by the given ingestor version.
+
+        Args:
+            file_path (str): Path to the ingested file.
+            ingestor_version (str): Version of the ingestor that processed the file.
+        """
+        stat = os.stat(file_path)
+        self.entries[file_path] = {
+            "size_bytes": stat.st_size,
+            "last_modified": stat.st_mtime,
+            "sha256": compute_file_hash(file_path),
+            "ingestor_version": ingestor_version,
+        }
+
+    def forget(self, file_path: str) -> None:
+        """
+        Remove a file from the manifest.
+
+        Args:
+            file_path (str): Path to the file.
+        """
+        self.entries.pop(file_path, None)
+
+    def changes(
+        self,
+        files: Dict[str, str],
+        indexed_paths: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Compare the files currently present with the manifest.
+
+        Args:
+            files (Dict[str, str]): Current file paths mapped to the version of the
+                ingestor that handles them.
+            indexed_paths (Optional[Iterable[str]]): File paths present in the index. Files
+                recorded in the manifest but missing from the index are ingested again.
+
+        Returns:
+            Tuple[List[str], List[str]]: File paths to ingest, and recorded file paths
+                that no longer exist.
+        """
+        indexed = set(indexed_paths) if indexed_paths is not None else None
+        to_ingest = [
+            file_path
+            for file_path, version in files.items()
+            if (indexed is not None and file_path not in indexed)
+            or self.needs_ingestion(file_path, version)
+        ]
+        removed = [file_path for file_path in self.entries if file_path not in files]
+        return to_ingest, removed
@@ -0,0 +1,364 @@
+"""
+Parallel Ingestion Module
+
+This module runs the file ingestors of the Adaptive Learning System across a pool of worker
+processes, so PDF extraction, OCR and transcription of different files use all CPU cores
+instead of one.
+
+Key Responsibilities:
+- Distribute files over a configurable pool of worker processes.
+- Limit how many files of each resource type run at once (videos are memory-heavy).
+- Abort files that exceed a per-file timeout without stopping the other files.
+- Return results in input order while keeping a bounded number of them buffered.
+
+Dependencies:
+- multiprocessing: For the worker processes and the pipes between them and the parent.
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from collections import Counter, deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+# Maximum number of files of a resource type ingested at the same time
+DEFAULT_TYPE_LIMITS = {"video": 1}
+
+# (file path, resource type, ingestion function) for each file to ingest
+IngestionTask = Tuple[str, str, Callable[[str], Dict[str, Any]]]
+
+# Sent by a worker once it has loaded a task and starts ingesting the file
+STARTED = "started"
+
+
+def ingest_or_none(
+    ingest: Callable[[str], Dict[str, Any]], file_path: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Ingest one file, reporting failures instead of raising them.
+
+    Args:
+        ingest (Callable[[str], Dict[str, Any]]): Ingestion function of the file's type.
+        file_path (str): Path to the file.
+
+    Returns:
+        Optional[Dict[str, Any]]: The result of the ingestor, or None if it raised.
+    """
+    try:
+        return ingest(file_path)
+    except Exception as e:
+        print(f"Error ingesting {file_path}: {e}")
+        return None
+
+
+def _worker_main(connection: Any) -> None:
+    """
+    Ingest the files received over a connection one at a time, sending back each result,
+    until None is received or the parent goes away.
+
+    Receiving a task imports the module of its ingestion function, so the worker reports
+    when it starts ingesting, and the parent only counts the timeout from then on.
+    """
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        ingest, file_path = task
+        connection.send(STARTED)
+        connection.send(ingest_or_none(ingest, file_path))
+
+
+class _Worker:
+    """
+    A worker process ingesting one file at a time.
+
+    The parent enforces the per-file timeout by killing the process, since an ingestor
+    stuck in C code (pdfminer, tesseract, vosk) cannot be interrupted from Python. The
+    timeout runs from the worker's STARTED message, so starting the process and
+    importing the ingestor do not count against the file.
+    """
+
+    def __init__(self, context: Any):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_connection,))
+        self.process.start()
+        child_connection.close()
+        # Index of the task being ingested and the time by which it must finish, set
+        # once the worker has started it
+        self.task: Optional[int] = None
+        self.timeout: Optional[float] = None
+        self.deadline: Optional[float] = None
+
+    def submit(
+        self,
+        task: int,
+        ingest: Callable[[str], Dict[str, Any]],
+        file_path: str,
+        timeout: Optional[float],
+    ) -> None:
+        self.connection.send((ingest, file_path))
+        self.task = task
+        self.timeout = timeout
+        self.deadline = None
+
+    def receive(self) -> Tuple[bool, Any]:
+        """
+        Read the messages the worker has sent, starting the deadline on STARTED.
+
+        Returns:
+            Tuple[bool, Any]: (True, result) once the result has arrived, else
+                (False, None).
+
+        Raises:
+            EOFError: If the worker exited before sending the result.
+        """
+        while self.connection.poll():
+            message = self.connection.recv()
+            if message != STARTED:
+                return True, message
+            if self.timeout:
+                self.deadline = time.monotonic() + self.timeout
+        return False, None
+
+    def stop(self) -> None:
+        """
+        Let an idle worker exit, and kill a busy one.
+        """
+        if self.task is None:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def worker_context() -> Any:
+    """
+    Return the multiprocessing context of the workers and of the ingestors' process pools.
+
+    Workers are started from a fork server where available (and spawned otherwise), not
+    forked from the caller, which may be a thread of a process running other threads.
+
+    Returns:
+        Any: The multiprocessing context.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def ingest_files_parallel(
+    tasks: Iterable[IngestionTask],
+    max_workers: Optional[int] = None,
+    type_limits: Optional[Dict[str, int]] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Ingest files in worker processes and yield the results in input order.
+
+    Files are submitted in input order, except that a file whose resource type is at its
+    concurrency limit lets files of other types go first. At most 4 * max_workers results
+    are buffered waiting for an earlier file to finish. A worker that exceeds the timeout
+    is killed and replaced by a new process; the timeout of a file runs from the moment
+    its worker starts ingesting it.
+
+    Args:
+        tasks (Iterable[IngestionTask]): (file path, resource type, ingestion function)
+            tuples. Ingestion functions must be importable module-level functions.
+        max_workers (Optional[int]): Number of worker processes; defaults to the number of
+            CPUs. With 1 worker and no timeout, files are ingested in the calling process.
+        type_limits (Optional[Dict[str, int]]): Maximum number of concurrent files per
+            resource type; defaults to DEFAULT_TYPE_LIMITS.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
+
+    Returns:
+        Iterator[Tuple[str, Optional[Dict[str, Any]]]]: File path and ingested resource
+            (a list of resources for files split into records), or None if the file
+            failed or timed out.
+
+    Raises:
+        ValueError: If a resource type is limited to less than one file at a time.
+    """
+    limits = DEFAULT_TYPE_LIMITS if type_limits is None else type_limits
+    for resource_type, limit in limits.items():
+        if limit < 1:
+            raise ValueError(
+                f"The limit of {resource_type} files must be at least 1, not {limit}."
+            )
+    tasks = list(tasks)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1 and not timeout:
+        return (
+            (file_path, ingest_or_none(ingest, file_path))
+            for file_path, _, ingest in tasks
+        )
+    return _ingest_in_workers(tasks, max(1, max_workers), limits, timeout)
+
+
+def _ingest_in_workers(
+    tasks: List[IngestionTask],
+    max_workers: int,
+    limits: Dict[str, int],
+    timeout: Optional[float],
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Ingest files in worker processes, yielding the results in input order.
+    """
+    window = 4 * max_workers
+    # Files not yet submitted, per resource type, in input order
+    pending: Dict[str, deque] = {}
+    for i, (_, resource_type, _) in enumerate(tasks):
+        pending.setdefault(resource_type, deque()).append(i)
+    in_flight: Counter = Counter()
+    finished: Dict[int, Optional[Dict[str, Any]]] = {}
+    next_result = 0
+    context = worker_context()
+    workers: List[_Worker] = []
+
+    try:
+        while next_result < len(tasks):
+            while True:
+                idle = [worker for worker in workers if worker.task is None]
+                if not idle and len(workers) >= max_workers:
+                    break
+                # Earliest pending file whose type has spare capacity and fits the window
+                candidates = [
+                    queue[0]
+                    for resource_type, queue in pending.items()
+                    if queue
+                    and in_flight[resource_type]
+                    < limits.get(resource_type, max_workers)
+                ]
+                if not candidates or min(candidates) >= next_result + window:
+                    break
+                i = min(candidates)
+                file_path, resource_type, ingest = tasks[i]
+                pending[resource_type].popleft()
+                in_flight[resource_type] += 1
+                if not idle:
+                    idle.append(_Worker(context))
+                    workers.append(idle[0])
+                idle[0].submit(i, ingest, file_path, timeout)
+
+            busy = [worker for worker in workers if worker.task is not None]
+            deadlines = [worker.deadline for worker in busy if worker.deadline]
+            wait(
+                [worker.connection for worker in busy]
+                + [worker.process.sentinel for worker in busy],
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None,
+            )
+            for worker in busy:
+                i = worker.task
+                try:
+                    done, result = worker.receive()
+                except (EOFError, OSError):
+                    done = False  # The worker died before sending a result
+                else:
+                    if done:
+                        finished[i] = result
+                        worker.task = None
+                        in_flight[tasks[i][1]] -= 1
+                        continue
+                    if worker.process.is_alive() and (
+                        worker.deadline is None or time.monotonic() < worker.deadline
+                    ):
+                        continue
+
+                timed_out = worker.process.is_alive()
+                worker.stop()
+                workers.remove(worker)
+                if timed_out:
+                    print(
+                        f"Error ingesting {tasks[i][0]}: exceeded the timeout of "
+                        f"{timeout} seconds"
+                    )
+                else:
+                    # E.g. killed for using too much memory
+                    print(
+                        f"Error ingesting {tasks[i][0]}: worker process exited with "
+                        f"code {worker.process.exitcode}"
+                    )
+                finished[i] = None
+                in_flight[tasks[i][1]] -= 1
+
+            while next_result in finished:
+                yield tasks[next_result][0], finished.pop(next_result)
+                next_result += 1
+    finally:
+        for worker in workers:
+            worker.stop()
+
+
+def as_resources(result: Any) -> List[Dict[str, Any]]:
+    """
+    Return the resources of an ingestion result as a list.
+
+    Ingestion functions return one resource per file, except for files split into several
+    records (such as exercise banks), for which they return a list.
+
+    Args:
+        result (Any): Result of an ingestion function, or None if the file failed.
+
+    Returns:
+        List[Dict[str, Any]]: The resources of the file.
+    """
+    if not result:
+        return []
+    if isinstance(result, list):
+        return result
+    return [result]
+
+
+def find_files(directory_path: str, extensions: Tuple[str, ...]) -> List[str]:
+    """
+    Find the files with the given extensions in a directory and its subdirectories.
+
+    Args:
+        directory_path (str): Directory to search.
+        extensions (Tuple[str, ...]): Lowercase file extensions to accept.
+
+    Returns:
+        List[str]: Matching file paths in os.walk order.
+    """
+    return [
+        os.path.join(root, file)
+        for root, _, files in os.walk(directory_path)
+        for file in files
+        if file.lower().endswith(extensions)
+    ]
+
+
+def ingest_files(
+    file_paths: List[str],
+    ingest: Callable[[str], Dict[str, Any]],
+    resource_type: str,
+    max_workers: int = 1,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ingest files of one resource type, optionally in parallel.
+
+    Args:
+        file_paths (List[str]): Files to ingest.
+        ingest (Callable[[str], Dict[str, Any]]): Ingestion function for the type.
+        resource_type (str): Resource type, used for the per-type concurrency limit.
+        max_workers (int): Number of worker processes; 1 ingests sequentially.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
+
+    Returns:
+        List[Dict[str, Any]]: Ingested resources in file order; failed files are skipped.
+    """
+    results = ingest_files_parallel(
+        ((file_path, resource_type, ingest) for file_path in file_paths),
+        max_workers=max_workers,
+        timeout=timeout,
+    )
+    return [resource for _, data in results for resource in as_resources(data)]
@@ -4,29 +4,591 @@ PDF Ingestion Module
 This module handles the ingestion of PDF resources for the Adaptive Learning System.
 It extracts text content from PDFs using PDF parsing libraries for indexing.
 
+Each page is parsed once by pdfminer.six, and PyPDF2 is only opened for the pages pdfminer
+yields no text for. Large documents are split into page ranges extracted by a pool of
+worker processes, and extracted pages are cached by file content hash and page number.
+
 Key Responsibilities:
 - Read and parse PDF files to extract text content.
 - Extract metadata from PDF files for indexing.
 - Use PDF parsing libraries (PyPDF2, pdfminer.six) for text extraction.
+- Report the extraction time of each page and the pages that needed the fallback.
+- Split the pages of large PDFs across worker processes and cache extracted pages.
+- Fall back to OCR for scanned PDFs, rendering and recognizing one page at a time.
+- Record the offsets and headings of pages and sections so they can be used on their own.
+- Split PDFs into a document record with their sections and one resource per page,
+  linked to the document, for indexing.
 - Ensure all processing is local and privacy-respecting.
 
 Dependencies:
-- PyPDF2: For basic PDF text extraction.
+- PyPDF2: For text extraction of pages pdfminer.six cannot read.
 - pdfminer.six: For advanced PDF text extraction with layout preservation.
+- pdf2image, pytesseract (optional): For OCR of scanned PDFs.
 """
 
+import io
 import os
-from typing import Dict, List, Any
+import re
+import time
+import multiprocessing
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 import PyPDF2
-from pdfminer.high_level import extract_text
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+from pdfminer.utils import decode_text
+
+from .cache import PageCache
+from .manifest import compute_file_hash
+from .parallel import find_files, ingest_files, worker_context
+
+# Bump when the extracted content or metadata changes so the ingestion manifest
+# re-ingests files processed by older versions
+INGESTOR_VERSION = "5"
+
+SUPPORTED_EXTENSIONS = (".pdf",)
+
+# Document information entries copied into the resource metadata
+METADATA_FIELDS = ("Title", "Author", "Subject", "Keywords")
+
+# pdfminer ends the text of every page with a form feed
+PAGE_SEPARATOR = "\f"
+
+# Documents with fewer pages left to extract are not split across processes
+PARALLEL_PAGE_THRESHOLD = 16
+
+# Extracted pages are cached per ingestor version
+CACHE_NAMESPACE = f"pdf-v{INGESTOR_VERSION}"
+
+# Paragraphs of extracted text, separated by blank lines or page breaks
+PARAGRAPH_PATTERN = re.compile(r"[^\n\f]+(?:\n[^\n\f]+)*")
+# Section numbers such as "1", "2.3" or "4.1.2" opening a heading
+HEADING_NUMBER_PATTERN = re.compile(r"\d+(\.\d+)*\.?\s+\w")
+HEADING_MAX_LENGTH = 60
+
+# Resolution at which scanned pages are rendered for OCR, and the Tesseract language
+OCR_DPI = int(os.environ.get("PDF_OCR_DPI", "200"))
+OCR_LANGUAGE = "eng"
+
+
+def _decode_info_value(value: Any) -> str:
+    """
+    Convert a value of the PDF document information dictionary to a string.
+    """
+    value = resolve1(value)
+    if isinstance(value, bytes):
+        return decode_text(value)
+    return "" if value is None else str(value)
+
+
+class _FallbackReader:
+    """
+    Extracts the text of single pages with PyPDF2, opening the file on first use.
+
+    The file is opened separately from the one pdfminer is parsing, since both libraries
+    seek within their file.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+        self._reader = None
+
+    def page_count(self) -> int:
+        return len(self._open().pages)
+
+    def page_text(self, page_index: int) -> str:
+        try:
+            return self._open().pages[page_index].extract_text() or ""
+        except Exception as e:
+            print(
+                f"Error extracting page {page_index + 1} of {self.file_path} "
+                f"with PyPDF2: {e}"
+            )
+            return ""
+
+    def _open(self) -> PyPDF2.PdfReader:
+        if self._reader is None:
+            self._file = open(self.file_path, "rb")
+            self._reader = PyPDF2.PdfReader(self._file)
+        return self._reader
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+
+
+def read_pdf_info(file_path: str) -> Tuple[Dict[str, str], int]:
+    """
+    Read the document metadata and page count of a PDF without extracting any page.
+
+    Args:
+        file_path (str): Path to the PDF file.
+
+    Returns:
+        Tuple[Dict[str, str], int]: Document metadata (title, author, subject, keywords)
+            and the number of pages.
+    """
+    info: Dict[str, str] = {}
+    try:
+        with open(file_path, "rb") as file:
+            document = PDFDocument(PDFParser(file))
+            for entry in document.info:
+                for field in METADATA_FIELDS:
+                    if field in entry:
+                        info[field.lower()] = _decode_info_value(entry[field])
+            page_count = resolve1(document.catalog["Pages"]).get("Count")
+            if isinstance(page_count, int):
+                return info, page_count
+    except Exception as e:
+        print(f"Error reading {file_path} with pdfminer: {e}")
+    fallback = _FallbackReader(file_path)
+    try:
+        return info, fallback.page_count()
+    finally:
+        fallback.close()
+
+
+def extract_pdf_pages(
+    file_path: str, page_numbers: Optional[Iterable[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract the text of pages of a PDF in one pass.
+
+    Pages are extracted with pdfminer.six; a page for which it yields no text (or fails)
+    is extracted with PyPDF2 instead. If pdfminer cannot open the document at all, every
+    page is extracted with PyPDF2.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        page_numbers (Optional[Iterable[int]]): 1-based numbers of the pages to extract;
+            all pages by default.
+
+    Returns:
+        List[Dict[str, Any]]: For each extracted page, in page order, its number, text,
+            the extractor used and the extraction time in milliseconds.
+    """
+    wanted = set(page_numbers) if page_numbers is not None else None
+    results: List[Dict[str, Any]] = []
+    fallback = _FallbackReader(file_path)
+
+    def add_page(number: int, text: str, extractor: str, start: float) -> None:
+        if not text.strip():
+            text = fallback.page_text(number - 1)
+            extractor = "pypdf2"
+        results.append(
+            {
+                "page": number,
+                "text": text,
+                "extractor": extractor,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+        )
+
+    try:
+        with open(file_path, "rb") as file:
+            try:
+                page_iterator = PDFPage.create_pages(PDFDocument(PDFParser(file)))
+            except Exception as e:
+                print(f"Error opening {file_path} with pdfminer: {e}")
+                page_iterator = None
+
+            if page_iterator is not None:
+                manager = PDFResourceManager(caching=True)
+                output = io.StringIO()
+                device = TextConverter(manager, output, laparams=LAParams())
+                interpreter = PDFPageInterpreter(manager, device)
+                try:
+                    for number, page in enumerate(page_iterator, 1):
+                        if wanted is not None and number not in wanted:
+                            continue
+                        start = time.perf_counter()
+                        try:
+                            interpreter.process_page(page)
+                            text = output.getvalue()
+                        except Exception as e:
+                            print(
+                                f"Error extracting page {number} of {file_path} "
+                                f"with pdfminer: {e}"
+                            )
+                            text = ""
+                        output.seek(0)
+                        output.truncate()
+                        add_page(number, text, "pdfminer", start)
+                        if wanted is not None and len(results) == len(wanted):
+                            break
+                finally:
+                    device.close()
+            else:
+                for number in range(1, fallback.page_count() + 1):
+                    if wanted is None or number in wanted:
+                        add_page(number, "", "pypdf2", time.perf_counter())
+    finally:
+        fallback.close()
+    return results
+
+
+def _page_shards(page_numbers: List[int], shard_count: int) -> List[List[int]]:
+    """
+    Split page numbers into at most shard_count runs of consecutive list items.
+    """
+    size = max(1, -(-len(page_numbers) // shard_count))
+    return [page_numbers[i : i + size] for i in range(0, len(page_numbers), size)]
+
+
+def extract_pdf_pages_parallel(
+    file_path: str,
+    max_workers: Optional[int] = None,
+    cache: Optional[PageCache] = None,
+) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """
+    Extract the text of every page of a PDF, sharding page ranges across processes.
+
+    Pages already extracted from a file with the same content are taken from the cache;
+    the remaining pages are split into page ranges extracted by a pool of workers, and
+    the results are reassembled in page order. Each worker parses the document structure
+    itself and only interprets the pages of its range.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        max_workers (Optional[int]): Number of worker processes; defaults to the number of
+            CPUs. Documents shorter than PARALLEL_PAGE_THRESHOLD pages are extracted in
+            the calling process.
+        cache (Optional[PageCache]): Cache of extracted pages; None disables caching.
+
+    Returns:
+        Tuple[Dict[str, str], List[Dict[str, Any]]]: Document metadata and, for every
+            page, the record returned by extract_pdf_pages.
+    """
+    info, page_count = read_pdf_info(file_path)
+    file_hash = compute_file_hash(file_path) if cache else ""
+    pages: Dict[int, Dict[str, Any]] = {}
+    if cache:
+        for number in range(1, page_count + 1):
+            cached = cache.get(file_hash, number)
+            if cached is not None:
+                pages[number] = dict(cached, cached=True)
+    missing = [number for number in range(1, page_count + 1) if number not in pages]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if missing and (max_workers <= 1 or len(missing) < PARALLEL_PAGE_THRESHOLD):
+        extracted = extract_pdf_pages(file_path, missing)
+    elif missing:
+        # Several shards per worker balance pages that take much longer than others
+        shards = _page_shards(missing, max_workers * 4)
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(shards)), mp_context=worker_context()
+        ) as executor:
+            extracted = [
+                page
+                for shard in executor.map(
+                    extract_pdf_pages, [file_path] * len(shards), shards
+                )
+                for page in shard
+            ]
+    else:
+        extracted = []
+
+    for page in extracted:
+        pages[page["page"]] = page
+        if cache:
+            cache.put(file_hash, page["page"], page)
+    return info, [pages[number] for number in sorted(pages)]
+
+
+def ocr_pdf_page(
+    file_path: str, page_number: int, dpi: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Render a single page of a PDF and recognize its text with Tesseract.
+
+    Only the requested page is rasterized, so memory use does not depend on the length
+    of the document.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        page_number (int): 1-based number of the page.
+        dpi (Optional[int]): Rendering resolution; defaults to OCR_DPI.
+
+    Returns:
+        Dict[str, Any]: The page number, recognized text, extractor ("ocr") and the time
+            taken in milliseconds.
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    start = time.perf_counter()
+    images = convert_from_path(
+        file_path, dpi=dpi or OCR_DPI, first_page=page_number, last_page=page_number
+    )
+    text = "".join(
+        pytesseract.image_to_string(image, lang=OCR_LANGUAGE) for image in images
+    )
+    for image in images:
+        image.close()
+    return {
+        "page": page_number,
+        "text": text,
+        "extractor": "ocr",
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def _ocr_page_or_empty(file_path: str, page_number: int, dpi: int) -> Dict[str, Any]:
+    """
+    Run OCR on a page, returning an empty page without caching it if OCR fails.
+    """
+    try:
+        return ocr_pdf_page(file_path, page_number, dpi)
+    except Exception as e:
+        print(f"Error performing OCR on page {page_number} of {file_path}: {e}")
+        return {"page": page_number, "text": "", "extractor": "ocr", "failed": True}
+
+
+def ocr_pdf_pages(
+    file_path: str,
+    page_count: int,
+    dpi: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    cache: Optional[PageCache] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run OCR on every page of a PDF, one page at a time per worker.
 
+    At most 2 * max_workers pages are rendered or waiting to be collected at once. Each
+    recognized page is cached as soon as it completes, so an interrupted run resumes
+    with the pages that were not recognized yet.
 
-def ingest_pdf_file(file_path: str) -> Dict[str, Any]:
+    Args:
+        file_path (str): Path to the PDF file.
+        page_count (int): Number of pages of the PDF.
+        dpi (Optional[int]): Rendering resolution; defaults to OCR_DPI.
+        max_workers (Optional[int]): Number of worker processes; defaults to the number of
+            CPUs. With 1 worker, pages are recognized in the calling process.
+        cache (Optional[PageCache]): Cache of recognized pages; None disables caching.
+
+    Returns:
+        List[Dict[str, Any]]: The record of every page, in page order.
+    """
+    dpi = dpi or OCR_DPI
+    file_hash = compute_file_hash(file_path) if cache else ""
+    pages: Dict[int, Dict[str, Any]] = {}
+    for number in range(1, page_count + 1):
+        cached = cache.get(file_hash, number) if cache else None
+        if cached is not None:
+            pages[number] = dict(cached, cached=True)
+    missing = [number for number in range(1, page_count + 1) if number not in pages]
+
+    def collect(page: Dict[str, Any]) -> None:
+        pages[page["page"]] = page
+        if cache and not page.get("failed"):
+            cache.put(file_hash, page["page"], page)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1 or len(missing) <= 1:
+        for number in missing:
+            collect(_ocr_page_or_empty(file_path, number, dpi))
+    elif missing:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=worker_context()
+        ) as executor:
+            running = set()
+            for number in missing:
+                running.add(executor.submit(_ocr_page_or_empty, file_path, number, dpi))
+                if len(running) >= 2 * max_workers:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            for future in as_completed(running):
+                collect(future.result())
+    return [pages[number] for number in sorted(pages)]
+
+
+def _is_heading(paragraph: str, running_lines: Set[str]) -> bool:
+    """
+    Check whether a paragraph of extracted text looks like a heading.
+
+    A heading is a single short line starting with a capital letter or a section
+    number, not ending like a sentence, and not repeated on most pages like running
+    headers and footers.
+    """
+    line = paragraph.strip()
+    return (
+        0 < len(line) <= HEADING_MAX_LENGTH
+        and "\n" not in line
+        and (line[0].isupper() or HEADING_NUMBER_PATTERN.match(line) is not None)
+        and not line.endswith((".", ",", ";", ":", "-"))
+        and not line.isdigit()
+        and line not in running_lines
+    )
+
+
+def build_page_records(
+    page_texts: List[str],
+) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Join the text of the pages of a PDF and locate its pages and sections.
+
+    Page and section records hold character offsets into the joined content instead of
+    copies of their text, so a page or section is read as content[start:end].
+
+    Args:
+        page_texts (List[str]): Extracted text of each page, in page order.
+
+    Returns:
+        Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]: The content (pages ended
+            by form feeds), a record per page (page, start, end, heading) and a record
+            per section (heading, page, start, end), where a section runs from its
+            heading to the next one.
+    """
+    # Lines repeated on several pages (a third of them) are running headers or footers
+    line_counts = Counter(
+        line.strip()
+        for text in page_texts
+        for line in set(text.splitlines())
+        if line.strip()
+    )
+    running_lines = {
+        line
+        for line, count in line_counts.items()
+        if count >= max(2, len(page_texts) / 3)
+    }
+
+    parts: List[str] = []
+    pages: List[Dict[str, Any]] = []
+    sections: List[Dict[str, Any]] = []
+    offset = 0
+    for number, text in enumerate(page_texts, 1):
+        if not text.endswith(PAGE_SEPARATOR):
+            text += PAGE_SEPARATOR
+        page = {"page": number, "start": offset, "end": offset + len(text)}
+        page["heading"] = None
+        for match in PARAGRAPH_PATTERN.finditer(text):
+            if _is_heading(match.group(), running_lines):
+                heading = match.group().strip()
+                if page["heading"] is None:
+                    page["heading"] = heading
+                if sections:
+                    sections[-1]["end"] = offset + match.start()
+                sections.append(
+                    {
+                        "heading": heading,
+                        "page": number,
+                        "start": offset + match.start(),
+                        "end": None,
+                    }
+                )
+        pages.append(page)
+        parts.append(text)
+        offset += len(text)
+    if sections:
+        sections[-1]["end"] = offset
+    return "".join(parts), pages, sections
+
+
+def split_pdf_resource(resource: Dict[str, Any]) -> List[Dict]:
+    """
+    Split an ingested PDF into a document record followed by one resource per page.
+
+    Each page resource carries its text, the document's metadata and a link to the
+    document, so pages can be indexed, embedded and retrieved on their own. Page file
+    paths have the form "<document path>#page=<n>".
+
+    The document record keeps the document's metadata and its sections. Its content is
+    the table of contents (the section headings), so the text of the pages is stored
+    once. Each section record gives the page it starts on and the offset of its heading
+    in that page's content; a section runs up to the start of the next one.
+
+    Args:
+        resource (Dict[str, Any]): Resource returned by ingest_pdf_file.
+
+    Returns:
+        List[Dict]: The document record and the page resources, in page order.
+    """
+    document = resource["metadata"]
+    content = resource.get("content", "")
+    page_starts = {record["page"]: record["start"] for record in resource["pages"]}
+    sections = [
+        {
+            "heading": section["heading"],
+            "page": section["page"],
+            "start": section["start"] - page_starts[section["page"]],
+        }
+        for section in resource.get("sections", [])
+    ]
+    records = [
+        {
+            "metadata": document,
+            "content": "\n".join(section["heading"] for section in sections),
+            "sections": sections,
+        }
+    ]
+    for record in resource["pages"]:
+        text = content[record["start"] : record["end"]].rstrip(PAGE_SEPARATOR)
+        if not text.strip():
+            continue
+        # Extraction timings describe the whole document, not a page of it
+        metadata = {k: v for k, v in document.items() if k != "page_timings"}
+        metadata.update(
+            {
+                "file_path": f"{document['file_path']}#page={record['page']}",
+                "resource_type": "pdf_page",
+                "parent_file_path": document["file_path"],
+                "page": record["page"],
+                "heading": record["heading"],
+            }
+        )
+        records.append({"metadata": metadata, "content": text})
+    return records
+
+
+def ingest_pdf_pages(
+    file_path: str, page_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Ingest a PDF file into a document record and one resource per page.
+
+    Pages are indexed and embedded on their own, so searches point to the page of a
+    match and each page's embedding represents its own text rather than the start of the
+    book. The document record holds the sections; see split_pdf_resource.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        page_workers (Optional[int]): Number of processes extracting the pages of the
+            file; see ingest_pdf_file.
+
+    Returns:
+        List[Dict[str, Any]]: The document record followed by the page resources, or the
+            document resource with its error when no text could be extracted.
+    """
+    resource = ingest_pdf_file(file_path, page_workers)
+    if not resource["content"].strip():
+        return [resource]
+    return split_pdf_resource(resource)
+
+
+def ingest_pdf_file(
+    file_path: str, page_workers: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Ingest a single PDF file and extract its content and metadata.
 
     Args:
         file_path (str): Path to the PDF file.
+        page_workers (Optional[int]): Number of processes extracting the pages of the
+            file. Defaults to the number of CPUs, or to 1 when called from a worker
+            process that is already ingesting files in parallel.
 
     Returns:
         Dict[str, Any]: Dictionary containing metadata and extracted content.
@@ -43,81 +605,77 @@ def ingest_pdf_file(file_path: str) -> Dict[str, Any]:
         "resource_type": "pdf",
     }
 
-    try:
-        # First attempt with PyPDF2 for basic metadata and text extraction
-        with open(file_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            metadata["page_count"] = len(reader.pages)
-            if reader.metadata:
-                metadata["title"] = reader.metadata.get("/Title", "")
-                metadata["author"] = reader.metadata.get("/Author", "")
-                metadata["subject"] = reader.metadata.get("/Subject", "")
-                metadata["keywords"] = reader.metadata.get("/Keywords", "")
-            # Extract text page by page as a fallback and for structuring
-            content_fallback = []
-            for i in range(len(reader.pages)):
-                page_text = reader.pages[i].extract_text()
-                content_fallback.append(f"Page {i+1}:\n{page_text}\n")
-    except Exception as e:
-        print(f"Error reading PDF metadata with PyPDF2 for {file_path}: {e}")
-        content_fallback = []
+    if page_workers is None:
+        page_workers = 1 if multiprocessing.parent_process() else os.cpu_count()
 
+    pages: List[Dict[str, Any]] = []
     try:
-        # Use pdfminer.six for more accurate text extraction
-        content = extract_text(file_path)
-        if not content.strip():
-            content = "\n".join(content_fallback) if content_fallback else ""
+        info, pages = extract_pdf_pages_parallel(
+            file_path,
+            max_workers=page_workers,
+            cache=PageCache(namespace=CACHE_NAMESPACE),
+        )
+        metadata.update(info)
     except Exception as e:
-        print(f"Error extracting text with pdfminer for {file_path}: {e}")
-        content = "\n".join(content_fallback) if content_fallback else ""
+        print(f"Error extracting text from {file_path}: {e}")
 
     # Attempt OCR if no content is extracted (for scanned PDFs)
-    if not content.strip():
+    if not any(page["text"].strip() for page in pages):
         try:
-            import pytesseract
-            from pdf2image import convert_from_path
-
             print(f"Attempting OCR for scanned PDF {file_path}")
-            pages = convert_from_path(file_path)
-            content_list = []
-            for i, page in enumerate(pages):
-                text = pytesseract.image_to_string(page, lang="eng")
-                content_list.append(f"Page {i+1}:\n{text}\n")
-            content = "\n".join(content_list)
+            page_count = len(pages) or read_pdf_info(file_path)[1]
+            pages = ocr_pdf_pages(
+                file_path,
+                page_count,
+                max_workers=page_workers,
+                cache=PageCache(namespace=f"{CACHE_NAMESPACE}-ocr-{OCR_DPI}dpi"),
+            )
         except Exception as e:
             print(f"Error performing OCR on {file_path}: {e}")
-            content = ""
 
-    if not content:
+    metadata["page_count"] = len(pages)
+    metadata["page_timings"] = [
+        {key: value for key, value in page.items() if key != "text"} for page in pages
+    ]
+    content, page_records, sections = build_page_records(
+        [page["text"] for page in pages]
+    )
+
+    if not content.strip():
         print(f"Warning: No content extracted from {file_path}")
         metadata["error"] = "No content extracted from PDF"
-        return {"metadata": metadata, "content": "", "processed_content": ""}
+        return {"metadata": metadata, "content": "", "pages": [], "sections": []}
 
-    return {"metadata": metadata, "content": content, "processed_content": content}
+    # Pages and sections are offsets into content rather than copies of its text
+    return {
+        "metadata": metadata,
+        "content": content,
+        "pages": page_records,
+        "sections": sections,
+    }
 
 
-def ingest_pdf_directory(directory_path: str) -> List[Dict[str, Any]]:
+def ingest_pdf_directory(
+    directory_path: str, max_workers: int = 1, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
-    Ingest all PDF files in a directory and its subdirectories.
+    Ingest all PDF files in a directory and its subdirectories, one resource per page.
 
     Args:
         directory_path (str): Path to the directory containing PDF files.
+        max_workers (int): Number of worker processes; 1 ingests files sequentially.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
 
     Returns:
-        List[Dict[str, Any]]: List of dictionaries with metadata and content for each file.
+        List[Dict[str, Any]]: List of dictionaries with metadata and content for each page.
     """
-    pdf_data = []
-    supported_extension = ".pdf"
-
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith(supported_extension):
-                file_path = os.path.join(root, file)
-                data = ingest_pdf_file(file_path)
-                if data:
-                    pdf_data.append(data)
-
-    return pdf_data
+    return ingest_files(
+        find_files(directory_path, SUPPORTED_EXTENSIONS),
+        ingest_pdf_pages,
+        "pdf",
+        max_workers=max_workers,
+        timeout=timeout,
+    )
 
 
 if __name__ == "__main__":
@@ -8,14 +8,26 @@ Key Responsibilities:
 - Coordinate the ingestion of different resource types.
 - Provide a unified interface for resource processing.
 - Ensure all processing is local and privacy-respecting.
+- Optionally ingest files of all types in parallel across a process pool.
+- Yield resources lazily so callers can index them as they arrive.
 """
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+from . import text_ingestor, pdf_ingestor, video_ingestor, image_ingestor
 from .text_ingestor import ingest_text_file, ingest_text_directory
-from .pdf_ingestor import ingest_pdf_file, ingest_pdf_directory
+from .pdf_ingestor import ingest_pdf_pages, ingest_pdf_directory
 from .video_ingestor import ingest_video_file, ingest_video_directory
 from .image_ingestor import ingest_image_file, ingest_image_directory
+from .parallel import as_resources, find_files, ingest_files_parallel
+
+# Subdirectory of the resources directory and ingestor module for each resource type
+RESOURCE_TYPES = {
+    "text": ("text", text_ingestor, ingest_text_file),
+    "pdf": ("pdf", pdf_ingestor, ingest_pdf_pages),
+    "video": ("video", video_ingestor, ingest_video_file),
+    "image": ("image", image_ingestor, ingest_image_file),
+}
 
 
 class ResourceIngestor:
@@ -24,14 +36,27 @@ class ResourceIngestor:
     It delegates the actual processing to specific ingestion modules based on resource type.
     """
 
-    def __init__(self, resources_dir: str = "resources"):
+    def __init__(
+        self,
+        resources_dir: str = "resources",
+        max_workers: int = 1,
+        type_limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Initialize the ResourceIngestor with the directory containing resources.
 
         Args:
             resources_dir (str): Directory path where resources are located.
+            max_workers (int): Number of worker processes; 1 ingests files sequentially.
+            type_limits (Optional[Dict[str, int]]): Maximum number of files of each
+                resource type ingested at once; defaults to one video at a time.
+            timeout (Optional[float]): Seconds after which a file is abandoned.
         """
         self.resources_dir = resources_dir
+        self.max_workers = max_workers
+        self.type_limits = type_limits
+        self.timeout = timeout
 
     def ingest_text_resources(self) -> List[Dict[str, Any]]:
         """
@@ -42,7 +67,9 @@ class ResourceIngestor:
         """
         text_dir = os.path.join(self.resources_dir, "text")
         if os.path.exists(text_dir):
-            return ingest_text_directory(text_dir)
+            return ingest_text_directory(
+                text_dir, max_workers=self.max_workers, timeout=self.timeout
+            )
         return []
 
     def ingest_pdf_resources(self) -> List[Dict[str, Any]]:
@@ -54,7 +81,9 @@ class ResourceIngestor:
         """
         pdf_dir = os.path.join(self.resources_dir, "pdf")
         if os.path.exists(pdf_dir):
-            return ingest_pdf_directory(pdf_dir)
+            return ingest_pdf_directory(
+                pdf_dir, max_workers=self.max_workers, timeout=self.timeout
+            )
         return []
 
     def ingest_video_resources(self) -> List[Dict[str, Any]]:
@@ -66,7 +95,9 @@ class ResourceIngestor:
         """
         video_dir = os.path.join(self.resources_dir, "video")
         if os.path.exists(video_dir):
-            return ingest_video_directory(video_dir)
+            return ingest_video_directory(
+                video_dir, max_workers=self.max_workers, timeout=self.timeout
+            )
         return []
 
     def ingest_image_resources(self) -> List[Dict[str, Any]]:
@@ -78,7 +109,9 @@ class ResourceIngestor:
         """
         image_dir = os.path.join(self.resources_dir, "image")
         if os.path.exists(image_dir):
-            return ingest_image_directory(image_dir)
+            return ingest_image_directory(
+                image_dir, max_workers=self.max_workers, timeout=self.timeout
+            )
         return []
 
     def ingest_all(self) -> List[Dict[str, Any]]:
@@ -88,12 +121,34 @@ class ResourceIngestor:
         Returns:
             List[Dict[str, Any]]: Combined list of dictionaries containing metadata and content for all resources.
         """
-        all_resources = []
-        all_resources.extend(self.ingest_text_resources())
-        all_resources.extend(self.ingest_pdf_resources())
-        all_resources.extend(self.ingest_video_resources())
-        all_resources.extend(self.ingest_image_resources())
-        return all_resources
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """
+        Ingest all types of resources, yielding each one as soon as it is ingested.
+
+        Unlike ingest_all, only the resources not yet consumed by the caller are held in
+        memory. With several workers, the files of all types share one process pool, so
+        PDFs, images and text run while a video is transcribed, within the per-type
+        concurrency limits.
+
+        Yields:
+            Dict[str, Any]: Resources in text, PDF, video, image order.
+        """
+        tasks = []
+        for resource_type, (subdirectory, module, ingest) in RESOURCE_TYPES.items():
+            type_dir = os.path.join(self.resources_dir, subdirectory)
+            if os.path.exists(type_dir):
+                for file_path in find_files(type_dir, module.SUPPORTED_EXTENSIONS):
+                    tasks.append((file_path, resource_type, ingest))
+        results = ingest_files_parallel(
+            tasks,
+            max_workers=self.max_workers,
+            type_limits=self.type_limits,
+            timeout=self.timeout,
+        )
+        for _, data in results:
+            yield from as_resources(data)
 
 
 if __name__ == "__main__":
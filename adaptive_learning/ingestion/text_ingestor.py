@@ -8,56 +8,163 @@ Key Responsibilities:
 - Read and parse text files (.txt, .json).
 - Extract metadata and content for indexing.
 - Use NLP libraries (nltk, spaCy) for text processing.
+- Analyze documents in spaCy batches with a single trimmed pipeline parse each.
+- Load NLP models on first use, never touching the network in offline mode.
+- Analyze long texts in full, chunk by chunk, merging entity and keyword statistics.
+- Spread the chunks of large inputs over a pool of processes, each loading the model once.
+- Split JSON exercise banks into one resource per exercise (see json_ingestor).
+- Reuse the analysis of long texts with the same content from the content cache.
 - Ensure all processing is local and privacy-respecting.
 
 Dependencies:
-- nltk: For basic text processing and tokenization.
-- spaCy: For advanced NLP tasks like entity recognition.
+- nltk: For tokenization and tagging when the spaCy model is not installed.
+- spaCy: For tokenization, POS tagging, entity recognition and sentence boundaries.
 - json: For handling JSON formatted files.
 """
 
 import os
 import json
-import nltk
-import spacy
-from typing import Dict, List, Any
-
-# Download required NLTK data (local processing)
-try:
-    nltk.download("punkt", quiet=True)
-    nltk.download("averaged_perceptron_tagger", quiet=True)
-except Exception as e:
-    print(
-        f"Warning: Could not download NLTK data. Some text processing features may be limited. Error: {e}"
-    )
-# Check if NLTK data is available, otherwise set a flag to skip NLTK processing
-try:
-    nltk.data.find("tokenizers/punkt")
-    nltk.data.find("taggers/averaged_perceptron_tagger")
-    nltk_available = True
-except LookupError:
-    print(f"Warning: NLTK data not found. Text processing with NLTK will be skipped.")
-    nltk_available = False
-
-# Load spaCy model (ensure it is installed locally)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print(
-        "Warning: spaCy model 'en_core_web_sm' not found. Please install it using 'python -m spacy download en_core_web_sm'."
-    )
-    nlp = None
-
+import hashlib
+import itertools
+import threading
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
+
+from .cache import ContentCache
+from .json_ingestor import ingest_exercise_bank
+from .parallel import find_files, ingest_files, worker_context
+
+# Bump when the extracted content or metadata changes so the ingestion manifest
+# re-ingests files processed by older versions
+INGESTOR_VERSION = "6"
+
+SUPPORTED_EXTENSIONS = (".txt", ".json")
+
+# Components not needed for entities, keywords, POS tags and sentence boundaries; the
+# dependency parser is replaced by the much faster sentence recognizer
+UNUSED_SPACY_COMPONENTS = ["lemmatizer", "parser"]
+
+# Chunks analyzed per spaCy batch, and processes analyzing chunks (0 chooses one process
+# for short inputs and one per CPU for inputs of at least PARALLEL_CHUNK_THRESHOLD chunks)
+SPACY_BATCH_SIZE = int(os.environ.get("SPACY_BATCH_SIZE", "32"))
+SPACY_N_PROCESS = int(os.environ.get("SPACY_N_PROCESS", "0"))
+PARALLEL_CHUNK_THRESHOLD = 16
+
+# Long texts are analyzed in chunks of about this many characters
+CHUNK_SIZE = 10000
+
+# Texts of at least this many characters have their analysis cached by content
+CACHE_MIN_CHARS = CHUNK_SIZE
+
+# Number of entities and keywords kept in the metadata
+MAX_ENTITIES = 50
+MAX_KEYWORDS = 20
+
+# Never download NLP data when set (e.g. ADAPTIVE_LEARNING_OFFLINE=1)
+OFFLINE = os.environ.get("ADAPTIVE_LEARNING_OFFLINE", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# NLP models are loaded on first use, so importing the ingestion package stays fast
+_NOT_LOADED = object()
+_nlp: Any = _NOT_LOADED
+_nltk_available: Optional[bool] = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp() -> Any:
+    """
+    Return the spaCy pipeline used for text analysis, loading it on first use.
 
-def ingest_text_file(file_path: str) -> Dict[str, Any]:
+    Returns:
+        Any: The trimmed en_core_web_sm pipeline, or None if spaCy or the model is not
+            installed.
     """
-    Ingest a single text file (.txt or .json) and extract its content and metadata.
+    global _nlp
+    if _nlp is _NOT_LOADED:
+        with _nlp_lock:
+            if _nlp is _NOT_LOADED:
+                _nlp = _load_nlp()
+    return _nlp
 
-    Args:
-        file_path (str): Path to the text file.
+
+def _load_nlp() -> Any:
+    """
+    Load the spaCy model (ensure it is installed locally) with the unused components
+    excluded.
+    """
+    try:
+        import spacy
+
+        nlp = spacy.load("en_core_web_sm", exclude=UNUSED_SPACY_COMPONENTS)
+        if "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+        elif not nlp.has_pipe("senter"):
+            nlp.add_pipe("sentencizer")
+        return nlp
+    except (ImportError, OSError):
+        print(
+            "Warning: spaCy model 'en_core_web_sm' not found. Please install it using 'python -m spacy download en_core_web_sm'."
+        )
+        return None
+
+
+def nltk_available() -> bool:
+    """
+    Check whether the NLTK data used as a fallback is available, downloading it on first
+    use unless OFFLINE is set.
 
     Returns:
-        Dict[str, Any]: Dictionary containing metadata and processed content.
+        bool: True if the punkt tokenizer and the perceptron tagger can be used.
+    """
+    global _nltk_available
+    if _nltk_available is None:
+        with _nlp_lock:
+            if _nltk_available is None:
+                _nltk_available = _load_nltk()
+    return _nltk_available
+
+
+def _load_nltk() -> bool:
+    """
+    Find the NLTK data, downloading it first when allowed.
+    """
+    try:
+        import nltk
+    except ImportError:
+        print(
+            "Warning: NLTK is not installed. Text processing with NLTK will be skipped."
+        )
+        return False
+
+    # Download required NLTK data (local processing)
+    if not OFFLINE:
+        try:
+            nltk.download("punkt", quiet=True)
+            nltk.download("averaged_perceptron_tagger", quiet=True)
+        except Exception as e:
+            print(
+                f"Warning: Could not download NLTK data. Some text processing features may be limited. Error: {e}"
+            )
+    # Check if NLTK data is available, otherwise skip NLTK processing
+    try:
+        nltk.data.find("tokenizers/punkt")
+        nltk.data.find("taggers/averaged_perceptron_tagger")
+        return True
+    except LookupError:
+        print(
+            f"Warning: NLTK data not found. Text processing with NLTK will be skipped."
+        )
+        return False
+
+
+def _read_text_file(file_path: str) -> Dict[str, Any]:
+    """
+    Read a text file and build its resource without NLP metadata.
     """
     file_extension = os.path.splitext(file_path)[1].lower()
     file_name = os.path.basename(file_path)
@@ -83,15 +190,101 @@ def ingest_text_file(file_path: str) -> Dict[str, Any]:
         metadata["error"] = str(e)
         return {"metadata": metadata, "content": "", "processed_content": ""}
 
-    # Process text content using NLTK and spaCy if available
-    processed_data = process_text_content(content)
-    metadata.update(processed_data.get("metadata", {}))
+    return {"metadata": metadata, "content": content, "processed_content": content}
 
-    return {
-        "metadata": metadata,
-        "content": content,
-        "processed_content": processed_data.get("processed_content", content),
-    }
+
+def ingest_text_file(file_path: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Ingest a single text file (.txt or .json) and extract its content and metadata.
+
+    Args:
+        file_path (str): Path to the text file.
+
+    Returns:
+        Union[Dict[str, Any], List[Dict[str, Any]]]: Dictionary containing metadata and
+            processed content, or one dictionary per exercise for JSON exercise banks.
+    """
+    resources = ingest_text_files([file_path])
+    if resources and resources[0]["metadata"].get("parent_file_path") == file_path:
+        return resources
+    return resources[0]
+
+
+def ingest_text_files(
+    file_paths: List[str], batch_size: int = SPACY_BATCH_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Ingest text files, analyzing their content in spaCy batches.
+
+    Files are read and analyzed batch_size at a time, so only one batch of documents is
+    held in memory while nlp.pipe processes them together. JSON exercise banks are split
+    into one resource per exercise instead.
+
+    Args:
+        file_paths (List[str]): Paths to the text files.
+        batch_size (int): Number of files read and analyzed together.
+
+    Returns:
+        List[Dict[str, Any]]: Dictionary with metadata and processed content per file,
+            and per exercise of each exercise bank.
+    """
+    resources = []
+    documents = []
+    for file_path in file_paths:
+        exercises = None
+        if file_path.lower().endswith(".json"):
+            exercises = ingest_exercise_bank(file_path)
+        if exercises:
+            resources.extend(exercises)
+        else:
+            documents.append(file_path)
+
+    cache = _analysis_cache() if documents else None
+    for i in range(0, len(documents), batch_size):
+        batch = [
+            _read_text_file(file_path) for file_path in documents[i : i + batch_size]
+        ]
+        # Long texts analyzed before, under any path, reuse their cached analysis
+        pending = []
+        for resource in batch:
+            if "error" in resource["metadata"]:
+                continue
+            content_hash = None
+            if cache and len(resource["content"]) >= CACHE_MIN_CHARS:
+                content_hash = hashlib.sha256(
+                    resource["content"].encode("utf-8")
+                ).hexdigest()
+                cached = cache.get(content_hash, "analysis")
+                if cached is not None:
+                    resource["metadata"].update(cached)
+                    continue
+            pending.append((resource, content_hash))
+
+        analyses = process_text_contents(
+            [resource["content"] for resource, _ in pending], batch_size=batch_size
+        )
+        for (resource, content_hash), processed_data in zip(pending, analyses):
+            resource["metadata"].update(processed_data.get("metadata", {}))
+            resource["processed_content"] = processed_data.get(
+                "processed_content", resource["content"]
+            )
+            if content_hash:
+                cache.put(content_hash, "analysis", processed_data.get("metadata", {}))
+        resources.extend(batch)
+    return resources
+
+
+def _analysis_cache() -> Optional[ContentCache]:
+    """
+    Return the cache of text analyses made with the current spaCy pipeline, or None when
+    spaCy is not installed (the NLTK fallback is cheap and its result depends on which
+    NLTK data happens to be installed).
+    """
+    nlp = get_nlp()
+    if not nlp:
+        return None
+    pipeline = f"{nlp.lang}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+    return ContentCache(namespace=f"text-v{INGESTOR_VERSION}-{pipeline}")
 
 
 def process_text_content(content: str) -> Dict[str, Any]:
@@ -104,11 +297,240 @@ def process_text_content(content: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Dictionary with processed content and extracted metadata.
     """
+    return process_text_contents([content])[0]
+
+
+def split_into_chunks(content: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Split text into chunks of about chunk_size characters.
+
+    Chunks end at the last paragraph break, sentence end or space before the limit, so
+    words and, where possible, sentences are not cut in half.
+
+    Args:
+        content (str): Text to split.
+        chunk_size (int): Maximum number of characters per chunk.
+
+    Yields:
+        str: The chunks, in order; together they contain the whole text.
+    """
+    start = 0
+    while start < len(content):
+        end = start + chunk_size
+        if end < len(content):
+            window = content[start:end]
+            for separator in ("\n\n", ". ", "\n", " "):
+                cut = window.rfind(separator)
+                if cut > chunk_size // 2:
+                    end = start + cut + len(separator)
+                    break
+        yield content[start:end]
+        start = end
+
+
+class _TextStatistics:
+    """
+    Statistics of one text accumulated over the spaCy parses of its chunks.
+    """
+
+    def __init__(self, content: str = ""):
+        self.content = content
+        self.chunk_count = 0
+        self.token_count = 0
+        self.pos_tags: Counter = Counter()
+        self.entities: Counter = Counter()
+        # Keyword -> occurrences in the text
+        self.keyword_counts: Counter = Counter()
+        self.keyword_forms: Dict[str, str] = {}
+        # Opening sentences of the first chunk
+        self.opening: Optional[str] = None
+
+    def add_chunk(self, doc: Any) -> None:
+        """
+        Add the statistics of the parse of the next chunk.
+        """
+        self.chunk_count += 1
+        for token in doc:
+            if token.is_space:
+                continue
+            self.token_count += 1
+            if token.tag_:
+                self.pos_tags[token.tag_] += 1
+        for ent in doc.ents:
+            self.entities[(ent.text, ent.label_)] += 1
+
+        # Keywords are nouns and proper nouns
+        for token in doc:
+            if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
+                term = token.text.lower()
+                self.keyword_counts[term] += 1
+                self.keyword_forms.setdefault(term, token.text)
+
+        # Longer texts are summarized by their opening sentences
+        if self.opening is None:
+            sentences = [sentence.text.strip() for sentence in doc.sents]
+            self.opening = " ".join(sentences[:3])
+
+    def merge(self, other: "_TextStatistics") -> None:
+        """
+        Add the statistics of the chunks following those added so far.
+        """
+        self.chunk_count += other.chunk_count
+        self.token_count += other.token_count
+        self.pos_tags.update(other.pos_tags)
+        self.entities.update(other.entities)
+        self.keyword_counts.update(other.keyword_counts)
+        for term, form in other.keyword_forms.items():
+            self.keyword_forms.setdefault(term, form)
+        if self.opening is None:
+            self.opening = other.opening
+
+    def keywords(self) -> List[str]:
+        """
+        Return the keywords occurring most often in the text.
+
+        The main topic of a text runs through all of it, so its terms are not weighted
+        down for occurring in every chunk.
+        """
+        counts = self.keyword_counts
+        ranked = sorted(counts, key=lambda term: (-counts[term], term))
+        return [self.keyword_forms[term] for term in ranked[:MAX_KEYWORDS]]
+
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Return the merged metadata of the text.
+        """
+        return {
+            "token_count": self.token_count,
+            "pos_distribution": dict(self.pos_tags),
+            "entities": [
+                entity for entity, _ in self.entities.most_common(MAX_ENTITIES)
+            ],
+            "keywords": self.keywords(),
+            "summary": (
+                self.opening
+                if len(self.content) > 500 and self.opening is not None
+                else self.content
+            ),
+            "chunk_count": self.chunk_count,
+        }
+
+
+def process_text_contents(
+    contents: List[str],
+    batch_size: int = SPACY_BATCH_SIZE,
+    n_process: int = SPACY_N_PROCESS,
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Process several texts with a single spaCy parse each, batched through nlp.pipe.
+
+    Each text is analyzed in full, chunk by chunk: the chunks of all texts are streamed
+    through nlp.pipe, and only the running statistics of each text are kept, never its
+    parsed chunks. Token counts, POS distribution (Penn Treebank tags), entities,
+    keywords (the nouns occurring most often in the whole text) and the summary are
+    merged across the chunks of a text. NLTK is only used when the spaCy model is not
+    installed.
+
+    With several processes, batches of chunks are analyzed by a pool of worker processes
+    started from the fork server (see parallel.worker_context), each loading the model
+    once, and their statistics are merged in chunk order.
+
+    Args:
+        contents (List[str]): Raw text contents to process.
+        batch_size (int): Number of chunks spaCy processes per batch.
+        n_process (int): Number of processes analyzing chunks; 0 parallelizes inputs of
+            at least PARALLEL_CHUNK_THRESHOLD chunks over all CPUs.
+        chunk_size (int): Maximum number of characters per chunk.
+
+    Returns:
+        List[Dict[str, Any]]: Dictionary with processed content and extracted metadata
+            for each text, in input order.
+    """
+    nlp = get_nlp()
+    if not nlp:
+        return [_process_text_content_nltk(content) for content in contents]
+
+    if not n_process:
+        estimated_chunks = sum(len(content) // chunk_size + 1 for content in contents)
+        parallel = (
+            estimated_chunks >= PARALLEL_CHUNK_THRESHOLD
+            and multiprocessing.parent_process() is None
+        )
+        n_process = (os.cpu_count() or 1) if parallel else 1
+
+    statistics = [_TextStatistics(content) for content in contents]
+    try:
+        chunks = (
+            (chunk, i)
+            for i, content in enumerate(contents)
+            for chunk in split_into_chunks(content, chunk_size)
+        )
+        if n_process > 1:
+            for partial in _analyze_in_processes(chunks, batch_size, n_process):
+                for i, stats in partial.items():
+                    statistics[i].merge(stats)
+        else:
+            for doc, i in nlp.pipe(chunks, as_tuples=True, batch_size=batch_size):
+                statistics[i].add_chunk(doc)
+        return [
+            {"processed_content": content, "metadata": stats.metadata()}
+            for content, stats in zip(contents, statistics)
+        ]
+    except Exception as e:
+        print(f"Error processing text with spaCy: {e}")
+        return [_process_text_content_nltk(content) for content in contents]
+
+
+def _analyze_chunks(
+    chunks: List[Tuple[str, int]], batch_size: int
+) -> Dict[int, _TextStatistics]:
+    """
+    Analyze (chunk, text index) pairs with this process's spaCy pipeline and return the
+    statistics of each text they belong to.
+    """
+    statistics: Dict[int, _TextStatistics] = {}
+    for doc, i in get_nlp().pipe(chunks, as_tuples=True, batch_size=batch_size):
+        statistics.setdefault(i, _TextStatistics()).add_chunk(doc)
+    return statistics
+
+
+def _analyze_in_processes(
+    chunks: Iterable[Tuple[str, int]], batch_size: int, n_process: int
+) -> Iterator[Dict[int, _TextStatistics]]:
+    """
+    Analyze batches of (chunk, text index) pairs in worker processes, yielding the
+    statistics of each batch in input order. At most two batches per worker are
+    waiting, so the chunks of large inputs are not all pickled at once.
+    """
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(
+        max_workers=n_process, mp_context=worker_context(), initializer=get_nlp
+    ) as executor:
+        running: deque = deque()
+        while True:
+            batch = list(itertools.islice(chunks, batch_size))
+            if not batch:
+                break
+            running.append(executor.submit(_analyze_chunks, batch, batch_size))
+            if len(running) >= 2 * n_process:
+                yield running.popleft().result()
+        while running:
+            yield running.popleft().result()
+
+
+def _process_text_content_nltk(content: str) -> Dict[str, Any]:
+    """
+    Process text content with NLTK when the spaCy model is not available.
+    """
     processed_content = content
-    metadata = {}
+    metadata = {"entities": [], "keywords": []}
+    use_nltk = nltk_available()
+    if use_nltk:
+        import nltk
 
     # Tokenization with NLTK if available
-    if nltk_available:
+    if use_nltk:
         try:
             tokens = nltk.word_tokenize(content)
             pos_tags = nltk.pos_tag(tokens)
@@ -123,34 +545,8 @@ def process_text_content(content: str) -> Dict[str, Any]:
         metadata["pos_distribution"] = {}
         print("Skipping NLTK processing due to missing data.")
 
-    # Entity recognition and keyword extraction with spaCy if available
-    if nlp:
-        try:
-            doc = nlp(
-                content[:10000]
-            )  # Limit to first 10000 characters for performance
-            entities = [(ent.text, ent.label_) for ent in doc.ents]
-            metadata["entities"] = entities[:50]  # Limit to first 50 entities
-
-            # Extract keywords based on nouns and proper nouns
-            keywords = [
-                token.text
-                for token in doc
-                if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop
-            ]
-            metadata["keywords"] = list(
-                set(keywords[:20])
-            )  # Limit to top 20 unique keywords
-        except Exception as e:
-            print(f"Error processing text with spaCy: {e}")
-            metadata["entities"] = []
-            metadata["keywords"] = []
-    else:
-        metadata["entities"] = []
-        metadata["keywords"] = []
-
     # Summarize content for longer texts
-    if nltk_available:
+    if use_nltk:
         try:
             if len(content) > 500:  # Summarize if content is longer than 500 characters
                 sentences = nltk.sent_tokenize(content)
@@ -173,7 +569,7 @@ def summarize_pos_tags(pos_tags: List[tuple]) -> Dict[str, int]:
     Summarize the distribution of part-of-speech tags in the text.
 
     Args:
-        pos_tags (List[tuple]): List of (word, pos_tag) tuples from NLTK.
+        pos_tags (List[tuple]): List of (word, pos_tag) tuples from spaCy or NLTK.
 
     Returns:
         Dict[str, int]: Dictionary with POS tags as keys and their counts as values.
@@ -184,28 +580,30 @@ def summarize_pos_tags(pos_tags: List[tuple]) -> Dict[str, int]:
     return pos_distribution
 
 
-def ingest_text_directory(directory_path: str) -> List[Dict[str, Any]]:
+def ingest_text_directory(
+    directory_path: str, max_workers: int = 1, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Ingest all text files in a directory and its subdirectories.
 
     Args:
         directory_path (str): Path to the directory containing text files.
+        max_workers (int): Number of worker processes; 1 ingests files sequentially.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries with metadata and content for each file.
     """
-    text_data = []
-    supported_extensions = (".txt", ".json")
-
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith(supported_extensions):
-                file_path = os.path.join(root, file)
-                data = ingest_text_file(file_path)
-                if data:
-                    text_data.append(data)
-
-    return text_data
+    file_paths = find_files(directory_path, SUPPORTED_EXTENSIONS)
+    if max_workers <= 1 and not timeout:
+        return ingest_text_files(file_paths)
+    return ingest_files(
+        file_paths,
+        ingest_text_file,
+        "text",
+        max_workers=max_workers,
+        timeout=timeout,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""
+Transcript Module
+
+This module defines how speech transcripts are stored in the index of the Adaptive Learning
+System. Word timings are kept as compact columnar arrays (word id, start, end) over a
+vocabulary of the distinct words, and the words are grouped at pauses into phrases whose
+text is the content that is indexed, searched and shown. Each phrase records where its text
+starts in the content and which word it starts with, so a match in the content can be
+mapped back to the time it was spoken.
+
+Key Responsibilities:
+- Encode recognized words as columnar arrays with times in hundredths of a second.
+- Group words into phrases at pauses and build the phrase-level text view.
+- Decode the words of a time range of a transcript.
+
+Dependencies:
+- bisect: For locating times among the word timings.
+"""
+
+import bisect
+from typing import Any, Dict, List, Tuple
+
+# Times are stored as integers in units of 1 / TIME_SCALE seconds
+TIME_SCALE = 100
+
+# A phrase ends at a pause of at least PHRASE_PAUSE_SECONDS or after PHRASE_MAX_WORDS words
+PHRASE_PAUSE_SECONDS = 0.6
+PHRASE_MAX_WORDS = 30
+
+
+def build_transcript(
+    words: List[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Build the stored form of a transcript from recognized words.
+
+    Args:
+        words (List[Dict[str, Any]]): Recognized words with "word", "start" and "end" (in
+            seconds), in time order.
+
+    Returns:
+        Tuple[str, Dict[str, Any], List[Dict[str, Any]]]: The phrase text (one phrase per
+            line), the columnar word timings ("time_scale", "vocabulary", "ids",
+            "starts", "ends"), and one record per phrase with its "start" and "end"
+            offsets in the text, its first word ("word") and its time range
+            ("time_start", "time_end", in seconds).
+    """
+    vocabulary: Dict[str, int] = {}
+    ids: List[int] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    lines: List[str] = []
+    phrases: List[Dict[str, Any]] = []
+    phrase: List[str] = []
+    offset = 0
+
+    def end_phrase() -> None:
+        nonlocal offset
+        first = len(ids) - len(phrase)
+        text = " ".join(phrase)
+        phrases.append(
+            {
+                "start": offset,
+                "end": offset + len(text),
+                "word": first,
+                "time_start": starts[first] / TIME_SCALE,
+                "time_end": ends[-1] / TIME_SCALE,
+            }
+        )
+        lines.append(text)
+        offset += len(text) + 1
+        phrase.clear()
+
+    for word in words:
+        text = word.get("word", "").strip()
+        if not text:
+            continue
+        start = round(float(word.get("start", 0)) * TIME_SCALE)
+        end = round(float(word.get("end", 0)) * TIME_SCALE)
+        if phrase and (
+            start - ends[-1] >= PHRASE_PAUSE_SECONDS * TIME_SCALE
+            or len(phrase) >= PHRASE_MAX_WORDS
+        ):
+            end_phrase()
+        ids.append(vocabulary.setdefault(text, len(vocabulary)))
+        starts.append(start)
+        ends.append(end)
+        phrase.append(text)
+    if phrase:
+        end_phrase()
+
+    columns = {
+        "time_scale": TIME_SCALE,
+        "vocabulary": list(vocabulary),
+        "ids": ids,
+        "starts": starts,
+        "ends": ends,
+    }
+    return "\n".join(lines), columns, phrases
+
+
+def words_between(
+    columns: Dict[str, Any], time_start: float, time_end: float
+) -> List[Dict[str, Any]]:
+    """
+    Decode the words of a transcript spoken within a time range.
+
+    Args:
+        columns (Dict[str, Any]): Columnar word timings built by build_transcript.
+        time_start (float): Start of the range in seconds.
+        time_end (float): End of the range in seconds.
+
+    Returns:
+        List[Dict[str, Any]]: Words starting within the range, with "word", "start" and
+            "end" in seconds.
+    """
+    scale = columns["time_scale"]
+    starts = columns["starts"]
+    first = bisect.bisect_left(starts, round(time_start * scale))
+    last = bisect.bisect_right(starts, round(time_end * scale))
+    vocabulary = columns["vocabulary"]
+    return [
+        {
+            "word": vocabulary[columns["ids"][i]],
+            "start": starts[i] / scale,
+            "end": columns["ends"][i] / scale,
+        }
+        for i in range(first, last)
+    ]
@@ -0,0 +1,558 @@
+"""
+Transcription Service Module
+
+This module keeps the speech-to-text state of the Adaptive Learning System alive across the
+videos ingested by a process. The Vosk model (hundreds of MB) is loaded once per process
+instead of once per video, and recognizers are kept in a pool and reused across files. Audio
+is decoded by ffmpeg straight into the recognizer through a pipe, without temporary files.
+
+Key Responsibilities:
+- Select the Vosk model from configuration (the VOSK_MODEL_PATH environment variable).
+- Load the model once per process and share it between threads.
+- Pool KaldiRecognizer instances per sample rate and reset them between files.
+- Decode the audio of media files to 16 kHz mono PCM on an ffmpeg pipe.
+- Recognize 16-bit mono PCM audio into timestamped words as it is decoded.
+- Split long audio at silences and transcribe the segments across a process pool.
+- Keep the process pool and the models its workers load alive across videos.
+
+Dependencies:
+- vosk: For local speech-to-text transcription.
+- numpy: For the frame energies used to find silences.
+- ffmpeg: For decoding audio (from PATH, or the binary bundled with imageio-ffmpeg).
+"""
+
+import os
+import json
+import shutil
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .parallel import worker_context
+
+# Candidate model directories, separated by os.pathsep; the first existing one is used,
+# e.g. VOSK_MODEL_PATH="./vosk-model-pt-fb-v0.1.1-20220516_2113:./vosk-model-small-pt-0.3"
+DEFAULT_MODEL_PATH = "./vosk-model-small-pt-0.3"
+MODEL_PATH = os.environ.get("VOSK_MODEL_PATH", DEFAULT_MODEL_PATH)
+
+# Idle recognizers kept per sample rate
+RECOGNIZER_POOL_SIZE = int(os.environ.get("VOSK_RECOGNIZER_POOL_SIZE", "2"))
+
+# Sample rate of the decoded audio (the rate Vosk models are trained on)
+SAMPLE_RATE = 16000
+
+# Audio frames passed to the recognizer at a time
+FRAMES_PER_READ = 4000
+
+# Last lines of ffmpeg's error output reported when decoding fails
+STDERR_LINES = 20
+
+# Long audio is cut at the longest silence between SEGMENT_SECONDS and MAX_SEGMENT_SECONDS
+# after the previous cut, and at MAX_SEGMENT_SECONDS when there is no silence
+SEGMENT_SECONDS = float(os.environ.get("TRANSCRIPTION_SEGMENT_SECONDS", "60"))
+MAX_SEGMENT_SECONDS = 1.5 * SEGMENT_SECONDS
+
+# Voice activity detection: frames quieter than SILENCE_RATIO times the median frame energy
+# (and at least MIN_SILENCE_RMS) are silent; a cut needs MIN_SILENCE_SECONDS of them
+VAD_FRAME_SECONDS = 0.03
+SILENCE_RATIO = 0.1
+MIN_SILENCE_RMS = 50.0
+MIN_SILENCE_SECONDS = 0.3
+
+
+def ffmpeg_executable() -> str:
+    """
+    Return the ffmpeg executable, preferring the one on PATH.
+
+    Returns:
+        str: Path to ffmpeg; the binary bundled with imageio-ffmpeg (a moviepy dependency)
+            when ffmpeg is not installed on the system.
+    """
+    executable = shutil.which("ffmpeg")
+    if executable:
+        return executable
+    import imageio_ffmpeg
+
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def decode_audio_pcm(
+    file_path: str,
+    sample_rate: int = SAMPLE_RATE,
+    frames_per_read: int = FRAMES_PER_READ,
+) -> Iterator[bytes]:
+    """
+    Decode the audio track of a media file to 16-bit mono PCM, yielding it as it decodes.
+
+    ffmpeg writes the samples to a pipe, so the caller can consume the start of the audio
+    while the rest is still being decoded and nothing is written to disk. Closing the
+    generator early stops ffmpeg.
+
+    Args:
+        file_path (str): Path to the media file.
+        sample_rate (int): Sample rate of the decoded audio.
+        frames_per_read (int): Number of samples per yielded block.
+
+    Yields:
+        bytes: Blocks of little-endian 16-bit samples.
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode the audio (e.g. the file has no audio track).
+    """
+    command = [
+        ffmpeg_executable(),
+        "-nostdin",
+        "-v",
+        "error",
+        "-i",
+        file_path,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # stderr is drained concurrently: ffmpeg blocks once the stderr pipe fills, and would
+    # stop writing samples while it is not read. Only the last lines are kept for the error
+    errors: deque = deque(maxlen=STDERR_LINES)
+    drain = threading.Thread(target=errors.extend, args=(process.stderr,), daemon=True)
+    drain.start()
+    try:
+        while True:
+            data = process.stdout.read(frames_per_read * 2)
+            if not data:
+                break
+            yield data
+        if process.wait() != 0:
+            drain.join()
+            message = b"".join(errors).decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg could not decode the audio: {message}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        drain.join()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def resolve_model_path(model_path: Optional[str] = None) -> str:
+    """
+    Select the Vosk model directory from the configured candidates.
+
+    Args:
+        model_path (Optional[str]): Candidate directories separated by os.pathsep;
+            defaults to MODEL_PATH (set by the VOSK_MODEL_PATH environment variable).
+
+    Returns:
+        str: The first candidate directory that exists.
+
+    Raises:
+        FileNotFoundError: If none of the candidates exists.
+    """
+    candidates = [p for p in (model_path or MODEL_PATH).split(os.pathsep) if p]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    print(
+        f"Error: Vosk model not found at {', '.join(candidates)}. For this Adaptive Learning System with Brazilian Portuguese content, I recommend 'vosk-model-pt-fb-v0.1.1-20220516_2113' for higher accuracy or 'vosk-model-small-pt-0.3' for lower resource usage. Ensure the model folder is in the workspace root or set the environment variable 'VOSK_MODEL_PATH'. Download from https://alphacephei.com/vosk/models if needed."
+    )
+    raise FileNotFoundError(
+        f"Vosk model not found at {', '.join(candidates)}. Please set the environment variable 'VOSK_MODEL_PATH' with the correct path to a Vosk model."
+    )
+
+
+class TranscriptionService:
+    """
+    Transcribes audio with a Vosk model loaded once and a pool of reusable recognizers.
+
+    Use get_transcription_service() to share one service per process, so worker processes
+    of a parallel ingestion load the model once and keep it for the files they ingest.
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        pool_size: int = RECOGNIZER_POOL_SIZE,
+    ):
+        """
+        Initialize the service; the model is loaded on first use.
+
+        Args:
+            model_path (Optional[str]): Candidate model directories separated by
+                os.pathsep; defaults to MODEL_PATH.
+            pool_size (int): Maximum number of idle recognizers kept per sample rate.
+        """
+        self.model_path = model_path
+        self.pool_size = max(1, pool_size)
+        self._model: Any = None
+        self._idle: Dict[float, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        """
+        The Vosk model, loaded on first access.
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import vosk
+
+                    path = resolve_model_path(self.model_path)
+                    print(f"Loading Vosk model from {path}...")
+                    self._model = vosk.Model(path)
+        return self._model
+
+    @contextmanager
+    def recognizer(self, sample_rate: float) -> Iterator[Any]:
+        """
+        Borrow a recognizer for the given sample rate from the pool.
+
+        The recognizer is reset when it is returned, so the next file starts from a clean
+        state; pools grow beyond pool_size only while more files are transcribed at once.
+
+        Args:
+            sample_rate (float): Sample rate of the audio to recognize.
+
+        Yields:
+            Any: A KaldiRecognizer with word timestamps enabled.
+        """
+        import vosk
+
+        model = self.model
+        with self._lock:
+            idle = self._idle.setdefault(sample_rate, [])
+            rec = idle.pop() if idle else None
+        if rec is None:
+            rec = vosk.KaldiRecognizer(model, sample_rate)
+            rec.SetWords(True)
+        try:
+            yield rec
+        finally:
+            self._release(sample_rate, rec)
+
+    def _release(self, sample_rate: float, rec: Any) -> None:
+        """
+        Reset a borrowed recognizer and return it to the pool if there is room.
+        """
+        try:
+            rec.Reset()
+        except Exception:
+            # A recognizer that cannot be reset is dropped instead of reused
+            return
+        with self._lock:
+            if len(self._idle[sample_rate]) < self.pool_size:
+                self._idle[sample_rate].append(rec)
+
+    def transcribe_file(self, file_path: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Transcribe the audio track of a media file, decoding it on an ffmpeg pipe.
+
+        Args:
+            file_path (str): Path to the video or audio file.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: The recognized words and text, as returned
+                by recognize.
+        """
+        # Closing the decoder stops ffmpeg if transcription fails halfway
+        with closing(decode_audio_pcm(file_path)) as blocks:
+            return self.recognize(blocks, SAMPLE_RATE)
+
+    def transcribe_wav(self, wf: Any) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Transcribe an open 16-bit mono WAV file.
+
+        Args:
+            wf (Any): A wave.Wave_read positioned at the start of the audio.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: The recognized words and text, as returned
+                by recognize.
+        """
+        blocks = iter(lambda: wf.readframes(FRAMES_PER_READ), b"")
+        return self.recognize(blocks, wf.getframerate())
+
+    def recognize(
+        self, blocks: Iterable[bytes], sample_rate: float
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Recognize the words of 16-bit mono PCM audio.
+
+        Args:
+            blocks (Iterable[bytes]): Blocks of little-endian 16-bit samples.
+            sample_rate (float): Sample rate of the audio.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: The recognized words ("word", "start" and
+                "end" in seconds from the start of the audio) and the recognized text.
+        """
+        words: List[Dict[str, Any]] = []
+        texts: List[str] = []
+
+        def add_result(result: Dict[str, Any]) -> None:
+            words.extend(result.get("result", []))
+            if result.get("text"):
+                texts.append(result["text"])
+
+        with self.recognizer(sample_rate) as rec:
+            for data in blocks:
+                if rec.AcceptWaveform(data):
+                    add_result(json.loads(rec.Result()))
+            # The last utterance is only complete once the audio has ended
+            add_result(json.loads(rec.FinalResult()))
+        return words, " ".join(texts)
+
+
+_services: Dict[str, TranscriptionService] = {}
+_services_lock = threading.Lock()
+
+
+def get_transcription_service(model_path: Optional[str] = None) -> TranscriptionService:
+    """
+    Return the process-wide transcription service for a model configuration.
+
+    Args:
+        model_path (Optional[str]): Candidate model directories separated by os.pathsep;
+            defaults to MODEL_PATH.
+
+    Returns:
+        TranscriptionService: The service, created on the first call for the path.
+    """
+    key = model_path or MODEL_PATH
+    with _services_lock:
+        if key not in _services:
+            _services[key] = TranscriptionService(model_path)
+        return _services[key]
+
+
+def find_silence_cut(
+    pcm: bytes, start: int, sample_rate: int = SAMPLE_RATE
+) -> Optional[int]:
+    """
+    Find where to cut 16-bit mono PCM audio: the middle of its longest silence after start.
+
+    Args:
+        pcm (bytes): Little-endian 16-bit samples.
+        start (int): Byte offset from which silences are considered.
+        sample_rate (int): Sample rate of the audio.
+
+    Returns:
+        Optional[int]: Byte offset of the cut, or None if no silence of at least
+            MIN_SILENCE_SECONDS follows start.
+    """
+    import numpy as np
+
+    samples = np.frombuffer(pcm, dtype="<i2")
+    frame = max(1, int(VAD_FRAME_SECONDS * sample_rate))
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    frames = samples[: count * frame].reshape(count, frame).astype(np.float64)
+    rms = np.sqrt(np.mean(frames**2, axis=1))
+    threshold = max(MIN_SILENCE_RMS, SILENCE_RATIO * float(np.median(rms)))
+
+    first = -(-start // 2 // frame)
+    silent = np.concatenate(([False], rms[first:] < threshold, [False]))
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    if len(run_starts) == 0:
+        return None
+    longest = int(np.argmax(run_ends - run_starts))
+    if (
+        run_ends[longest] - run_starts[longest]
+    ) * frame < MIN_SILENCE_SECONDS * sample_rate:
+        return None
+    middle = first + (run_starts[longest] + run_ends[longest]) // 2
+    return int(middle) * frame * 2
+
+
+def iter_audio_segments(
+    blocks: Iterable[bytes],
+    sample_rate: int = SAMPLE_RATE,
+    segment_seconds: Optional[float] = None,
+    max_segment_seconds: Optional[float] = None,
+) -> Iterator[Tuple[float, bytes]]:
+    """
+    Split 16-bit mono PCM audio into segments that end in silences.
+
+    Only the audio of the segment being cut is buffered, so long recordings are split as
+    they are decoded.
+
+    Args:
+        blocks (Iterable[bytes]): Blocks of little-endian 16-bit samples.
+        sample_rate (int): Sample rate of the audio.
+        segment_seconds (Optional[float]): Minimum length of a segment, except for the
+            last one; defaults to SEGMENT_SECONDS.
+        max_segment_seconds (Optional[float]): Maximum length of a segment; defaults to
+            MAX_SEGMENT_SECONDS.
+
+    Yields:
+        Tuple[float, bytes]: Start of each segment in seconds, and its samples.
+    """
+    min_bytes = int((segment_seconds or SEGMENT_SECONDS) * sample_rate) * 2
+    max_seconds = max_segment_seconds or MAX_SEGMENT_SECONDS
+    max_bytes = max(min_bytes, int(max_seconds * sample_rate) * 2)
+    buffer = bytearray()
+    offset = 0
+    for block in blocks:
+        buffer.extend(block)
+        while len(buffer) >= max_bytes:
+            head = bytes(buffer[:max_bytes])
+            cut = find_silence_cut(head, min_bytes, sample_rate) or max_bytes
+            yield offset / sample_rate, head[:cut]
+            del buffer[:cut]
+            offset += cut // 2
+    if buffer:
+        yield offset / sample_rate, bytes(buffer)
+
+
+_segment_pools: Dict[Tuple[str, int], Any] = {}
+_segment_pools_lock = threading.Lock()
+
+
+def _load_segment_model(model_path: Optional[str]) -> None:
+    """
+    Load the Vosk model when a worker process of a segment pool starts.
+    """
+    get_transcription_service(model_path).model
+
+
+def get_segment_pool(max_workers: int, model_path: Optional[str] = None) -> Any:
+    """
+    Return the process pool recognizing audio segments for a model configuration.
+
+    The pool is created on the first call and reused by later videos, so its workers load
+    the model once when they start rather than once per video.
+
+    Args:
+        max_workers (int): Number of worker processes.
+        model_path (Optional[str]): Candidate model directories separated by os.pathsep;
+            defaults to MODEL_PATH.
+
+    Returns:
+        Any: The ProcessPoolExecutor of the configuration.
+    """
+    key = (model_path or MODEL_PATH, max_workers)
+    with _segment_pools_lock:
+        if key not in _segment_pools:
+            _segment_pools[key] = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=worker_context(),
+                initializer=_load_segment_model,
+                initargs=(model_path,),
+            )
+        return _segment_pools[key]
+
+
+def shutdown_segment_pools() -> None:
+    """
+    Stop the worker processes of every segment pool.
+    """
+    with _segment_pools_lock:
+        pools = list(_segment_pools.values())
+        _segment_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_segment_pool(pool: Any) -> None:
+    """
+    Forget a pool whose workers died, so the next video starts a new one.
+    """
+    with _segment_pools_lock:
+        for key, known in list(_segment_pools.items()):
+            if known is pool:
+                del _segment_pools[key]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _recognize_segment(
+    pcm: bytes, sample_rate: int, model_path: Optional[str]
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Recognize one audio segment with the transcription service of the worker process.
+    """
+    blocks = (
+        pcm[i : i + FRAMES_PER_READ * 2]
+        for i in range(0, len(pcm), FRAMES_PER_READ * 2)
+    )
+    return get_transcription_service(model_path).recognize(blocks, sample_rate)
+
+
+def transcribe_media(
+    file_path: str,
+    max_workers: Optional[int] = None,
+    model_path: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Transcribe the audio track of a media file, in parallel segments for long audio.
+
+    With several workers, the decoded audio is split at silences into segments of about
+    SEGMENT_SECONDS, the segments are recognized concurrently by a persistent process pool
+    (see get_segment_pool), and the words are stitched back with timestamps shifted to the start
+    of their segment. At most two segments per worker are held in memory.
+
+    Args:
+        file_path (str): Path to the video or audio file.
+        max_workers (Optional[int]): Number of worker processes; defaults to the number of
+            CPUs. With 1 worker, the audio is streamed through a single recognizer.
+        model_path (Optional[str]): Candidate model directories separated by os.pathsep;
+            defaults to MODEL_PATH.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], str]: The recognized words ("word", "start" and "end"
+            in seconds from the start of the file) and the recognized text.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1:
+        return get_transcription_service(model_path).transcribe_file(file_path)
+    # Fail before decoding anything when no model is installed
+    resolve_model_path(model_path)
+
+    words: List[Dict[str, Any]] = []
+    texts: List[str] = []
+
+    def collect(offset: float, future: Any) -> None:
+        segment_words, segment_text = future.result()
+        for word in segment_words:
+            word = dict(word)
+            word["start"] = word.get("start", 0) + offset
+            word["end"] = word.get("end", 0) + offset
+            words.append(word)
+        if segment_text:
+            texts.append(segment_text)
+
+    executor = get_segment_pool(max_workers, model_path)
+    pending: deque = deque()
+    try:
+        with closing(decode_audio_pcm(file_path)) as blocks:
+            for offset, pcm in iter_audio_segments(blocks):
+                pending.append(
+                    (
+                        offset,
+                        executor.submit(
+                            _recognize_segment, pcm, SAMPLE_RATE, model_path
+                        ),
+                    )
+                )
+                while len(pending) >= 2 * max_workers:
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+    except BrokenExecutor:
+        _discard_segment_pool(executor)
+        raise
+    finally:
+        # Segments of a failed video must not keep the shared workers busy
+        for _, future in pending:
+            future.cancel()
+    return words, " ".join(texts)
@@ -8,32 +8,68 @@ Key Responsibilities:
 - Extract audio from video files and transcribe it to text.
 - Extract metadata from video files for indexing.
 - Use speech-to-text libraries (whisper) for transcription.
+- Transcribe through the process-wide TranscriptionService, so the Vosk model is loaded
+  once per process rather than once per video.
+- Stream the audio from ffmpeg into the recognizer without temporary WAV files.
+- Transcribe long videos in segments split at silences across a process pool.
+- Store word timings as compact columns and index the transcript as phrases.
+- Reuse the transcript of a video with the same content from the content cache.
 - Ensure all processing is local and privacy-respecting.
 
 Dependencies:
 - whisper: For local speech-to-text transcription of video audio.
-- moviepy: For extracting audio from video files.
+- moviepy: For reading video metadata with ffmpeg.
+- ffmpeg: For decoding the audio track on a pipe.
 """
 
 import os
-from typing import Dict, List, Any
-import vosk
-import wave
-import json
-from moviepy.editor import VideoFileClip
-import tempfile
+import multiprocessing
+from typing import Dict, List, Any, Optional
 
+from .cache import ContentCache
+from .manifest import compute_file_hash
+from .parallel import find_files, ingest_files
+from .transcript import build_transcript
+from .transcription import SEGMENT_SECONDS, resolve_model_path, transcribe_media
 
-def ingest_video_file(file_path: str) -> Dict[str, Any]:
+# Bump when the extracted content or metadata changes so the ingestion manifest
+# re-ingests files processed by older versions
+INGESTOR_VERSION = "3"
+
+SUPPORTED_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")
+
+# Recognized words are cached per model; bump when the recognition itself changes (not
+# just how transcripts are stored, which INGESTOR_VERSION covers)
+CACHE_NAMESPACE = "transcripts-v1"
+
+
+def ingest_video_file(
+    file_path: str, segment_workers: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Ingest a single video file and extract its audio transcript and metadata.
 
+    The audio is decoded by ffmpeg to 16 kHz mono PCM on a pipe and fed to the recognizer
+    as it is decoded, so transcription starts right away and no audio is written to disk.
+    Videos longer than two segments are split at silences and their segments transcribed
+    in parallel. The recognized words are cached by the content of the video and the
+    model, so a video that is moved, renamed or touched is not transcribed again.
+
     Args:
         file_path (str): Path to the video file.
+        segment_workers (Optional[int]): Number of processes transcribing the segments of
+            the video. Defaults to the number of CPUs, or to 1 when called from a worker
+            process that is already ingesting files in parallel.
 
     Returns:
-        Dict[str, Any]: Dictionary containing metadata and transcribed content.
+        Dict[str, Any]: Dictionary containing metadata and the transcript, one phrase per
+            line, with the word timings ("words") and phrase records ("phrases") built by
+            build_transcript.
     """
+    # Imported on first use: loading moviepy takes longer than everything else in the
+    # ingestion package
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
     file_name = os.path.basename(file_path)
     file_extension = os.path.splitext(file_path)[1].lower()
     metadata = {
@@ -48,254 +84,89 @@ def ingest_video_file(file_path: str) -> Dict[str, Any]:
         "resource_type": "video",
     }
 
-    # Extract audio and metadata from video
-    audio_path = None
+    # Read the video metadata from the container headers, without decoding frames
     try:
-        video = VideoFileClip(file_path)
-        metadata["duration_seconds"] = video.duration
-        metadata["resolution"] = f"{video.w}x{video.h}"
-        metadata["fps"] = video.fps
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
-            audio_path = temp_audio.name
-            video.audio.write_audiofile(
-                audio_path, codec="pcm_s16le", verbose=False, logger=None
-            )
-        video.close()
+        infos = ffmpeg_parse_infos(file_path)
+        metadata["duration_seconds"] = infos.get("duration", 0)
+        if infos.get("video_size"):
+            width, height = infos["video_size"]
+            metadata["resolution"] = f"{width}x{height}"
+        metadata["fps"] = infos.get("video_fps", 0)
+        if not infos.get("audio_found"):
+            raise ValueError("the video has no audio track")
     except Exception as e:
         print(f"Error extracting audio from video {file_path}: {e}")
-        if audio_path and os.path.exists(audio_path):
-            if not delete_temp_file_with_retry(audio_path):
-                print(
-                    f"Warning: Could not delete temporary file {audio_path} after multiple attempts."
-                )
         metadata["error"] = "Failed to extract audio from video"
         return {"metadata": metadata, "content": "", "processed_content": ""}
 
-    # Transcribe audio using Vosk
+    if segment_workers is None:
+        segment_workers = 1 if multiprocessing.parent_process() else os.cpu_count()
+    # Short videos gain nothing from being split
+    if (metadata["duration_seconds"] or 0) < 2 * SEGMENT_SECONDS:
+        segment_workers = 1
+
+    # Transcribe the audio with the process-wide Vosk model while ffmpeg decodes it
+    words: List[Dict[str, Any]] = []
     content = ""
     try:
-        # Ensure the audio is in WAV format with correct parameters for Vosk
-        wf = wave.open(audio_path, "rb")
-        if (
-            wf.getnchannels() != 1
-            or wf.getsampwidth() != 2
-            or wf.getframerate() not in [16000, 44100]
-        ):
-            print(f"Audio format not supported for {file_path}. Converting...")
-            wf.close()
-            converted_audio_path = convert_audio_format(audio_path)
-            if converted_audio_path:
-                if audio_path and os.path.exists(audio_path):
-                    if not delete_temp_file_with_retry(audio_path):
-                        print(
-                            f"Warning: Could not delete temporary file {audio_path} after multiple attempts."
-                        )
-                audio_path = converted_audio_path
-                wf = wave.open(audio_path, "rb")
-            else:
-                wf.close()
-                raise ValueError(
-                    "Audio conversion failed, format not supported for Vosk"
-                )
-
-        # Initialize Vosk model (check for model in a default or user-specified path)
-        model_path = os.environ.get(
-            "VOSK_MODEL_PATH", "./vosk-model-small-pt-0.3"
-        )  # Default to a lightweight Portuguese model in the workspace root
-        if not os.path.exists(model_path):
-            print(
-                f"Error: Vosk model not found at {model_path}. For this Adaptive Learning System with Brazilian Portuguese content, I recommend 'vosk-model-pt-fb-v0.1.1-20220516_2113' for higher accuracy or 'vosk-model-small-pt-0.3' for lower resource usage. Ensure the model folder is in the workspace root or set the correct path in video_ingestor.py or as an environment variable 'VOSK_MODEL_PATH'. Download from https://alphacephei.com/vosk/models if needed."
-            )
-            raise FileNotFoundError(
-                f"Vosk model not found at {model_path}. Please update model_path in video_ingestor.py or set the environment variable 'VOSK_MODEL_PATH' with the correct path to a Vosk model."
-            )
-
-        # Test loading the alternative model for higher accuracy
-        try:
-            alt_model_path = "./vosk-model-pt-fb-v0.1.1-20220516_2113"
-            if os.path.exists(alt_model_path):
-                print(
-                    f"Attempting to load alternative model from {alt_model_path} for testing..."
-                )
-                alt_model = vosk.Model(alt_model_path)
-                print(f"Successfully loaded alternative model from {alt_model_path}.")
-                model = alt_model
-            else:
-                print(
-                    f"Alternative model path {alt_model_path} not found, using default model."
-                )
-                model = vosk.Model(model_path)
-        except Exception as alt_error:
-            print(f"Error loading alternative model from {alt_model_path}: {alt_error}")
-            print(f"Falling back to default model at {model_path}.")
-            model = vosk.Model(model_path)
-
-        rec = vosk.KaldiRecognizer(model, wf.getframerate())
-        rec.SetWords(True)
-
-        # Process audio
-        segments = []
-        while True:
-            data = wf.readframes(4000)
-            if len(data) == 0:
-                break
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                if "result" in result:
-                    for word in result["result"]:
-                        start = word.get("start", 0)
-                        end = word.get("end", 0)
-                        text = word.get("word", "")
-                        segments.append(f"[{start:.1f}s - {end:.1f}s]: {text}")
-                content += result.get("text", "") + " "
-            else:
-                partial = json.loads(rec.PartialResult())
-                content += partial.get("partial", "") + " "
-
-        if segments:
-            content = "\n".join(segments)
+        model_name = os.path.basename(os.path.normpath(resolve_model_path()))
+        cache = ContentCache(namespace=f"{CACHE_NAMESPACE}-{model_name}")
+        file_hash = compute_file_hash(file_path)
+        cached = cache.get(file_hash, "transcript")
+        if cached is not None:
+            words, content = cached["words"], cached["text"]
+            metadata["transcript_cached"] = True
+        else:
+            words, content = transcribe_media(file_path, max_workers=segment_workers)
+            if words or content:
+                cache.put(file_hash, "transcript", {"words": words, "text": content})
         metadata["language"] = (
             "unknown"  # Vosk does not provide language detection by default
         )
     except Exception as e:
         print(f"Error transcribing audio from {file_path}: {e}")
-    finally:
-        if audio_path and os.path.exists(audio_path):
-            if not delete_temp_file_with_retry(audio_path):
-                print(
-                    f"Warning: Could not delete temporary file {audio_path} after multiple attempts."
-                )
 
-    if not content:
+    if not words and not content:
         print(f"Warning: No transcription extracted from {file_path}")
         metadata["error"] = "No transcription extracted from video"
         return {"metadata": metadata, "content": "", "processed_content": ""}
-
-    return {"metadata": metadata, "content": content, "processed_content": content}
-
-
-def delete_temp_file_with_retry(
-    file_path: str, max_retries: int = 5, delay: float = 0.5
-) -> bool:
-    """
-    Attempt to delete a temporary file with retries to handle access conflicts.
-
-    Args:
-        file_path (str): Path to the file to delete.
-        max_retries (int): Maximum number of deletion attempts.
-        delay (float): Delay in seconds between attempts.
-
-    Returns:
-        bool: True if deletion was successful, False otherwise.
-    """
-    import time
-
-    for attempt in range(max_retries):
-        try:
-            os.remove(file_path)
-            return True
-        except Exception:
-            if attempt < max_retries - 1:
-                time.sleep(delay)
-    return False
-
-
-def convert_audio_format(input_path: str) -> str:
-    """
-    Convert audio file to mono, 16-bit, 16000 Hz WAV format for Vosk compatibility.
-    Attempts to use ffmpeg directly, falls back to moviepy if ffmpeg is not available.
-
-    Args:
-        input_path (str): Path to the input audio file.
-
-    Returns:
-        str: Path to the converted audio file, or empty string if conversion fails.
-    """
-    import subprocess
-    import tempfile
-    from moviepy.editor import AudioFileClip
-
-    # First attempt with ffmpeg if available
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            output_path = temp_file.name
-
-        command = [
-            "ffmpeg",
-            "-i",
-            input_path,
-            "-ac",
-            "1",  # Mono
-            "-ar",
-            "16000",  # Sample rate 16000 Hz
-            "-acodec",
-            "pcm_s16le",  # 16-bit PCM
-            "-y",  # Overwrite output if exists
-            output_path,
-        ]
-        subprocess.run(
-            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
-        )
-        if os.path.exists(output_path):
-            return output_path
-        else:
-            print("Error: Converted audio file not created with ffmpeg.")
-    except subprocess.CalledProcessError as e:
-        print(f"Error converting audio format with ffmpeg: {e.stderr.decode()}")
-    except FileNotFoundError:
-        print(
-            "Error: ffmpeg not found on system. Falling back to moviepy for conversion."
-        )
-    except Exception as e:
-        print(f"Error converting audio format with ffmpeg: {e}")
-
-    # Fallback to moviepy if ffmpeg direct call fails
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            output_path = temp_file.name
-
-        audio = AudioFileClip(input_path)
-        audio.write_audiofile(
-            output_path,
-            codec="pcm_s16le",
-            fps=16000,
-            nbytes=2,  # 16-bit
-            verbose=False,
-            logger=None,
-        )
-        audio.close()
-        if os.path.exists(output_path):
-            return output_path
-        else:
-            print("Error: Converted audio file not created with moviepy.")
-            return ""
-    except Exception as e:
-        print(f"Error converting audio format with moviepy: {e}")
-        return ""
+    if not words:
+        # The model did not report word timings, so only the text can be stored
+        return {"metadata": metadata, "content": content, "processed_content": content}
+
+    # Word timings are stored as columns, and the phrase text is what gets indexed
+    content, columns, phrases = build_transcript(words)
+    metadata["word_count"] = len(columns["ids"])
+    return {
+        "metadata": metadata,
+        "content": content,
+        "processed_content": content,
+        "words": columns,
+        "phrases": phrases,
+    }
 
 
-def ingest_video_directory(directory_path: str) -> List[Dict[str, Any]]:
+def ingest_video_directory(
+    directory_path: str, max_workers: int = 1, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Ingest all video files in a directory and its subdirectories.
 
     Args:
         directory_path (str): Path to the directory containing video files.
+        max_workers (int): Number of worker processes; 1 ingests files sequentially.
+        timeout (Optional[float]): Seconds after which a file is abandoned.
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries with metadata and content for each file.
     """
-    video_data = []
-    supported_extensions = (".mp4", ".avi", ".mkv", ".mov")
-
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith(supported_extensions):
-                file_path = os.path.join(root, file)
-                data = ingest_video_file(file_path)
-                if data:
-                    video_data.append(data)
-
-    return video_data
+    return ingest_files(
+        find_files(directory_path, SUPPORTED_EXTENSIONS),
+        ingest_video_file,
+        "video",
+        max_workers=max_workers,
+        timeout=timeout,
+    )
 
 
 if __name__ == "__main__":
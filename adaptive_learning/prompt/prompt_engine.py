@@ -11,13 +11,162 @@ conversation context and adapting responses based on user feedback.
 
 from typing import Dict, List, Optional, Any
 import logging
+import re
 
 from ..content_generation.content_generator import ContentGenerator
+from ..indexing.fuzzy import FuzzyMatcher
+from ..indexing.keyword_index import query_snippet
 
 # Configure logging for the prompt engine
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Characters of a retrieved resource passed on for summarizing: the window of its content
+# that best matches the topic, rather than the whole document
+CONTENT_SNIPPET_WINDOW = 1000
+
+# Topic lexicon: learner vocabulary (Portuguese and English) for each programming topic
+PROGRAMMING_TOPICS: Dict[str, List[str]] = {
+    "control_structures": [
+        "loop",
+        "loops",
+        "laço",
+        "while",
+        "for",
+        "if",
+        "else",
+        "condicional",
+        "switch",
+        "case",
+        "repetição",
+    ],
+    "functions": [
+        "função",
+        "function",
+        "método",
+        "method",
+        "procedimento",
+        "chamar",
+        "retornar",
+        "return",
+    ],
+    "variables": [
+        "variável",
+        "variable",
+        "valor",
+        "atribuir",
+        "declarar",
+        "constante",
+        "const",
+        "let",
+        "var",
+    ],
+    "data_structures": [
+        "array",
+        "lista",
+        "objeto",
+        "dicionário",
+        "dictionary",
+        "tupla",
+        "tuple",
+        "set",
+        "estrutura",
+        "dados",
+    ],
+    "oop": [
+        "classe",
+        "class",
+        "objeto",
+        "herança",
+        "inheritance",
+        "polimorfismo",
+        "encapsulamento",
+        "instância",
+    ],
+    "algorithms": [
+        "algoritmo",
+        "algorithm",
+        "ordenar",
+        "sort",
+        "buscar",
+        "search",
+        "recursão",
+        "recursion",
+        "complexidade",
+    ],
+    "coding": [
+        "programação",
+        "coding",
+        "código",
+        "code",
+        "escrever código",
+        "programar",
+        "desenvolvimento",
+    ],
+    "html": [
+        "html",
+        "html5",
+        "web",
+        "página",
+        "site",
+        "estrutura web",
+        "markup",
+        "tags",
+        "hipertexto",
+    ],
+}
+
+# Largest number of edits tolerated when matching learner words against the topic lexicon,
+# by word length. Short words only match when they differ in accents alone.
+TOPIC_EDIT_DISTANCES = ((4, 0), (7, 1))
+TOPIC_MAX_EDIT_DISTANCE = 2
+
+_topic_matcher: Optional[FuzzyMatcher] = None
+
+
+def topic_lexicon() -> List[str]:
+    """
+    Return every term of the topic lexicon once, in lexicon order.
+
+    Returns:
+        List[str]: Terms of PROGRAMMING_TOPICS.
+    """
+    return list(
+        dict.fromkeys(term for terms in PROGRAMMING_TOPICS.values() for term in terms)
+    )
+
+
+def match_topic_terms(user_input: str) -> List[str]:
+    """
+    Resolve misspelled or unaccented words of a learner's input to topic lexicon terms.
+
+    Args:
+        user_input (str): The user's input.
+
+    Returns:
+        List[str]: Lexicon terms matched by words that are not lexicon terms themselves
+            (e.g. "funcao" -> "função", "loopes" -> "loops").
+    """
+    global _topic_matcher
+    if _topic_matcher is None:
+        _topic_matcher = FuzzyMatcher(
+            {term: 1 for term in topic_lexicon() if " " not in term},
+            TOPIC_MAX_EDIT_DISTANCE,
+        )
+    matched = []
+    for word in re.findall(r"\w+", user_input.lower()):
+        if word in _topic_matcher.frequencies:
+            continue
+        distance = TOPIC_MAX_EDIT_DISTANCE
+        for max_length, max_distance in TOPIC_EDIT_DISTANCES:
+            if len(word) <= max_length:
+                distance = max_distance
+                break
+        matches = _topic_matcher.lookup(word, distance)
+        if matches:
+            matched.append(matches[0][0])
+    return matched
+
 
 class PromptEngine:
     """
@@ -53,6 +202,9 @@ class PromptEngine:
             index_manager (Any): An instance of IndexManager to query indexed resources.
         """
         self.indexed_data = index_manager
+        # Offer the topic lexicon as type-ahead suggestions alongside the indexed terms
+        if hasattr(index_manager, "set_suggestion_terms"):
+            index_manager.set_suggestion_terms(topic_lexicon())
         # Do not instantiate ContentGenerator here; it should be set externally
         logger.info("IndexManager set for PromptEngine.")
 
@@ -176,107 +328,19 @@ class PromptEngine:
             topic_scores["project_development"] += 2
             logger.info("Identified interest in project or application development.")
 
-        # Expanded list of specific programming topics with categorization
-        programming_topics = {
-            "control_structures": [
-                "loop",
-                "loops",
-                "laço",
-                "while",
-                "for",
-                "if",
-                "else",
-                "condicional",
-                "switch",
-                "case",
-                "repetição",
-            ],
-            "functions": [
-                "função",
-                "function",
-                "método",
-                "method",
-                "procedimento",
-                "chamar",
-                "retornar",
-                "return",
-            ],
-            "variables": [
-                "variável",
-                "variable",
-                "valor",
-                "atribuir",
-                "declarar",
-                "constante",
-                "const",
-                "let",
-                "var",
-            ],
-            "data_structures": [
-                "array",
-                "lista",
-                "objeto",
-                "dicionário",
-                "dictionary",
-                "tupla",
-                "tuple",
-                "set",
-                "estrutura",
-                "dados",
-            ],
-            "oop": [
-                "classe",
-                "class",
-                "objeto",
-                "herança",
-                "inheritance",
-                "polimorfismo",
-                "encapsulamento",
-                "instância",
-            ],
-            "algorithms": [
-                "algoritmo",
-                "algorithm",
-                "ordenar",
-                "sort",
-                "buscar",
-                "search",
-                "recursão",
-                "recursion",
-                "complexidade",
-            ],
-            "coding": [
-                "programação",
-                "coding",
-                "código",
-                "code",
-                "escrever código",
-                "programar",
-                "desenvolvimento",
-            ],
-            "html": [
-                "html",
-                "html5",
-                "web",
-                "página",
-                "site",
-                "estrutura web",
-                "markup",
-                "tags",
-                "hipertexto",
-            ],
-        }
-
-        # Score specific topics
-        for category, terms in programming_topics.items():
-            if any(term in user_input_lower for term in terms):
+        # Score specific topics; misspelled or unaccented words count as the term they resolve to
+        corrected_terms = match_topic_terms(user_input_lower)
+        for category, terms in PROGRAMMING_TOPICS.items():
+            if any(term in user_input_lower for term in terms) or any(
+                term in terms for term in corrected_terms
+            ):
                 if category not in topic_scores:
                     topic_scores[category] = 0
                 topic_scores[category] += 3  # Higher weight for specific topics
                 logger.info(f"Identified specific topic category: {category}")
 
         # Direct topic match for single-word inputs or clear topic references
-        for category in programming_topics.keys():
+        for category in PROGRAMMING_TOPICS.keys():
             if user_input_lower.strip() == category.lower():
                 if category not in topic_scores:
                     topic_scores[category] = 0
@@ -295,7 +359,7 @@ class PromptEngine:
                     token.pos_ in ["NOUN", "PROPN"]
                     and token.text.lower() in user_input_lower
                 ):
-                    for category, terms in programming_topics.items():
+                    for category, terms in PROGRAMMING_TOPICS.items():
                         if token.text.lower() in terms:
                             if category not in topic_scores:
                                 topic_scores[category] = 0
@@ -452,8 +516,12 @@ class PromptEngine:
         except Exception as e:
             logger.warning(f"Semantic search failed for {topic}: {str(e)}")
 
+        # Keyword search tolerant to misspellings when the index supports it
+        search_by_keyword = getattr(
+            self.indexed_data, "search_fuzzy", self.indexed_data.search_by_keyword
+        )
         if not results:
-            results = self.indexed_data.search_by_keyword(topic)
+            results = search_by_keyword(topic)
             logger.info(
                 f"Performed keyword search for topic: {topic}, found {len(results)} results."
             )
@@ -464,13 +532,7 @@ class PromptEngine:
                 content = resource.get("content", None)
                 if content and content != "Content not available.":
                     logger.info(f"Retrieved content for topic: {topic}")
-                    return {
-                        "title": resource["metadata"].get("file_name", "Untitled"),
-                        "type": resource["metadata"]
-                        .get("file_type", "text")
-                        .lstrip("."),
-                        "content": content,
-                    }
+                    return self._content_from_resource(resource, topic)
             logger.warning(f"Content is empty or unavailable for topic: {topic}")
             # If no valid content found in results, proceed to fallback
 
@@ -576,7 +638,7 @@ class PromptEngine:
 
         # Iterate through fallback topics to find any relevant content
         for fallback in fallback_topics:
-            results = self.indexed_data.search_by_keyword(fallback)
+            results = search_by_keyword(fallback)
             logger.info(
                 f"Fallback search for '{fallback}' returned {len(results)} results."
             )
@@ -585,18 +647,44 @@ class PromptEngine:
                     content = resource.get("content", None)
                     if content and content != "Content not available.":
                         logger.info(f"Retrieved fallback content using: {fallback}")
-                        return {
-                            "title": resource["metadata"].get("file_name", "Untitled"),
-                            "type": resource["metadata"]
-                            .get("file_type", "text")
-                            .lstrip("."),
-                            "content": content,
-                        }
+                        return self._content_from_resource(resource, fallback)
         logger.warning(
             f"No fallback content found for topic: {topic} after trying all fallbacks."
         )
         return None
 
+    def _content_from_resource(
+        self, resource: Dict[str, Any], topic: str
+    ) -> Dict[str, Any]:
+        """
+        Build the content details returned for a retrieved resource.
+
+        Only the window of the content that best matches the topic is kept, so whole
+        documents are not passed around. Records with typed fields (such as the exercises
+        of a bank) carry their name, so the content does not have to be parsed again to
+        summarize it.
+
+        Args:
+            resource (Dict[str, Any]): The indexed resource.
+            topic (str): The topic the resource was retrieved for.
+
+        Returns:
+            Dict[str, Any]: Title, type, content snippet and, when known, name of the
+                resource.
+        """
+        metadata = resource["metadata"]
+        snippet = query_snippet(
+            resource["content"], topic.replace("_", " "), CONTENT_SNIPPET_WINDOW
+        )
+        content = {
+            "title": metadata.get("file_name", "Untitled"),
+            "type": metadata.get("file_type", "text").lstrip("."),
+            "content": snippet["text"],
+        }
+        if metadata.get("name"):
+            content["name"] = metadata["name"]
+        return content
+
     def adapt_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """
         Adapt the retrieved content to the user's preferred format and complexity level.
@@ -613,7 +701,7 @@ class PromptEngine:
         logger.info(f"Adapting content for topic: {topic}")
 
         # Attempt to summarize content using local NLP processing with spaCy
-        summary = self._summarize_content(raw_content, topic)
+        summary = self._summarize_content(raw_content, topic, content.get("name"))
         if summary:
             content["content"] = summary
         else:
@@ -624,7 +712,9 @@ class PromptEngine:
 
         return content
 
-    def _summarize_content(self, raw_content: str, topic: str) -> Optional[str]:
+    def _summarize_content(
+        self, raw_content: str, topic: str, name: Optional[str] = None
+    ) -> Optional[str]:
         """
         Summarize raw content using local NLP tools like spaCy to extract key insights.
         Ensures responses are concise (max 50 words) and focus on wisdom.
@@ -632,28 +722,32 @@ class PromptEngine:
         Args:
             raw_content (str): The raw content to summarize.
             topic (str): The topic of the content.
+            name (Optional[str]): Name of the resource when indexed with typed fields.
 
         Returns:
             Optional[str]: A summarized paragraph if successful, otherwise None.
         """
+        if name:
+            return f"Este recurso sobre {topic} aborda '{name}'. É um material útil para aprender. Quer saber mais detalhes?"
         try:
             import spacy
             import json
 
-            # Check if content is JSON format (common in exercise data)
-            try:
-                data = json.loads(raw_content)
-                # Extract meaningful fields if available
-                name = data.get("name", "")
-                title = data.get("title", "")
-                desc = data.get("description", "")
-                key_info = name or title or desc
-                if key_info:
-                    summary = f"Este recurso sobre {topic} aborda '{key_info}'. É um material útil para aprender. Quer saber mais detalhes?"
-                    logger.info(f"Extracted summary from JSON content for {topic}.")
-                    return summary
-            except json.JSONDecodeError:
-                pass  # Not JSON, proceed with text summarization
+            # JSON documents indexed whole (exercise data from older index versions)
+            if raw_content.lstrip().startswith("{"):
+                try:
+                    data = json.loads(raw_content)
+                    # Extract meaningful fields if available
+                    name = data.get("name", "")
+                    title = data.get("title", "")
+                    desc = data.get("description", "")
+                    key_info = name or title or desc
+                    if key_info:
+                        summary = f"Este recurso sobre {topic} aborda '{key_info}'. É um material útil para aprender. Quer saber mais detalhes?"
+                        logger.info(f"Extracted summary from JSON content for {topic}.")
+                        return summary
+                except json.JSONDecodeError:
+                    pass  # Not JSON, proceed with text summarization
 
             nlp = spacy.load("en_core_web_sm")
             doc = nlp(raw_content[:1000])  # Limit to first 1000 chars for performance
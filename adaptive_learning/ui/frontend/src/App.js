@@ -30,6 +30,7 @@ function App() {
 
   const [messages, setMessages] = useState(loadMessages())
   const [input, setInput] = useState('')
+  const [suggestions, setSuggestions] = useState([])
   const [isLoading, setIsLoading] = useState(false)
   const [preferredFormat, setPreferredFormat] = useState(loadPreferredFormat())
   const [userId, setUserId] = useState(loadUserId())
@@ -57,6 +58,24 @@ function App() {
     localStorage.setItem('preferredFormat', preferredFormat)
   }, [preferredFormat])
 
+  // Type-ahead suggestions for the word being typed; stale requests are aborted
+  useEffect(() => {
+    const lastWord = input.split(/\s+/).pop()
+    if (lastWord.length < 2) {
+      setSuggestions([])
+      return
+    }
+    const controller = new AbortController()
+    fetch(`/api/suggest?q=${encodeURIComponent(lastWord)}&limit=8`, { signal: controller.signal })
+      .then((response) => response.json())
+      .then((data) => {
+        const head = input.slice(0, input.length - lastWord.length)
+        setSuggestions(data.suggestions.map((suggestion) => head + suggestion))
+      })
+      .catch(() => {})
+    return () => controller.abort()
+  }, [input])
+
   const sendMessage = async () => {
     if (!input.trim()) return
 
@@ -201,7 +220,13 @@ function App() {
           onChange={(e) => setInput(e.target.value)}
           onKeyPress={handleKeyPress}
           className="chat-input"
+          list="topic-suggestions"
         />
+        <datalist id="topic-suggestions">
+          {suggestions.map((suggestion) => (
+            <option key={suggestion} value={suggestion} />
+          ))}
+        </datalist>
         <button onClick={sendMessage} className="send-button">
           Enviar
         </button>
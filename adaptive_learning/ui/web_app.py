@@ -39,6 +39,21 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# IndexManager shared by the requests handled by this worker process
+_index_manager = None
+
+
+def get_index_manager():
+    global _index_manager
+    if _index_manager is None:
+        from adaptive_learning.indexing.index_manager import IndexManager
+
+        from adaptive_learning.prompt.prompt_engine import topic_lexicon
+
+        _index_manager = IndexManager()
+        _index_manager.set_suggestion_terms(topic_lexicon())
+    return _index_manager
+
 
 @app.post("/api/feedback")
 async def post_feedback(feedback_input: UserInput):
@@ -156,14 +171,13 @@ async def post_message(user_input: UserInput):
 
     try:
         from adaptive_learning.prompt.prompt_engine import PromptEngine
-        from adaptive_learning.indexing.index_manager import IndexManager
 
         # Session data is managed on the client side using localStorage
         # No need for server-side session storage
         session_data = {}
 
         engine = PromptEngine()
-        index_manager = IndexManager()
+        index_manager = get_index_manager()
         from adaptive_learning.content_generation.content_generator import (
             ContentGenerationFactory,
         )
@@ -206,3 +220,88 @@ async def post_message(user_input: UserInput):
         post_message.cache.popitem(last=False)  # Remove least recently used item
 
     return response_data
+
+
+@app.get("/api/search")
+async def search_resources(q: str, type: Optional[str] = None, window: int = 200):
+    logger.info(f"Received search request: {q}")
+    try:
+        results = get_index_manager().search_with_snippets(q, type, window)
+    except Exception as e:
+        logger.error(f"Error searching resources: {str(e)}")
+        results = []
+
+    # Only metadata needed to identify the resource and its snippet are returned
+    return {
+        "query": q,
+        "results": [
+            {
+                "file_name": result["metadata"].get("file_name", "unknown"),
+                "file_path": result["metadata"].get("file_path", ""),
+                "file_type": result["metadata"].get("file_type", ""),
+                "snippet": result["snippet"],
+            }
+            for result in results
+        ],
+    }
+
+
+@app.get("/api/search/time_ranges")
+async def search_time_ranges(q: str, file_path: Optional[str] = None):
+    logger.info(f"Received transcript search request: {q}")
+    try:
+        results = get_index_manager().search_time_ranges(q, file_path)
+    except Exception as e:
+        logger.error(f"Error searching transcripts: {str(e)}")
+        results = []
+
+    # Each range gives the seconds to deep-link into the video
+    return {
+        "query": q,
+        "results": [
+            {
+                "file_name": result["metadata"].get("file_name", "unknown"),
+                "file_path": result["metadata"].get("file_path", ""),
+                "ranges": result["ranges"],
+            }
+            for result in results
+        ],
+    }
+
+
+@app.get("/api/images/similar")
+async def search_similar_images(
+    file_path: str, max_distance: int = 12, limit: int = 10
+):
+    logger.info(f"Received similar image request: {file_path}")
+    try:
+        results = get_index_manager().search_similar_images(
+            file_path, max_distance=max_distance, limit=limit
+        )
+    except Exception as e:
+        logger.error(f"Error searching similar images: {str(e)}")
+        results = []
+
+    return {
+        "file_path": file_path,
+        "results": [
+            {
+                "file_name": result["metadata"].get("file_name", "unknown"),
+                "file_path": result["metadata"].get("file_path", ""),
+                "distance": result["distance"],
+                "duplicates": result["duplicates"],
+            }
+            for result in results
+        ],
+    }
+
+
+@app.get("/api/suggest")
+async def suggest_topics(q: str, limit: int = 8):
+    # Called on every keystroke, so only the cheap prefix lookup is done here
+    try:
+        suggestions = get_index_manager().suggest(q, limit)
+    except Exception as e:
+        logger.error(f"Error suggesting topics: {str(e)}")
+        suggestions = []
+    return {"query": q, "suggestions": suggestions}
@@ -0,0 +1,317 @@
+"""
+Index Manager Benchmark
+
+This script measures the indexing and retrieval operations of the IndexManager on
+reproducible synthetic corpora, so changes to the index can be compared across commits
+on corpora much larger than the files in resources/.
+
+Key Responsibilities:
+- Generate synthetic corpora of the requested sizes (1k to 1M documents).
+- Measure add_resource, save_index/load_index, search_by_keyword, search_by_similarity
+  and build_vector_index latency (p50/p95/p99), throughput and peak RSS.
+- Write the results as JSON tagged with the git commit, and compare against a baseline.
+
+Each corpus size runs in a fresh process so peak RSS is reported per size.
+
+Usage:
+    python benchmarks/bench_index_manager.py --sizes 1000 10000 100000
+    python benchmarks/bench_index_manager.py --sizes 1000000 --repeats 1
+    python benchmarks/bench_index_manager.py --compare benchmarks/results/baseline.json
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_corpus import SyntheticCorpus, HashingEmbedder  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Compute a percentile by linear interpolation between the closest ranks.
+
+    Args:
+        values (List[float]): Sample values.
+        fraction (float): Percentile as a fraction between 0 and 1.
+
+    Returns:
+        float: The interpolated percentile, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * fraction
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(latencies: List[float], items_per_call: int = 1) -> Dict[str, Any]:
+    """
+    Summarize latencies in milliseconds and derive the throughput.
+
+    Args:
+        latencies (List[float]): Latency of each call, in seconds.
+        items_per_call (int): Items processed by each call (e.g. documents per bulk add).
+
+    Returns:
+        Dict[str, Any]: Call count, p50/p95/p99/mean latency in ms and items per second.
+    """
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": total / len(latencies) * 1000 if latencies else 0.0,
+        "throughput_per_s": len(latencies) * items_per_call / total if total else 0.0,
+    }
+
+
+def timed(calls: List[Callable[[], Any]]) -> List[float]:
+    """
+    Run each call once and return its wall-clock latency in seconds.
+    """
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the current process in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def get_embedder(name: str) -> Any:
+    """
+    Create the embedder used for vector benchmarks.
+
+    Args:
+        name (str): 'hash' for the deterministic HashingEmbedder, or
+            'sentence-transformers' for the model used in production.
+
+    Returns:
+        Any: Embedding model with encode() and get_sentence_embedding_dimension().
+    """
+    if name == "hash":
+        return HashingEmbedder()
+    from adaptive_learning.indexing.index_manager import get_shared_embedder
+
+    return get_shared_embedder()
+
+
+def run_size(size: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run every benchmark on a corpus of the given size.
+
+    Args:
+        size (int): Number of documents in the corpus.
+        options (Dict[str, Any]): Benchmark options parsed from the command line.
+
+    Returns:
+        Dict[str, Any]: Results per operation plus corpus statistics and peak RSS.
+    """
+    from adaptive_learning.indexing.index_manager import IndexManager
+
+    corpus = SyntheticCorpus(options["seed"], options["doc_words"])
+    start = time.perf_counter()
+    documents = list(corpus.documents(size))
+    extra = list(corpus.documents(options["single_adds"], prefix="extra"))
+    queries = corpus.queries(options["queries"])
+    generation_s = time.perf_counter() - start
+
+    results: Dict[str, Any] = {
+        "documents": size,
+        "corpus_bytes": sum(d["metadata"]["size_bytes"] for d in documents),
+        "generation_s": generation_s,
+    }
+    repeats = options["repeats"]
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, "w") as devnull:
+        # The IndexManager reports every operation on stdout; keep it out of the timings
+        with contextlib.redirect_stdout(devnull):
+            manager = IndexManager(
+                os.path.join(temp_dir, "index.json"),
+                embedder=get_embedder(options["embedder"]),
+            )
+            results["add_resources_bulk"] = summarize(
+                timed([lambda: manager.add_resources(documents)]), size
+            )
+            results["add_resource"] = summarize(
+                timed([lambda d=d: manager.add_resource(d) for d in extra])
+            )
+            results["save_index"] = summarize(timed([manager.save_index] * repeats))
+            index_bytes = os.path.getsize(manager.index_file_path)
+            results["load_index"] = summarize(timed([manager.load_index] * repeats))
+            results["search_by_keyword"] = summarize(
+                timed([lambda q=q: manager.search_by_keyword(q) for q in queries])
+            )
+            results["search_with_snippets"] = summarize(
+                timed([lambda q=q: manager.search_with_snippets(q) for q in queries])
+            )
+            results["search_by_similarity"] = summarize(
+                timed([lambda q=q: manager.search_by_similarity(q) for q in queries])
+            )
+            results["build_vector_index"] = summarize(
+                timed([manager.build_vector_index] * repeats), len(manager.index_data)
+            )
+    results["index_bytes"] = index_bytes
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """
+    Return the short hash of the checked out commit, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """
+    Print the p50 latency of each operation relative to a baseline run.
+
+    Args:
+        current (Dict[str, Any]): Results of this run.
+        baseline (Dict[str, Any]): Results loaded from a previous JSON file.
+    """
+    print(
+        f"\nComparison with {baseline.get('commit')} "
+        f"(p50 ms, baseline -> current, ratio > 1 is slower):"
+    )
+    for size, operations in current["results"].items():
+        previous = baseline.get("results", {}).get(size)
+        if not previous:
+            print(f"  {size} documents: not in baseline")
+            continue
+        print(f"  {size} documents:")
+        for name, stats in operations.items():
+            if not isinstance(stats, dict) or name not in previous:
+                continue
+            before, after = previous[name]["p50_ms"], stats["p50_ms"]
+            ratio = after / before if before else float("inf")
+            print(f"    {name:<24} {before:10.3f} -> {after:10.3f}  x{ratio:.2f}")
+        print(
+            f"    {'peak_rss_mb':<24} {previous['peak_rss_mb']:10.1f} -> "
+            f"{operations['peak_rss_mb']:10.1f}"
+        )
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """
+    Print a compact table of the results of one corpus size.
+    """
+    print(
+        f"\n{results['documents']} documents "
+        f"(peak RSS {results['peak_rss_mb']:.1f} MiB, index {results['index_bytes']} bytes)"
+    )
+    print(f"  {'operation':<24} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'items/s':>12}")
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(
+                f"  {name:<24} {stats['p50_ms']:10.3f} {stats['p95_ms']:10.3f} "
+                f"{stats['p99_ms']:10.3f} {stats['throughput_per_s']:12.1f}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark the IndexManager.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Corpus sizes."
+    )
+    parser.add_argument("--queries", type=int, default=200, help="Queries per search.")
+    parser.add_argument(
+        "--single-adds", type=int, default=50, help="Single add_resource calls."
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Repeats of save/load/build."
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed.")
+    parser.add_argument(
+        "--doc-words", type=int, default=120, help="Average words per document."
+    )
+    parser.add_argument(
+        "--embedder",
+        choices=["hash", "sentence-transformers"],
+        default="hash",
+        help="Embedder for vector benchmarks.",
+    )
+    parser.add_argument("--output", help="Path of the JSON results file.")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against.")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    options = {
+        "seed": args.seed,
+        "doc_words": args.doc_words,
+        "queries": args.queries,
+        "single_adds": args.single_adds,
+        "repeats": args.repeats,
+        "embedder": args.embedder,
+    }
+    report: Dict[str, Any] = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "results": {},
+    }
+    for size in args.sizes:
+        # A fresh process per size keeps peak RSS from carrying over between sizes
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = executor.submit(run_size, size, options).result()
+        report["results"][str(size)] = results
+        print_results(results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nocommit'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved benchmark results to {output}.")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    main()
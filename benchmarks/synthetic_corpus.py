@@ -0,0 +1,186 @@
+"""
+Synthetic Corpus Module
+
+This module generates reproducible synthetic corpora for benchmarking the indexing and
+retrieval components of the Adaptive Learning System. Documents mix Portuguese and
+English programming vocabulary with a Zipf-like term distribution and use the same
+resource structure produced by the ingestion modules.
+
+Key Responsibilities:
+- Generate deterministic documents for a given seed and corpus size.
+- Produce query sets with frequent terms, rare terms, phrases and misses.
+- Provide a cheap deterministic embedder so vector benchmarks run without a model download.
+"""
+
+import random
+import zlib
+from typing import Dict, List, Any, Iterator
+
+PORTUGUESE_TERMS = [
+    "programação", "variável", "função", "laço", "repetição", "condicional",
+    "estrutura", "dados", "lista", "dicionário", "objeto", "classe", "herança",
+    "polimorfismo", "encapsulamento", "instância", "método", "algoritmo",
+    "ordenação", "busca", "recursão", "complexidade", "página", "navegador",
+    "servidor", "cliente", "requisição", "resposta", "banco", "consulta",
+    "tabela", "coluna", "registro", "arquivo", "diretório", "módulo", "pacote",
+    "biblioteca", "teste", "erro", "depuração", "exceção", "valor", "constante",
+    "parâmetro", "retorno", "compilador", "interpretador", "sintaxe", "semântica",
+    "acessibilidade", "marcação", "estilo", "formulário", "elemento", "atributo",
+    "projeto", "aplicação", "sistema", "desenvolvimento", "aprendizagem",
+    "exercício", "questão", "alternativa", "conteúdo", "unidade", "capítulo",
+]
+
+ENGLISH_TERMS = [
+    "programming", "variable", "function", "loop", "iteration", "conditional",
+    "structure", "data", "list", "dictionary", "object", "class", "inheritance",
+    "polymorphism", "encapsulation", "instance", "method", "algorithm", "sorting",
+    "search", "recursion", "complexity", "page", "browser", "server", "client",
+    "request", "response", "database", "query", "table", "column", "record",
+    "file", "directory", "module", "package", "library", "test", "error",
+    "debugging", "exception", "value", "constant", "parameter", "return",
+    "compiler", "interpreter", "syntax", "semantics", "html", "html5", "css",
+    "javascript", "python", "while", "for", "array", "tuple", "set", "stack",
+    "queue", "tree", "graph", "hash", "pointer", "thread", "process", "memory",
+]
+
+STOP_WORDS = {
+    "pt": ["o", "a", "de", "que", "e", "do", "da", "em", "um", "para", "com", "no"],
+    "en": ["the", "a", "of", "to", "and", "in", "is", "for", "on", "with", "as"],
+}
+
+FILE_TYPES = [(".txt", "text"), (".pdf", "pdf"), (".mp4", "video"), (".json", "text")]
+
+
+def _zipf_cumulative_weights(count: int) -> List[float]:
+    cumulative, total = [], 0.0
+    for rank in range(1, count + 1):
+        total += 1.0 / rank
+        cumulative.append(total)
+    return cumulative
+
+
+class SyntheticCorpus:
+    """
+    A reproducible generator of synthetic Portuguese/English learning resources.
+    """
+
+    def __init__(self, seed: int = 42, words_per_document: int = 120):
+        """
+        Initialize the generator.
+
+        Args:
+            seed (int): Seed for the pseudo-random generator; equal seeds give equal corpora.
+            words_per_document (int): Average number of words per document.
+        """
+        self.seed = seed
+        self.words_per_document = words_per_document
+        # Shuffle once per seed so term frequencies differ between seeds but not runs
+        shuffler = random.Random(seed)
+        self.vocabulary = {
+            "pt": shuffler.sample(PORTUGUESE_TERMS, len(PORTUGUESE_TERMS)),
+            "en": shuffler.sample(ENGLISH_TERMS, len(ENGLISH_TERMS)),
+        }
+        self.cumulative_weights = {
+            language: _zipf_cumulative_weights(len(terms))
+            for language, terms in self.vocabulary.items()
+        }
+
+    def documents(self, count: int, prefix: str = "doc") -> Iterator[Dict[str, Any]]:
+        """
+        Generate documents in the resource format produced by the ingestion modules.
+
+        Args:
+            count (int): Number of documents to generate.
+            prefix (str): Prefix for the generated file names.
+
+        Yields:
+            Dict[str, Any]: Resource with metadata, content and processed content.
+        """
+        rng = random.Random(f"{self.seed}-{prefix}")
+        for i in range(count):
+            language = "pt" if rng.random() < 0.7 else "en"
+            length = max(10, int(rng.gauss(self.words_per_document, 30)))
+            content = self._sentence_block(rng, language, length)
+            file_type, resource_type = FILE_TYPES[i % len(FILE_TYPES)]
+            file_name = f"{prefix}-{i:07d}{file_type}"
+            yield {
+                "metadata": {
+                    "file_name": file_name,
+                    "file_path": f"synthetic/{file_name}",
+                    "file_type": file_type,
+                    "size_bytes": len(content.encode("utf-8")),
+                    "last_modified": 1_600_000_000 + i,
+                    "resource_type": resource_type,
+                    "language": language,
+                },
+                "content": content,
+                "processed_content": content,
+            }
+
+    def queries(self, count: int) -> List[str]:
+        """
+        Generate a query set mixing frequent terms, rare terms, phrases and misses.
+
+        Args:
+            count (int): Number of queries.
+
+        Returns:
+            List[str]: Queries in a deterministic order.
+        """
+        rng = random.Random(f"{self.seed}-queries")
+        queries = []
+        for i in range(count):
+            language = "pt" if i % 2 == 0 else "en"
+            terms = self.vocabulary[language]
+            kind = i % 4
+            if kind == 0:
+                queries.append(rng.choice(terms[:10]))
+            elif kind == 1:
+                queries.append(rng.choice(terms[-20:]))
+            elif kind == 2:
+                queries.append(" ".join(rng.sample(terms[:15], 2)))
+            else:
+                queries.append(f"inexistente{rng.randint(0, 10**6)}")
+        return queries
+
+    def _sentence_block(self, rng: random.Random, language: str, length: int) -> str:
+        content_words = rng.choices(
+            self.vocabulary[language],
+            cum_weights=self.cumulative_weights[language],
+            k=length,
+        )
+        stop_words = STOP_WORDS[language]
+        words = []
+        for position in range(length):
+            if rng.random() < 0.35:
+                words.append(rng.choice(stop_words))
+            else:
+                words.append(content_words[position])
+            if position % 12 == 11:
+                words[-1] += "."
+        return " ".join(words).capitalize()
+
+
+class HashingEmbedder:
+    """
+    A deterministic bag-of-words embedder with the interface of SentenceTransformer.
+
+    Keeps vector benchmarks focused on the index instead of model inference.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: Any) -> Any:
+        import numpy as np
+
+        single = isinstance(texts, str)
+        batch = [texts] if single else texts
+        vectors = np.zeros((len(batch), self.dimension), dtype="float32")
+        for row, text in enumerate(batch):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode("utf-8")) % self.dimension] += 1.0
+        return vectors[0] if single else vectors
@@ -9,14 +9,14 @@ and provides options for command-line or web-based user interaction.
 import os
 import sys
 import logging
-from adaptive_learning.ingestion.text_ingestor import ingest_text_directory
-from adaptive_learning.ingestion.pdf_ingestor import ingest_pdf_directory
-from adaptive_learning.ingestion.video_ingestor import ingest_video_directory
-from adaptive_learning.ingestion.image_ingestor import ingest_image_directory
-from adaptive_learning.indexing.index_manager import (
-    build_index_from_resources,
-    IndexManager,
-)
+import threading
+from collections import Counter
+from adaptive_learning.ingestion import text_ingestor, pdf_ingestor, json_ingestor
+from adaptive_learning.ingestion import video_ingestor, image_ingestor
+from adaptive_learning.ingestion.manifest import IngestionManifest
+from adaptive_learning.ingestion.parallel import as_resources, ingest_files_parallel
+from adaptive_learning.indexing.index_manager import IndexManager
+from adaptive_learning.indexing.pipeline import stream_into_index
 
 # Configure logging for the main script
 logging.basicConfig(
@@ -24,93 +24,239 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Resource types with their subdirectory of 'resources', ingestor module and ingestion
+# function, the extensions accepted inside the subdirectory and those picked up from the
+# root of 'resources' when the subdirectory is missing or empty
+RESOURCE_TYPES = {
+    "text": {
+        "subdirectory": "text",
+        "ingestor": text_ingestor,
+        "ingest": text_ingestor.ingest_text_file,
+        "extensions": text_ingestor.SUPPORTED_EXTENSIONS,
+        "root_extensions": (".txt", ".json"),
+    },
+    "PDF": {
+        "subdirectory": "pdf",
+        "ingestor": pdf_ingestor,
+        "ingest": pdf_ingestor.ingest_pdf_pages,
+        "extensions": pdf_ingestor.SUPPORTED_EXTENSIONS,
+        "root_extensions": (".pdf",),
+    },
+    "video": {
+        "subdirectory": "video",
+        "ingestor": video_ingestor,
+        "ingest": video_ingestor.ingest_video_file,
+        "extensions": video_ingestor.SUPPORTED_EXTENSIONS,
+        "root_extensions": (".mp4", ".avi", ".mkv"),
+    },
+    "image": {
+        "subdirectory": "image",
+        "ingestor": image_ingestor,
+        "ingest": image_ingestor.ingest_image_file,
+        "extensions": image_ingestor.SUPPORTED_EXTENSIONS,
+        "root_extensions": (".jpg", ".jpeg", ".png", ".bmp"),
+    },
+}
+
+
+def find_resource_files(resources_dir: str) -> dict:
+    """
+    Find the resource files to ingest, mapped to their resource type.
+
+    Each type is read from its own subdirectory when it exists and is not empty, and from
+    the root of the resources directory otherwise.
+
+    Args:
+        resources_dir (str): Directory containing the resources.
+
+    Returns:
+        dict: File paths mapped to the name of their resource type.
+    """
+    files = {}
+    for resource_type, config in RESOURCE_TYPES.items():
+        type_dir = os.path.join(resources_dir, config["subdirectory"])
+        if os.path.exists(type_dir) and len(os.listdir(type_dir)) > 0:
+            for root, _, names in os.walk(type_dir):
+                for name in names:
+                    if name.lower().endswith(config["extensions"]):
+                        files[os.path.join(root, name)] = resource_type
+        else:
+            for name in os.listdir(resources_dir):
+                file_path = os.path.join(resources_dir, name)
+                if name.endswith(config["root_extensions"]) and os.path.isfile(
+                    file_path
+                ):
+                    files[file_path] = resource_type
+    return files
+
 
 def main():
     """
     Main function to ingest resources, build an index for the Adaptive Learning System,
     and start user interaction either via CLI or web UI.
+
+    Only files that are new or changed since the last start are ingested and embedded
+    again, and files removed from the resources directory are removed from the index.
     """
     resources_dir = "resources"
-    all_resources = []
+
+    # Command-line options for ingestion and for CLI or web UI interaction
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Adaptive Learning System")
+    parser.add_argument(
+        "--web",
+        action="store_true",
+        help="Start the web UI server instead of CLI interaction",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes used to ingest resources",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds after which the ingestion of a single file is abandoned",
+    )
+    args = parser.parse_args()
 
     logger.info("Starting resource ingestion process...")
+    try:
+        indexer = IndexManager("index_data/simple_index.json")
+        manifest = IngestionManifest("index_data/ingestion_manifest.json")
+        files = find_resource_files(resources_dir)
+        # Files split into several records (exercise banks, PDF pages) are indexed under
+        # their records
+        split_files = {
+            resource["metadata"]["parent_file_path"]
+            for resource in indexer.get_all_resources()
+            if resource["metadata"].get("parent_file_path")
+        }
+        to_ingest, removed = manifest.changes(
+            {
+                file_path: RESOURCE_TYPES[resource_type]["ingestor"].INGESTOR_VERSION
+                for file_path, resource_type in files.items()
+            },
+            indexed_paths=[
+                resource["metadata"].get("file_path", "")
+                for resource in indexer.get_all_resources()
+            ]
+            + list(split_files),
+        )
+        logger.info(
+            f"{len(files) - len(to_ingest)} resources unchanged, "
+            f"{len(to_ingest)} new or changed, {len(removed)} removed."
+        )
 
-    # Ingest all types of resources from their respective directories
-    text_dir = os.path.join(resources_dir, "text")
-    if os.path.exists(text_dir) and len(os.listdir(text_dir)) > 0:
-        text_data = ingest_text_directory(text_dir)
-    else:
-        # Check root resources directory for text files
-        text_data = []
-        for file in os.listdir(resources_dir):
-            if file.endswith((".txt", ".json")):
-                file_path = os.path.join(resources_dir, file)
-                if os.path.isfile(file_path):
-                    from adaptive_learning.ingestion.text_ingestor import (
-                        ingest_text_file,
-                    )
+        if removed:
+            indexer.remove_resources(removed)
+            for file_path in removed:
+                manifest.forget(file_path)
 
-                    text_data.append(ingest_text_file(file_path))
-    all_resources.extend(text_data)
-    logger.info(f"Ingested {len(text_data)} text resources.")
+        # Exercise banks are parsed in this process and streamed into the index one
+        # exercise at a time, instead of being collected whole in a worker process
+        banks = {
+            file_path
+            for file_path in to_ingest
+            if files[file_path] == "text"
+            and file_path.lower().endswith(".json")
+            and json_ingestor.is_exercise_bank(file_path)
+        }
+        results = ingest_files_parallel(
+            [
+                (
+                    file_path,
+                    RESOURCE_TYPES[files[file_path]]["subdirectory"],
+                    RESOURCE_TYPES[files[file_path]]["ingest"],
+                )
+                for file_path in to_ingest
+                if file_path not in banks
+            ],
+            max_workers=args.workers,
+            timeout=args.timeout,
+        )
+        ingested = Counter()
+        failed = set()
+        # Records of each file not yet committed, the file each record comes from and
+        # the files whose last record has been produced. The producer thread and the
+        # committing thread both update them
+        uncommitted = Counter()
+        source_files = {}
+        produced_files = set()
+        records_lock = threading.Lock()
 
-    pdf_dir = os.path.join(resources_dir, "pdf")
-    if os.path.exists(pdf_dir) and len(os.listdir(pdf_dir)) > 0:
-        pdf_data = ingest_pdf_directory(pdf_dir)
-    else:
-        # Check root resources directory for PDF files
-        pdf_data = []
-        for file in os.listdir(resources_dir):
-            if file.endswith(".pdf"):
-                file_path = os.path.join(resources_dir, file)
-                if os.path.isfile(file_path):
-                    from adaptive_learning.ingestion.pdf_ingestor import ingest_pdf_file
-
-                    pdf_data.append(ingest_pdf_file(file_path))
-    all_resources.extend(pdf_data)
-    logger.info(f"Ingested {len(pdf_data)} PDF resources.")
-
-    video_dir = os.path.join(resources_dir, "video")
-    if os.path.exists(video_dir) and len(os.listdir(video_dir)) > 0:
-        video_data = ingest_video_directory(video_dir)
-    else:
-        # Check root resources directory for video files
-        video_data = []
-        for file in os.listdir(resources_dir):
-            if file.endswith((".mp4", ".avi", ".mkv")):
-                file_path = os.path.join(resources_dir, file)
-                if os.path.isfile(file_path):
-                    from adaptive_learning.ingestion.video_ingestor import (
-                        ingest_video_file,
-                    )
+        def produce(file_path, resource, last):
+            with records_lock:
+                if "error" in resource["metadata"]:
+                    failed.add(file_path)
+                uncommitted[file_path] += 1
+                source_files[resource["metadata"].get("file_path", "")] = file_path
+                if last:
+                    produced_files.add(file_path)
 
-                    video_data.append(ingest_video_file(file_path))
-    all_resources.extend(video_data)
-    logger.info(f"Ingested {len(video_data)} video resources.")
+        def ingested_resources():
+            for file_path, result in results:
+                resources = as_resources(result)
+                if not resources:
+                    continue
+                ingested[files[file_path]] += 1
+                if isinstance(result, list) or file_path in split_files:
+                    # Drop the previous records, which the new ones may not all replace
+                    indexer.remove_resources([file_path])
+                for i, resource in enumerate(resources):
+                    produce(file_path, resource, i == len(resources) - 1)
+                    yield resource
 
-    image_dir = os.path.join(resources_dir, "image")
-    if os.path.exists(image_dir) and len(os.listdir(image_dir)) > 0:
-        image_data = ingest_image_directory(image_dir)
-    else:
-        # Check root resources directory for image files
-        image_data = []
-        for file in os.listdir(resources_dir):
-            if file.endswith((".jpg", ".jpeg", ".png", ".bmp")):
-                file_path = os.path.join(resources_dir, file)
-                if os.path.isfile(file_path):
-                    from adaptive_learning.ingestion.image_ingestor import (
-                        ingest_image_file,
-                    )
+            for file_path in sorted(banks):
+                ingested["text"] += 1
+                indexer.remove_resources([file_path])
+                records = json_ingestor.iter_exercise_resources(file_path)
+                try:
+                    # Reading one record ahead tells when the last one is yielded
+                    resource = next(records, None)
+                    while resource is not None:
+                        following = next(records, None)
+                        produce(file_path, resource, following is None)
+                        yield resource
+                        resource = following
+                except Exception as e:
+                    logger.error(f"Error reading exercise bank {file_path}: {e}")
+                    with records_lock:
+                        failed.add(file_path)
 
-                    image_data.append(ingest_image_file(file_path))
-    all_resources.extend(image_data)
-    logger.info(f"Ingested {len(image_data)} image resources.")
+        def record_committed(record_paths):
+            # A file is recorded once all its records are committed. Failed extractions
+            # are not recorded, so they are retried on the next start
+            with records_lock:
+                for record_path in record_paths:
+                    file_path = source_files.pop(record_path)
+                    uncommitted[file_path] -= 1
+                    if (
+                        uncommitted[file_path] == 0
+                        and file_path in produced_files
+                        and file_path not in failed
+                    ):
+                        resource_type = files[file_path]
+                        manifest.record(
+                            file_path,
+                            RESOURCE_TYPES[resource_type]["ingestor"].INGESTOR_VERSION,
+                        )
+            manifest.save()
 
-    # Build and save the index with error handling
-    try:
-        indexer = build_index_from_resources(
-            all_resources, "index_data/simple_index.json"
+        # Resources are indexed in batches while later files are still being ingested
+        indexed = stream_into_index(
+            ingested_resources(), indexer, on_commit=record_committed
         )
+        for resource_type in RESOURCE_TYPES:
+            logger.info(
+                f"Ingested {ingested[resource_type]} {resource_type} resources."
+            )
+        if removed and not indexed:
+            indexer.save_index()
+        manifest.save()
         logger.info(f"Total resources indexed: {len(indexer.get_all_resources())}")
     except Exception as e:
         logger.error(f"Error building index: {str(e)}")
@@ -119,7 +265,7 @@ def main():
     # Test search functionality
     test_keyword = "programming"
     try:
-        search_results = indexer.search_by_keyword(test_keyword)
+        search_results = indexer.search_with_snippets(test_keyword)
         logger.info(
             f"Search results for '{test_keyword}': {len(search_results)} matches."
         )
@@ -127,9 +273,11 @@ def main():
             logger.info(f"Result {i}:")
             logger.info(f"  File: {result['metadata'].get('file_name', 'unknown')}")
             logger.info(f"  Type: {result['metadata'].get('file_type', 'unknown')}")
-            content_snippet = result.get("content", "")[:200]
+            if result["snippet"].get("page"):
+                logger.info(f"  Page: {result['snippet']['page']}")
+            content_snippet = result["snippet"]["text"]
             if content_snippet:
-                logger.info(f"  Content Snippet: {content_snippet}...")
+                logger.info(f"  Content Snippet: ...{content_snippet}...")
     except Exception as e:
         logger.error(f"Error testing search functionality: {str(e)}")
 
@@ -147,17 +295,6 @@ def main():
     engine.content_generator = content_generator
     engine.set_indexed_data(indexer)
 
-    # Provide option for CLI interaction or starting the web UI
-    import argparse
-
-    parser = argparse.ArgumentParser(description="Run the Adaptive Learning System")
-    parser.add_argument(
-        "--web",
-        action="store_true",
-        help="Start the web UI server instead of CLI interaction",
-    )
-    args = parser.parse_args()
-
     if args.web:
         logger.info("Starting web UI server with FastAPI...")
         try:
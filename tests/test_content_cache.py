@@ -0,0 +1,80 @@
+"""
+Unit tests for the content cache to validate LRU eviction and reuse across file paths.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import spacy
+
+from adaptive_learning.ingestion import cache as cache_module
+from adaptive_learning.ingestion import text_ingestor
+from adaptive_learning.ingestion.cache import ContentCache
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(
+            cache_module, "DEFAULT_CACHE_DIR", self.temp_dir.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Every write checks the size of the cache
+        patcher = mock.patch.object(cache_module, "EVICTION_INTERVAL", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_least_recently_used_results_are_evicted(self):
+        """Reading a result protects it from eviction; the oldest unused ones go."""
+        cache = ContentCache(namespace="ocr-v1", max_bytes=3200)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.put(f"{key}{i}" * 8, "result", {"text": key * 1000})
+            # Distinct modification times even on coarse-grained file systems
+            past = time.time() - 100 + i
+            os.utime(cache._entry_path(f"{key}{i}" * 8, "result"), (past, past))
+        self.assertIsNotNone(cache.get("a0" * 8, "result"))
+
+        cache.put("d3" * 8, "result", {"text": "d" * 1000})
+        self.assertIsNotNone(cache.get("a0" * 8, "result"))
+        self.assertIsNone(cache.get("b1" * 8, "result"))
+        self.assertIsNone(cache.get("c2" * 8, "result"))
+        self.assertEqual(cache.get("d3" * 8, "result"), {"text": "d" * 1000})
+        # The directories of evicted files are removed as well
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.temp_dir.name, "ocr-v1"))),
+            ["a0", "d3"],
+        )
+
+    def test_text_analysis_is_reused_for_a_copy_of_a_file(self):
+        """A long text moved to another path is not analyzed again."""
+        content = "O código em Python roda. " * (text_ingestor.CACHE_MIN_CHARS // 20)
+        paths = []
+        for name in ("aula.txt", "copia.txt"):
+            paths.append(os.path.join(self.temp_dir.name, name))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(content)
+        nlp = spacy.blank("pt")
+        nlp.add_pipe("sentencizer")
+        with mock.patch.object(text_ingestor, "_nlp", nlp), mock.patch.object(
+            text_ingestor,
+            "process_text_contents",
+            wraps=text_ingestor.process_text_contents,
+        ) as process:
+            first, second = [text_ingestor.ingest_text_file(path) for path in paths]
+        analyzed = [text for call in process.call_args_list for text in call.args[0]]
+        self.assertEqual(len(analyzed), 1)
+        self.assertEqual(second["metadata"]["file_path"], paths[1])
+        self.assertEqual(
+            second["metadata"]["token_count"], first["metadata"]["token_count"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Unit tests for the image ingestor to validate header-only reads, directory ingestion and
+tiled, cached OCR.
+"""
+
+import builtins
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageDraw, PngImagePlugin
+
+from adaptive_learning.ingestion import image_ingestor
+
+
+class TestImageIngestor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch(
+            "adaptive_learning.ingestion.cache.DEFAULT_CACHE_DIR",
+            os.path.join(self.temp_dir.name, "cache"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.image_dir = os.path.join(self.temp_dir.name, "html5")
+        os.makedirs(os.path.join(self.image_dir, "tags"))
+        self.paths = []
+        for name, size in (
+            ("estrutura_basica.jpg", (640, 480)),
+            ("tags/semantica.png", (32, 64)),
+        ):
+            self.paths.append(os.path.join(self.image_dir, name))
+            exif = Image.Exif()
+            exif[0x010F] = "Scanner"  # Make
+            Image.new("RGB", size, "white").save(self.paths[-1], exif=exif)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_metadata_is_read_without_decoding_the_pixels(self):
+        """By default only the headers are read; hashes and OCR are opt-in."""
+        with mock.patch.object(Image.Image, "load") as load, mock.patch.object(
+            image_ingestor, "ocr_available"
+        ) as ocr_available:
+            resource = image_ingestor.ingest_image_file(self.paths[0])
+        load.assert_not_called()
+        ocr_available.assert_not_called()
+        metadata = resource["metadata"]
+        self.assertEqual((metadata["width"], metadata["height"]), (640, 480))
+        self.assertNotIn("phash", metadata)
+        self.assertNotIn("sha256", metadata)
+
+    def test_file_is_opened_once_and_decoded_at_reduced_scale(self):
+        """Metadata and hashes come from a single open, without a full JPEG decode."""
+        decoded_sizes = []
+        load = Image.Image.load
+
+        def record_load(img):
+            decoded_sizes.append(img.size)
+            return load(img)
+
+        with mock.patch.object(
+            builtins, "open", wraps=builtins.open
+        ) as opened, mock.patch.object(Image.Image, "load", record_load):
+            resource = image_ingestor.ingest_image_file(
+                self.paths[0], ocr=False, hashes=True
+            )
+        self.assertEqual(
+            [call.args[0] for call in opened.call_args_list], [self.paths[0]]
+        )
+        metadata = resource["metadata"]
+        self.assertEqual((metadata["width"], metadata["height"]), (640, 480))
+        self.assertEqual(metadata["format"], "JPEG")
+        self.assertIn("basica", metadata["inferred_tags"])
+        self.assertEqual(len(metadata["phash"]), 16)
+        self.assertEqual(len(metadata["dhash"]), 16)
+        self.assertEqual(len(metadata["sha256"]), 64)
+        self.assertTrue(all(width < 640 for width, _ in decoded_sizes))
+
+    def test_directory_is_read_concurrently_in_file_order(self):
+        """Threaded header reads return every image, in the order they were found."""
+        with mock.patch.object(image_ingestor, "ingest_files") as ingest_files:
+            resources = image_ingestor.ingest_image_directory(self.image_dir)
+        ingest_files.assert_not_called()
+        self.assertEqual(
+            [resource["metadata"]["file_path"] for resource in resources],
+            image_ingestor.find_files(
+                self.image_dir, image_ingestor.SUPPORTED_EXTENSIONS
+            ),
+        )
+        sizes = {
+            resource["metadata"]["file_name"]: (
+                resource["metadata"]["width"],
+                resource["metadata"]["height"],
+            )
+            for resource in resources
+        }
+        self.assertEqual(
+            sizes, {"estrutura_basica.jpg": (640, 480), "semantica.png": (32, 64)}
+        )
+
+    def test_tall_images_are_recognized_in_tiles_and_cached(self):
+        """Tiles are cut at blank rows, read in order, and copies reuse the text."""
+        infographic = Image.new("RGB", (400, 2000), "white")
+        draw = ImageDraw.Draw(infographic)
+        for top in range(40, 2000, 60):  # Lines of "text" 30 rows high
+            draw.rectangle((20, top, 380, top + 29), fill="black")
+        original = os.path.join(self.temp_dir.name, "infografico.png")
+        infographic.save(original)
+        copy = os.path.join(self.temp_dir.name, "copia.png")
+        info = PngImagePlugin.PngInfo()
+        info.add_text("Software", "editor")
+        infographic.save(copy, pnginfo=info)
+
+        tiles = []
+
+        def fake_ocr(tile):
+            tiles.append(tile)
+            return f"linhas até {sum(t.height for t in tiles)}\n"
+
+        with mock.patch.object(
+            image_ingestor, "ocr_available", return_value=True
+        ), mock.patch.object(image_ingestor, "ocr_tile", fake_ocr):
+            first = image_ingestor.ingest_image_file(original, ocr=True)
+            second = image_ingestor.ingest_image_file(copy, ocr=True)
+
+        self.assertEqual(len(tiles), 3)
+        self.assertEqual(sum(tile.height for tile in tiles), 2000)
+        for tile in tiles[:-1]:
+            # Each cut falls in the white gap between two lines
+            bottom_row = tile.crop((0, tile.height - 1, tile.width, tile.height))
+            self.assertEqual(bottom_row.getextrema(), (255, 255))
+        self.assertTrue(first["content"].startswith("Image file: infografico.png"))
+        self.assertTrue(first["content"].endswith("linhas até 2000"))
+        self.assertEqual(first["metadata"]["ocr"], {"tiles": 3})
+        self.assertEqual(second["metadata"]["phash"], first["metadata"]["phash"])
+        self.assertEqual(
+            second["content"].split("\n", 1)[1], first["content"].split("\n", 1)[1]
+        )
+
+    def test_similar_images_with_other_pixels_are_recognized_again(self):
+        """A shared perceptual hash alone does not reuse the text of another image."""
+        paths = []
+        for name, label in (("aula1.png", 1), ("aula2.png", 2)):
+            image = Image.new("RGB", (400, 300), "white")
+            ImageDraw.Draw(image).rectangle((20, 40, 380, 70), fill="black")
+            # A small mark, as a different digit would be, keeps the perceptual hash
+            image.putpixel((300 + label, 200), (0, 0, 0))
+            paths.append(os.path.join(self.temp_dir.name, name))
+            image.save(paths[-1])
+
+        calls = []
+
+        def fake_ocr(tile):
+            calls.append(tile)
+            return f"leitura {len(calls)}"
+
+        with mock.patch.object(
+            image_ingestor, "ocr_available", return_value=True
+        ), mock.patch.object(image_ingestor, "ocr_tile", fake_ocr):
+            first, second, again = (
+                image_ingestor.ingest_image_file(path, ocr=True)
+                for path in paths + paths[:1]
+            )
+
+        self.assertEqual(first["metadata"]["phash"], second["metadata"]["phash"])
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(second["content"].endswith("leitura 2"))
+        self.assertTrue(again["content"].endswith("leitura 1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
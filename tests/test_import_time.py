@@ -0,0 +1,45 @@
+"""
+Import-time budget tests: importing the package must not load NLP or media libraries.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# Seconds allowed for a cold import of the ingestion package (about 0.25 s locally)
+IMPORT_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = ("spacy", "nltk", "moviepy", "vosk", "torch", "sentence_transformers")
+
+MEASURE = f"""
+import json, sys, time
+start = time.perf_counter()
+import adaptive_learning.ingestion
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_ingestion_package_imports_within_budget(self):
+        """Models and heavy libraries are loaded on first use, not on import."""
+        env = dict(os.environ, ADAPTIVE_LEARNING_OFFLINE="1")
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["seconds"], IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,609 @@
+"""
+Unit tests for the IndexManager class to validate keyword search and snippet extraction.
+"""
+
+import hashlib
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from adaptive_learning.indexing.autocomplete import PrefixIndex
+from adaptive_learning.indexing.fuzzy import FuzzyMatcher
+from adaptive_learning.indexing.image_similarity import BKTree, hamming_distance
+from adaptive_learning.indexing.index_manager import IndexManager, IndexSnapshot
+from adaptive_learning.indexing.keyword_index import build_snippet, tokenize
+from adaptive_learning.indexing.pipeline import IndexingPipeline
+from adaptive_learning.ingestion.image_hash import compute_image_hashes
+from adaptive_learning.ingestion.transcript import build_transcript
+
+
+def make_resource(file_name: str, content: str, file_type: str = ".txt"):
+    return {
+        "metadata": {
+            "file_name": file_name,
+            "file_path": os.path.join("resources", file_name),
+            "file_type": file_type,
+        },
+        "content": content,
+        "processed_content": content,
+    }
+
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedder standing in for SentenceTransformer."""
+
+    dimension = 32
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        vectors = []
+        for text in [texts] if single else texts:
+            vector = [0.0] * self.dimension
+            for term, _, _ in tokenize(text):
+                vector[zlib.crc32(term.encode("utf-8")) % self.dimension] += 1.0
+            vectors.append(vector)
+        return vectors[0] if single else vectors
+
+
+class OtherEmbedder(FakeEmbedder):
+    """A different model, with fewer dimensions, that counts the texts it encodes."""
+
+    dimension = 16
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts):
+        self.encoded += 1 if isinstance(texts, str) else len(texts)
+        return super().encode(texts)
+
+
+class TestIndexManager(unittest.TestCase):
+    def setUp(self):
+        """Create an IndexManager backed by a temporary index file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_manager = IndexManager(
+            os.path.join(self.temp_dir.name, "index.json")
+        )
+        filler = "Texto introdutório sobre a disciplina. " * 20
+        self.index_manager.add_resource(
+            make_resource(
+                "loops.txt",
+                filler + "Os loops while e for repetem instruções. " + filler,
+            )
+        )
+        self.index_manager.add_resource(
+            make_resource("html.pdf", "Estrutura de páginas web com HTML5.", ".pdf")
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_search_by_keyword_matches_term_prefixes(self):
+        """Keyword words match indexed terms they start, through the prefix index."""
+        results = self.index_manager.search_by_keyword("loop")
+        self.assertEqual([r["metadata"]["file_name"] for r in results], ["loops.txt"])
+        self.assertEqual(self.index_manager.search_by_keyword("epetem"), [])
+        self.assertEqual(len(self.index_manager.search_by_keyword("páginas web")), 1)
+        self.assertEqual(self.index_manager.search_by_keyword("web páginas"), [])
+
+    def test_search_by_keyword_filters_by_type(self):
+        """Resource type filter is applied to keyword results."""
+        self.assertEqual(self.index_manager.search_by_keyword("html", ".txt"), [])
+        self.assertEqual(len(self.index_manager.search_by_keyword("html", ".pdf")), 1)
+
+    def test_search_with_snippets_centers_on_match(self):
+        """Snippets contain the match and highlight it instead of the document head."""
+        results = self.index_manager.search_with_snippets("while", window=80)
+        self.assertEqual(len(results), 1)
+        snippet = results[0]["snippet"]
+        self.assertLessEqual(len(snippet["text"]), 80)
+        self.assertIn("while", snippet["text"])
+        start, end = snippet["highlights"][0]
+        self.assertEqual(snippet["text"][start:end], "while")
+        self.assertNotIn("content", results[0])
+
+    def test_snippets_of_paginated_resources_carry_the_page(self):
+        """Snippets of resources with page records report the page of the match."""
+        resource = make_resource("book.pdf", "Capa\fSumário\fRecursão em Python\f")
+        resource["pages"] = [
+            {"page": 1, "start": 0, "end": 5},
+            {"page": 2, "start": 5, "end": 13},
+            {"page": 3, "start": 13, "end": 32},
+        ]
+        self.index_manager.add_resource(resource)
+        results = self.index_manager.search_with_snippets("recursão", window=12)
+        self.assertEqual(results[0]["snippet"]["page"], 3)
+
+        page = make_resource("book.pdf#page=7", "Listas encadeadas", ".pdf")
+        page["metadata"]["page"] = 7
+        self.index_manager.add_resource(page)
+        results = self.index_manager.search_with_snippets("encadeadas")
+        self.assertEqual(results[0]["snippet"]["page"], 7)
+
+    def test_transcript_matches_return_time_ranges(self):
+        """Matches in a video transcript map to when the words are spoken."""
+        words = [
+            {"word": word, "start": start, "end": start + 0.3}
+            for word, start in [
+                ("hoje", 1.0),
+                ("veremos", 1.4),
+                ("recursão", 1.8),
+                ("exemplo", 9.0),
+                ("de", 9.4),
+                ("recursão", 9.7),
+            ]
+        ]
+        content, columns, phrases = build_transcript(words)
+        resource = make_resource("aula.mp4", content, ".mp4")
+        resource["words"] = columns
+        resource["phrases"] = phrases
+        self.index_manager.add_resource(resource)
+
+        results = self.index_manager.search_time_ranges("recursão")
+        self.assertEqual(len(results), 1)
+        ranges = results[0]["ranges"]
+        self.assertEqual(
+            [(r["start"], r["end"]) for r in ranges], [(1.8, 2.1), (9.7, 10.0)]
+        )
+        self.assertEqual(ranges[1]["text"], "exemplo de recursão")
+        snippet = self.index_manager.search_with_snippets("exemplo")[0]["snippet"]
+        self.assertEqual(snippet["time"]["end"], 10.0)
+        self.assertEqual(
+            self.index_manager.search_time_ranges("recursão", "resources/other.mp4"), []
+        )
+
+    def test_copies_of_an_image_are_collapsed_and_similar_images_found(self):
+        """Copies are one result unless their text differs; look-alikes are grouped."""
+        rng = np.random.default_rng(7)
+        pictures = [
+            Image.fromarray(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8)).resize(
+                (640, 480)
+            )
+            for _ in range(2)
+        ]
+        # A new edition of the first picture, with a few more words
+        edition = pictures[0].copy()
+        edition.paste((255, 255, 255), (600, 440, 630, 470))
+        copies = [
+            ("infografico.png", pictures[0], "PNG", "Tags HTML5"),
+            (
+                "infografico_pequeno.jpg",
+                pictures[0].resize((320, 240)),
+                "JPEG",
+                "Tags HTML5",
+            ),
+            ("infografico_copia.png", pictures[0], "PNG", None),
+            # Re-encoded at another size, without recognized text
+            ("infografico_web.jpg", pictures[0].resize((480, 360)), "JPEG", None),
+            ("infografico_2024.png", edition, "PNG", "Tags HTML5 e CSS3"),
+            ("diagrama.png", pictures[1], "PNG", None),
+        ]
+        for file_name, picture, image_format, text in copies:
+            data = io.BytesIO()
+            picture.save(data, image_format)
+            content = f"Image file: {file_name}"
+            resource = make_resource(
+                file_name,
+                f"{content}\n{text}" if text else content,
+                os.path.splitext(file_name)[1],
+            )
+            resource["metadata"]["sha256"] = hashlib.sha256(data.getvalue()).hexdigest()
+            if text:
+                resource["metadata"]["ocr"] = {"tiles": 1}
+            data.seek(0)
+            resource["metadata"].update(compute_image_hashes(data))
+            self.index_manager.add_resource(resource)
+
+        # The resized copies have the same text or none and the plain copy the same
+        # bytes, but the image whose text differs is its own result
+        results = self.index_manager.search_by_keyword("infografico")
+        self.assertEqual(
+            [r["metadata"]["file_name"] for r in results],
+            ["infografico.png", "infografico_2024.png"],
+        )
+        # A copy matching on its own is reported as itself
+        results = self.index_manager.search_by_keyword("pequeno")
+        self.assertEqual(
+            [r["metadata"]["file_name"] for r in results], ["infografico_pequeno.jpg"]
+        )
+        similar = self.index_manager.search_similar_images(
+            "resources/diagrama.png", max_distance=64
+        )
+        self.assertEqual(len(similar), 1)
+        self.assertEqual(similar[0]["metadata"]["file_name"], "infografico.png")
+        self.assertEqual(
+            similar[0]["duplicates"],
+            [
+                "resources/infografico_pequeno.jpg",
+                "resources/infografico_copia.png",
+                "resources/infografico_web.jpg",
+                "resources/infografico_2024.png",
+            ],
+        )
+        self.assertEqual(
+            self.index_manager.search_similar_images("resources/infografico.png"), []
+        )
+
+    def test_bk_tree_finds_every_hash_within_the_distance(self):
+        """BK-tree searches return the same hashes as comparing with every hash."""
+        generator = random.Random(3)
+        hashes = [generator.getrandbits(64) for _ in range(500)]
+        # Near copies of some hashes, a few bits flipped
+        hashes += [h ^ (1 << generator.randrange(64)) for h in hashes[:50]]
+        tree = BKTree()
+        for i, value in enumerate(hashes):
+            tree.add(value, i)
+        for query in hashes[:20] + [generator.getrandbits(64) for _ in range(20)]:
+            expected = sorted(
+                (hamming_distance(query, value), i)
+                for i, value in enumerate(hashes)
+                if hamming_distance(query, value) <= 20
+            )
+            self.assertEqual(sorted(tree.search(query, 20)), expected)
+
+    def test_search_fuzzy_resolves_misspellings(self):
+        """Misspelled and unaccented words are corrected to indexed terms."""
+        self.assertEqual(self.index_manager.search_by_keyword("paginas"), [])
+        results = self.index_manager.search_fuzzy("paginas")
+        self.assertEqual([r["metadata"]["file_name"] for r in results], ["html.pdf"])
+        self.assertEqual(
+            self.index_manager.correct_query("loopes whiel"), "loops while"
+        )
+        self.assertEqual(
+            self.index_manager.search_fuzzy("loopes", max_edit_distance=0), []
+        )
+
+    def test_search_fuzzy_does_not_retry_a_query_of_indexed_terms(self):
+        """A query whose words are all indexed is not searched again as a correction."""
+        with mock.patch.object(
+            self.index_manager,
+            "_match_keyword",
+            wraps=self.index_manager._match_keyword,
+        ) as match_keyword:
+            self.assertEqual(self.index_manager.search_fuzzy("Web, páginas!"), [])
+        self.assertEqual(match_keyword.call_count, 1)
+
+    def test_fuzzy_matcher_ranks_by_distance_then_frequency(self):
+        """Closer terms come first, and frequent terms win ties."""
+        matcher = FuzzyMatcher({"classe": 1, "classes": 5, "class": 2, "casa": 9})
+        self.assertEqual(matcher.lookup("clase")[:2], [("class", 1), ("classe", 1)])
+        self.assertEqual(matcher.best_match("classe"), "classe")
+        self.assertEqual(matcher.best_match("xyzw"), None)
+
+    def test_prefix_index_completes_by_weight_ignoring_accents(self):
+        """Completions are ordered by weight and match unaccented prefixes."""
+        index = PrefixIndex(
+            {"função": 3, "funções": 5, "fundamentos": 1, "for": 9}, top_n=2
+        )
+        self.assertEqual(
+            index.complete("fun", limit=2), [("funções", 5), ("função", 3)]
+        )
+        self.assertEqual(index.complete("FUNCA"), [("função", 3)])
+        self.assertEqual([t for t, _ in index.complete("f", limit=3)][2], "função")
+        self.assertEqual(index.complete(""), [])
+
+    def test_suggest_puts_curated_terms_first(self):
+        """Curated terms are suggested before indexed terms."""
+        self.index_manager.set_suggestion_terms(["whitespace", "repetição"])
+        self.assertEqual(self.index_manager.suggest("rep"), ["repetição", "repetem"])
+        self.assertEqual(self.index_manager.suggest("rep", limit=1), ["repetição"])
+        self.assertEqual(self.index_manager.suggest("disc"), ["disciplina"])
+
+    def test_build_snippet_prefers_window_with_most_terms(self):
+        """The window covering more distinct query terms wins."""
+        content = "loop " + "x " * 100 + "loop for while " + "y " * 100
+        positions = sorted(
+            (start, end, term)
+            for term, start, end in tokenize(content)
+            if term in ("loop", "while")
+        )
+        snippet = build_snippet(content, positions, window=40)
+        self.assertIn("loop for while", snippet["text"])
+        self.assertEqual(len(snippet["highlights"]), 2)
+
+
+class TestIndexSnapshots(unittest.TestCase):
+    def setUp(self):
+        """Create an IndexManager with a fake embedder so vector search is active."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_manager = IndexManager(
+            os.path.join(self.temp_dir.name, "index.json"), embedder=FakeEmbedder()
+        )
+        self.index_manager.add_resources(
+            [
+                make_resource("loops.txt", "loops while for repetição"),
+                make_resource("html.txt", "html web página estrutura"),
+            ]
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pinned_snapshot_is_not_affected_by_writes(self):
+        """Writers publish new snapshots instead of mutating the pinned one."""
+        pinned = self.index_manager.snapshot()
+        self.index_manager.add_resource(make_resource("oop.txt", "classe objeto"))
+        self.index_manager.build_vector_index()
+        self.assertEqual(len(pinned.entries), 2)
+        self.assertEqual(pinned.vector_index.ntotal, 2)
+        current = self.index_manager.snapshot()
+        self.assertGreater(current.version, pinned.version)
+        self.assertEqual(current.vector_index.ntotal, 3)
+
+    def test_writes_update_derived_indexes_from_the_previous_snapshot(self):
+        """Derived indexes are updated for the changed entries, not rebuilt."""
+        pinned = self.index_manager.snapshot()
+        self.assertEqual(self.index_manager.suggest("lo"), ["loops"])
+        loops_postings = pinned.keyword_index.postings["loops"]
+        self.index_manager.add_resource(make_resource("web.txt", "web lopps"))
+        self.index_manager.update_resource(
+            os.path.join("resources", "html.txt"),
+            make_resource("html.txt", "html css página"),
+        )
+
+        current = self.index_manager.snapshot()
+        self.assertIs(current.keyword_index.postings["loops"], loops_postings)
+        self.assertEqual(self.index_manager.suggest("lo"), ["loops", "lopps"])
+        self.assertEqual(
+            self.index_manager.correct_query("estrutura css"), "estrutura css"
+        )
+        self.assertEqual(self.index_manager.correct_query("loopz"), "loops")
+        self.assertNotIn("estrutura", current.keyword_index.postings)
+        self.assertIn("estrutura", pinned.keyword_index.postings)
+        self.assertNotIn("css", pinned.keyword_index.postings)
+        self.assertEqual(pinned.fuzzy_matcher.best_match("cs", 1), None)
+        self.assertEqual(pinned.keyword_index.complete("lo"), [("loops", 1)])
+
+        rebuilt = IndexSnapshot(current.version, current.entries).keyword_index
+        self.assertEqual(current.keyword_index.postings, rebuilt.postings)
+
+    def test_replaced_resources_append_new_rows(self):
+        """Replacing a resource appends its row and leaves pinned rows untouched."""
+        pinned = self.index_manager.snapshot()
+        before = np.array(pinned.embeddings)
+        self.index_manager.add_resource(make_resource("loops.txt", "classe objeto"))
+        np.testing.assert_array_equal(pinned.embeddings, before)
+        self.assertEqual(self.index_manager.vector_index.ntotal, 2)
+        results = self.index_manager.search_by_similarity("classe objeto", k=2)
+        self.assertEqual(
+            [r["metadata"]["file_name"] for r in results], ["loops.txt", "html.txt"]
+        )
+
+        # The persisted row map keeps the replaced row from being returned
+        self.index_manager.save_index()
+        reader = IndexManager(
+            self.index_manager.index_file_path, embedder=FakeEmbedder()
+        )
+        self.assertEqual(reader.vector_index.ntotal, 2)
+        results = reader.search_by_similarity("classe objeto", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "loops.txt")
+
+    def test_remove_resources_keeps_remaining_vectors(self):
+        """Removing a resource drops its entry and embedding row only."""
+        self.index_manager.remove_resource(os.path.join("resources", "loops.txt"))
+        self.assertEqual(
+            [
+                r["metadata"]["file_name"]
+                for r in self.index_manager.get_all_resources()
+            ],
+            ["html.txt"],
+        )
+        self.assertEqual(self.index_manager.vector_index.ntotal, 1)
+        results = self.index_manager.search_by_similarity("loops", k=2)
+        self.assertEqual([r["metadata"]["file_name"] for r in results], ["html.txt"])
+
+    def test_search_by_similarity_does_not_mutate_entries(self):
+        """Similarity scores are attached to copies of the snapshot entries."""
+        results = self.index_manager.search_by_similarity("html web", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "html.txt")
+        self.assertIn("similarity_score", results[0])
+        for entry in self.index_manager.get_all_resources():
+            self.assertNotIn("similarity_score", entry)
+
+    def test_reads_during_rebuild_always_see_vectors(self):
+        """Semantic search keeps answering while the vector index is rebuilt."""
+        failures = []
+
+        def read():
+            for _ in range(200):
+                if not self.index_manager.search_by_similarity("loops", k=1):
+                    failures.append(True)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for _ in range(20):
+            self.index_manager.build_vector_index()
+        reader.join()
+        self.assertEqual(failures, [])
+
+
+class TestSharedVectors(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.temp_dir.name, "index.json")
+        writer = IndexManager(self.index_file, embedder=FakeEmbedder())
+        writer.add_resources([make_resource("loops.txt", "loops while for")])
+        writer.save_index()
+        self.writer = writer
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reader_maps_persisted_vectors(self):
+        """A second manager maps the saved matrix read-only instead of re-encoding it."""
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        embeddings = reader.snapshot().embeddings
+        self.assertIsNotNone(reader.snapshot().vector_version)
+        self.assertFalse(embeddings.flags.writeable)
+        self.assertEqual(len(embeddings), 1)
+
+    def test_construction_does_not_encode_or_write(self):
+        """Without a build of its model, a manager encodes on first search, not on init."""
+        vectors_dir = os.path.join(self.temp_dir.name, "vectors")
+        files = sorted(os.listdir(vectors_dir))
+        embedder = OtherEmbedder()
+        reader = IndexManager(self.index_file, embedder=embedder)
+        self.assertIsNone(reader.vector_index)
+        self.assertEqual(embedder.encoded, 0)
+        self.assertEqual(sorted(os.listdir(vectors_dir)), files)
+        results = reader.search_by_similarity("loops", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "loops.txt")
+        self.assertEqual(embedder.encoded, 2)
+
+    def test_reader_encodes_build_of_another_model_again(self):
+        """Vectors saved by another model are re-encoded, not compared with queries."""
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        writer = IndexManager(self.index_file, embedder=OtherEmbedder())
+        writer.add_resource(make_resource("html.txt", "html web página"))
+        writer.save_index()
+        results = reader.search_by_similarity("html web", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "html.txt")
+        self.assertEqual(
+            reader.snapshot().embeddings.shape, (2, FakeEmbedder.dimension)
+        )
+
+    def test_reader_swaps_to_new_build(self):
+        """Readers pick up a build saved by another manager on their next search."""
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        self.writer.add_resource(make_resource("html.txt", "html web página"))
+        self.writer.save_index()
+        results = reader.search_by_similarity("html web", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "html.txt")
+        self.assertEqual(len(reader.get_all_resources()), 2)
+
+    def add_topics(self, count: int):
+        """Index and save enough entries for later saves to go to the log."""
+        self.writer.add_resources(
+            [make_resource(f"doc{i}.txt", f"tópico {i}") for i in range(count)]
+        )
+        self.writer.save_index()
+
+    def test_saves_append_only_the_changes(self):
+        """Later saves log changed entries and append their rows to the same file."""
+        self.add_topics(10)
+        index_size = os.path.getsize(self.index_file)
+        pointer = self.writer._vector_store.read_pointer()
+        self.writer.add_resources(
+            [
+                make_resource("loops.txt", "loops for"),
+                make_resource("html.txt", "html web página"),
+            ]
+        )
+        self.writer.save_index()
+        self.assertEqual(os.path.getsize(self.index_file), index_size)
+        self.assertTrue(os.path.exists(self.writer.log_file_path))
+        new_pointer = self.writer._vector_store.read_pointer()
+        self.assertEqual(new_pointer["file"], pointer["file"])
+        self.assertEqual(new_pointer["count"], pointer["count"] + 2)
+
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        self.assertEqual(reader.get_all_resources(), self.writer.get_all_resources())
+        self.assertEqual(reader.vector_index.ntotal, 12)
+        results = reader.search_by_similarity("html web", k=1)
+        self.assertEqual(results[0]["metadata"]["file_name"], "html.txt")
+
+    def test_removal_rewrites_index_file(self):
+        """Removing resources shifts document ids, so the index file is rewritten."""
+        self.writer.add_resource(make_resource("html.txt", "html web página"))
+        self.writer.save_index()
+        self.writer.remove_resource(os.path.join("resources", "loops.txt"))
+        self.writer.save_index()
+        self.assertFalse(os.path.exists(self.writer.log_file_path))
+        with open(self.index_file, "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 1)
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        self.assertEqual(reader.get_all_resources(), self.writer.get_all_resources())
+        self.assertIsNotNone(reader.vector_index)
+
+    def test_stale_log_is_ignored(self):
+        """A log written for an earlier index file is not applied to a newer one."""
+        self.add_topics(10)
+        self.writer.add_resource(make_resource("html.txt", "html web página"))
+        self.writer.save_index()
+        with open(self.writer.log_file_path, "r", encoding="utf-8") as f:
+            log = f.read()
+        self.writer.remove_resource(os.path.join("resources", "html.txt"))
+        self.writer.save_index()
+        with open(self.writer.log_file_path, "w", encoding="utf-8") as f:
+            f.write(log)
+        reader = IndexManager(self.index_file, embedder=FakeEmbedder())
+        self.assertEqual(len(reader.get_all_resources()), 11)
+
+
+class TestIndexingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.temp_dir.name, "index.json")
+        self.index_manager = IndexManager(self.index_file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_streams_resources_with_periodic_commits(self):
+        """Resources are indexed in batches and each commit reports its files."""
+        commits = []
+        pipeline = IndexingPipeline(
+            self.index_manager,
+            batch_size=2,
+            commit_interval=2,
+            queue_size=1,
+            on_commit=commits.append,
+        )
+        resources = (make_resource(f"doc{i}.txt", f"tópico {i}") for i in range(5))
+        self.assertEqual(pipeline.run(resources), 5)
+        self.assertGreaterEqual(len(commits), 2)
+        self.assertEqual(sum(len(paths) for paths in commits), 5)
+        self.assertEqual(len(IndexManager(self.index_file).get_all_resources()), 5)
+
+    def test_producer_error_keeps_indexed_resources(self):
+        """Resources produced before a failure are saved before the error is raised."""
+
+        def resources():
+            yield make_resource("ok.txt", "conteúdo")
+            raise RuntimeError("ingestion failed")
+
+        with self.assertRaises(RuntimeError):
+            IndexingPipeline(self.index_manager).run(resources())
+        self.assertEqual(len(IndexManager(self.index_file).get_all_resources()), 1)
+
+    def test_indexing_error_stops_the_producer(self):
+        """If indexing fails, the producer stops and its source is closed."""
+        closed = threading.Event()
+
+        def resources():
+            try:
+                for i in range(100):
+                    yield make_resource(f"doc{i}.txt", f"tópico {i}")
+            finally:
+                closed.set()
+
+        def fail(file_paths):
+            raise OSError("disk full")
+
+        pipeline = IndexingPipeline(
+            self.index_manager,
+            batch_size=1,
+            commit_interval=1,
+            queue_size=1,
+            on_commit=fail,
+        )
+        with self.assertRaises(OSError):
+            pipeline.run(resources())
+        self.assertTrue(closed.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the IngestionManifest class to validate change detection between starts.
+"""
+
+import os
+import tempfile
+import unittest
+
+from adaptive_learning.ingestion.manifest import IngestionManifest
+
+
+class TestIngestionManifest(unittest.TestCase):
+    def setUp(self):
+        """Create a resource file and a manifest that has recorded it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.temp_dir.name, "manifest.json")
+        self.file_path = os.path.join(self.temp_dir.name, "aula.txt")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("Laços de repetição em Python.")
+        manifest = IngestionManifest(self.manifest_path)
+        manifest.record(self.file_path, "1")
+        manifest.save()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unchanged_file_is_skipped(self):
+        """A recorded file with the same stat and ingestor version is not ingested."""
+        manifest = IngestionManifest(self.manifest_path)
+        self.assertEqual(manifest.changes({self.file_path: "1"}), ([], []))
+
+    def test_changed_content_or_version_is_ingested(self):
+        """New content and new ingestor versions both trigger re-ingestion."""
+        manifest = IngestionManifest(self.manifest_path)
+        self.assertEqual(manifest.changes({self.file_path: "2"})[0], [self.file_path])
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(" Estruturas condicionais.")
+        self.assertEqual(manifest.changes({self.file_path: "1"})[0], [self.file_path])
+
+    def test_touched_file_with_same_content_is_skipped(self):
+        """Only the mtime changed, so the hash matches and the new stat is recorded."""
+        stat = os.stat(self.file_path)
+        os.utime(self.file_path, (stat.st_atime + 10, stat.st_mtime + 10))
+        manifest = IngestionManifest(self.manifest_path)
+        self.assertEqual(manifest.changes({self.file_path: "1"})[0], [])
+        self.assertEqual(
+            manifest.entries[self.file_path]["last_modified"], stat.st_mtime + 10
+        )
+
+    def test_removed_and_unindexed_files(self):
+        """Missing files are reported as removed; files missing from the index are re-ingested."""
+        manifest = IngestionManifest(self.manifest_path)
+        self.assertEqual(manifest.changes({}), ([], [self.file_path]))
+        self.assertEqual(
+            manifest.changes({self.file_path: "1"}, indexed_paths=[]),
+            ([self.file_path], []),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
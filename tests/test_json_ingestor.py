@@ -0,0 +1,131 @@
+"""
+Unit tests for the JSON exercise bank ingestor to validate streaming and per-exercise records.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import spacy
+
+from adaptive_learning.indexing.index_manager import IndexManager
+from adaptive_learning.ingestion import json_ingestor, text_ingestor
+
+
+def make_exercise(number: int, correct: int = 1):
+    return {
+        "title": f"Questão {number}",
+        "position": number - 1,
+        "external_questionId": f"bank-{number}",
+        "content": {
+            "html": f"<p><strong>Sobre a instrução &lt;!DOCTYPE html&gt; ({number})</strong></p>",
+            "options": [
+                {
+                    "content": {"html": f"<p>Opção {i}</p>"},
+                    "feedback": {"html": "<p>A instrução indica o HTML5.</p>"},
+                    "correct": i == correct,
+                }
+                for i in range(3)
+            ],
+        },
+    }
+
+
+class TestJsonIngestor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bank_path = os.path.join(self.temp_dir.name, "bank.json")
+        bank = {
+            "name": "Criação de páginas web com HTML5",
+            "title": "Exercícios",
+            "content": [make_exercise(n) for n in range(1, 6)],
+            "category": "objective_exercise",
+        }
+        with open(self.bank_path, "w", encoding="utf-8") as f:
+            json.dump(bank, f, ensure_ascii=False, indent=1)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_items_are_streamed_across_small_chunks(self):
+        """Items and header fields decode correctly when values span read chunks."""
+        header = {}
+        items = list(
+            json_ingestor.iter_json_items(self.bank_path, header, chunk_size=7)
+        )
+        self.assertEqual([item["position"] for item in items], [0, 1, 2, 3, 4])
+        self.assertEqual(header["category"], "objective_exercise")
+        with open(self.bank_path, "w", encoding="utf-8") as f:
+            f.write("[1234567, 2.5e3, [true]]")
+        self.assertEqual(
+            list(json_ingestor.iter_json_items(self.bank_path, chunk_size=3)),
+            [1234567, 2500.0, [True]],
+        )
+
+    def test_bank_becomes_one_record_per_exercise(self):
+        """Each exercise is a resource with typed fields and plain-text content."""
+        resources = text_ingestor.ingest_text_file(self.bank_path)
+        self.assertEqual(len(resources), 5)
+        first = resources[0]
+        metadata = first["metadata"]
+        self.assertEqual(metadata["file_path"], f"{self.bank_path}#exercise=1")
+        self.assertEqual(metadata["parent_file_path"], self.bank_path)
+        self.assertEqual(metadata["name"], "Questão 1")
+        self.assertEqual(metadata["topic"], "Criação de páginas web com HTML5")
+        self.assertEqual(
+            metadata["description"], "Sobre a instrução <!DOCTYPE html> (1)"
+        )
+        self.assertIsNone(metadata["difficulty"])
+        self.assertEqual(
+            [option["correct"] for option in first["exercise"]["options"]],
+            [False, True, False],
+        )
+        self.assertIn("b) Opção 1", first["content"])
+        self.assertEqual(first["content"].count("A instrução indica o HTML5."), 1)
+
+    def test_other_json_is_ingested_as_one_document(self):
+        """JSON files without an array of exercises keep the single-document path."""
+        settings_path = os.path.join(self.temp_dir.name, "settings.json")
+        with open(settings_path, "w", encoding="utf-8") as f:
+            json.dump({"name": "settings", "tags": ["a", "b"]}, f)
+        self.assertIsNone(json_ingestor.ingest_exercise_bank(settings_path))
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        with mock.patch.object(text_ingestor, "_nlp", nlp):
+            resource = text_ingestor.ingest_text_file(settings_path)
+        self.assertEqual(resource["metadata"]["file_path"], settings_path)
+
+    def test_stray_items_are_skipped(self):
+        """An item that is not an exercise is skipped, keeping the exercises after it."""
+        with open(self.bank_path, "w", encoding="utf-8") as f:
+            json.dump([make_exercise(1), "stray", make_exercise(3)], f)
+        with mock.patch("builtins.print") as warn:
+            resources = list(json_ingestor.iter_exercise_resources(self.bank_path))
+        self.assertEqual(
+            [resource["metadata"]["name"] for resource in resources],
+            ["Questão 1", "Questão 3"],
+        )
+        self.assertIn("item 2", warn.call_args.args[0])
+
+    def test_exercise_banks_are_told_apart(self):
+        """Only arrays of exercise objects are exercise banks."""
+        self.assertTrue(json_ingestor.is_exercise_bank(self.bank_path))
+        other_path = os.path.join(self.temp_dir.name, "other.json")
+        for other in ({"name": "settings", "tags": ["a", "b"]}, ["a", "b"]):
+            with open(other_path, "w", encoding="utf-8") as f:
+                json.dump(other, f)
+            self.assertFalse(json_ingestor.is_exercise_bank(other_path))
+
+    def test_removing_a_bank_removes_its_exercises(self):
+        """Index entries of the exercises are removed with the bank's file path."""
+        index_manager = IndexManager(os.path.join(self.temp_dir.name, "index.json"))
+        index_manager.add_resources(text_ingestor.ingest_text_file(self.bank_path))
+        self.assertEqual(len(index_manager.get_all_resources()), 5)
+        index_manager.remove_resources([self.bank_path])
+        self.assertEqual(index_manager.get_all_resources(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for parallel ingestion to validate result ordering, timeouts and failures.
+"""
+
+import os
+import signal
+import time
+import unittest
+
+from adaptive_learning.ingestion.parallel import ingest_files_parallel
+
+
+def slow_ingest(file_path: str):
+    """Ingest a fake file, taking longer for earlier files so they finish last."""
+    delay = float(os.path.basename(file_path))
+    time.sleep(delay)
+    return {"metadata": {"file_path": file_path}, "content": str(delay)}
+
+
+def failing_ingest(file_path: str):
+    raise ValueError("corrupt file")
+
+
+def stuck_ingest(file_path: str):
+    """Hang like an ingestor stuck in C code, which signals cannot interrupt."""
+    if hasattr(signal, "pthread_sigmask"):
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(30)
+
+
+class SlowToLoadIngest:
+    """An ingestion function whose module takes a second to import in a worker."""
+
+    def __getstate__(self):
+        return {"load_time": 1.0}
+
+    def __setstate__(self, state):
+        time.sleep(state["load_time"])
+
+    def __call__(self, file_path: str):
+        return slow_ingest(file_path)
+
+
+class TestParallelIngestion(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        """Results come back in input order although later files finish first."""
+        tasks = [(f"/fake/{delay}", "pdf", slow_ingest) for delay in (0.3, 0.2, 0.0)]
+        results = list(ingest_files_parallel(tasks, max_workers=3))
+        self.assertEqual([path for path, _ in results], [t[0] for t in tasks])
+        self.assertEqual(results[0][1]["content"], "0.3")
+
+    def test_timeout_and_failures_do_not_stop_other_files(self):
+        """A file over the timeout or raising an error yields None."""
+        tasks = [
+            ("/fake/5", "video", slow_ingest),
+            ("/fake/broken", "text", failing_ingest),
+            ("/fake/0", "image", slow_ingest),
+        ]
+        start = time.monotonic()
+        results = dict(ingest_files_parallel(tasks, max_workers=2, timeout=0.5))
+        self.assertLess(time.monotonic() - start, 4)
+        self.assertIsNone(results["/fake/5"])
+        self.assertIsNone(results["/fake/broken"])
+        self.assertEqual(results["/fake/0"]["content"], "0.0")
+
+    def test_stuck_worker_is_killed_and_replaced(self):
+        """The parent enforces the timeout, also with a single worker."""
+        tasks = [("/fake/stuck", "pdf", stuck_ingest), ("/fake/0", "pdf", slow_ingest)]
+        start = time.monotonic()
+        results = list(ingest_files_parallel(tasks, max_workers=1, timeout=0.5))
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual([path for path, _ in results], ["/fake/stuck", "/fake/0"])
+        self.assertIsNone(results[0][1])
+        self.assertEqual(results[1][1]["content"], "0.0")
+
+    def test_timeout_starts_once_the_worker_has_loaded_the_task(self):
+        """Starting a worker and importing the ingestor do not count as ingesting."""
+        tasks = [("/fake/0", "pdf", SlowToLoadIngest())]
+        results = list(ingest_files_parallel(tasks, max_workers=1, timeout=0.5))
+        self.assertEqual(results[0][1]["content"], "0.0")
+
+    def test_type_limits_must_allow_a_file(self):
+        """A limit below one file would never let files of the type run."""
+        with self.assertRaises(ValueError):
+            ingest_files_parallel([], max_workers=2, type_limits={"video": 0})
+
+    def test_single_worker_runs_inline(self):
+        """With one worker, files are ingested in the calling process."""
+        results = list(ingest_files_parallel([("/fake/0", "text", slow_ingest)], 1))
+        self.assertEqual(results[0][1]["metadata"]["file_path"], "/fake/0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Unit tests for the PDF ingestor to validate single-pass extraction and page fallback.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import PyPDF2
+
+from adaptive_learning.ingestion.cache import PageCache
+from adaptive_learning.ingestion.pdf_ingestor import (
+    build_page_records,
+    extract_pdf_pages,
+    extract_pdf_pages_parallel,
+    ingest_pdf_file,
+    ingest_pdf_pages,
+    ocr_pdf_pages,
+    split_pdf_resource,
+)
+
+SAMPLE_PDF = os.path.join(
+    os.path.dirname(__file__), "..", "resources", "Capítulo do Livro.pdf"
+)
+
+
+class TestPdfIngestor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch(
+            "adaptive_learning.ingestion.cache.DEFAULT_CACHE_DIR", self.temp_dir.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @unittest.skipUnless(os.path.exists(SAMPLE_PDF), "sample PDF not available")
+    def test_ingest_reports_pages_and_timings(self):
+        """Metadata, page count and per-page timings come from the same pass."""
+        resource = ingest_pdf_file(SAMPLE_PDF, page_workers=1)
+        metadata = resource["metadata"]
+        self.assertEqual(metadata["title"], "Capítulo do Livro")
+        self.assertEqual(len(metadata["page_timings"]), metadata["page_count"])
+        self.assertEqual(resource["content"].count("\f"), metadata["page_count"])
+        self.assertLessEqual(
+            {t["extractor"] for t in metadata["page_timings"]}, {"pdfminer", "pypdf2"}
+        )
+
+    @unittest.skipUnless(os.path.exists(SAMPLE_PDF), "sample PDF not available")
+    def test_pages_are_ingested_as_their_own_resources(self):
+        """Each page is a resource linked to the document and carrying its metadata."""
+        document, *pages = ingest_pdf_pages(SAMPLE_PDF, page_workers=1)
+        self.assertEqual(document["metadata"]["file_path"], SAMPLE_PDF)
+        metadata = pages[0]["metadata"]
+        self.assertEqual(metadata["file_path"], f"{SAMPLE_PDF}#page=1")
+        self.assertEqual(metadata["parent_file_path"], SAMPLE_PDF)
+        self.assertEqual(metadata["title"], "Capítulo do Livro")
+        self.assertNotIn("page_timings", metadata)
+        self.assertEqual(
+            [page["metadata"]["page"] for page in pages],
+            list(range(1, len(pages) + 1)),
+        )
+
+    @unittest.skipUnless(os.path.exists(SAMPLE_PDF), "sample PDF not available")
+    def test_sharded_extraction_matches_serial_and_is_cached(self):
+        """Page ranges extracted by several workers are reassembled in page order."""
+        serial = extract_pdf_pages(SAMPLE_PDF)
+        cache = PageCache()
+        _, pages = extract_pdf_pages_parallel(SAMPLE_PDF, max_workers=2, cache=cache)
+        self.assertEqual([p["text"] for p in pages], [p["text"] for p in serial])
+        _, cached = extract_pdf_pages_parallel(SAMPLE_PDF, max_workers=2, cache=cache)
+        self.assertTrue(all(page["cached"] for page in cached))
+        self.assertEqual([p["text"] for p in cached], [p["text"] for p in serial])
+
+    def test_pages_without_text_use_the_fallback(self):
+        """Pages pdfminer yields no text for are extracted with PyPDF2."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "blank.pdf")
+            writer = PyPDF2.PdfWriter()
+            writer.add_blank_page(width=200, height=200)
+            writer.add_blank_page(width=200, height=200)
+            with open(file_path, "wb") as f:
+                writer.write(f)
+            pages = extract_pdf_pages(file_path)
+        self.assertEqual([page["text"] for page in pages], ["", ""])
+        self.assertEqual([page["extractor"] for page in pages], ["pypdf2", "pypdf2"])
+
+    def test_ocr_resumes_from_cached_pages(self):
+        """Recognized pages are cached one by one; failed pages are retried."""
+        calls = []
+
+        def fake_ocr(file_path, page_number, dpi):
+            calls.append(page_number)
+            if page_number == 2 and calls.count(2) == 1:
+                raise RuntimeError("interrupted")
+            return {"page": page_number, "text": f"página {page_number}"}
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as scan, mock.patch(
+            "adaptive_learning.ingestion.pdf_ingestor.ocr_pdf_page", fake_ocr
+        ):
+            cache = PageCache()
+            first = ocr_pdf_pages(scan.name, 3, max_workers=1, cache=cache)
+            second = ocr_pdf_pages(scan.name, 3, max_workers=1, cache=cache)
+        self.assertEqual([p["text"] for p in first], ["página 1", "", "página 3"])
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(
+            [p["text"] for p in second], ["página 1", "página 2", "página 3"]
+        )
+
+    def test_page_and_section_records_point_into_content(self):
+        """Pages and sections are offsets into the content, headers are not headings."""
+        content, pages, sections = build_page_records(
+            [
+                "Manual HTML\n\nIntrodução\n\nTexto da introdução.\n",
+                "Manual HTML\n\n2 Listas e tabelas\n\nTexto das listas.\n",
+                "Manual HTML\n\ncontinuação das listas.\n",
+            ]
+        )
+        self.assertEqual(content.count("\f"), 3)
+        self.assertEqual(
+            [p["heading"] for p in pages], ["Introdução", "2 Listas e tabelas", None]
+        )
+        self.assertEqual([s["page"] for s in sections], [1, 2])
+        second = content[sections[1]["start"] : sections[1]["end"]]
+        self.assertTrue(second.startswith("2 Listas e tabelas"))
+        self.assertIn("continuação das listas.", second)
+
+        resource = {
+            "metadata": {
+                "file_name": "m.pdf",
+                "file_path": "m.pdf",
+                "file_type": ".pdf",
+            },
+            "content": content,
+            "pages": pages,
+            "sections": sections,
+        }
+        document, *children = split_pdf_resource(resource)
+        self.assertEqual(children[1]["metadata"]["file_path"], "m.pdf#page=2")
+        self.assertEqual(children[1]["metadata"]["parent_file_path"], "m.pdf")
+        self.assertNotIn("\f", children[1]["content"])
+
+        # Sections are kept by the document and point into the content of their page
+        self.assertEqual(document["metadata"]["file_path"], "m.pdf")
+        self.assertEqual(document["content"], "Introdução\n2 Listas e tabelas")
+        section = document["sections"][1]
+        self.assertEqual(section["page"], 2)
+        page = children[section["page"] - 1]["content"]
+        self.assertTrue(page[section["start"] :].startswith("2 Listas e tabelas"))
+
+
+if __name__ == "__main__":
+    unittest.main()
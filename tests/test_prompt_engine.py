@@ -51,6 +51,14 @@ class TestPromptEngine(unittest.TestCase):
         )
         logger.info("Test for advanced knowledge gap assessment passed.")
 
+    def test_assess_user_knowledge_misspelled(self):
+        """Test that unaccented and misspelled topic words are still recognized."""
+        gaps = self.engine.assess_user_knowledge("como usar uma funcao?")
+        self.assertIn("functions", gaps)
+        gaps = self.engine.assess_user_knowledge("heranca de classes")
+        self.assertIn("oop", gaps)
+        logger.info("Test for misspelled knowledge gap assessment passed.")
+
     def test_generate_prompt_basic(self):
         """Test prompt generation for basic knowledge gaps."""
         self.engine.user_context["knowledge_gaps"] = ["programming_basics"]
@@ -88,6 +96,19 @@ class TestPromptEngine(unittest.TestCase):
         )
         logger.info("Test for full user interaction passed.")
 
+    def test_retrieved_content_is_the_window_matching_the_topic(self):
+        """Only the part of a long document about the topic is passed on."""
+        resource = {
+            "metadata": {"file_name": "apostila.txt", "file_type": ".txt"},
+            "content": "Introdução geral ao curso. " * 200
+            + "Funções agrupam instruções reutilizáveis. "
+            + "Exercícios finais. " * 200,
+        }
+        content = self.engine._content_from_resource(resource, "funções")
+        self.assertLessEqual(len(content["content"]), 1000)
+        self.assertIn("Funções agrupam instruções", content["content"])
+        logger.info("Test for topic-focused content retrieval passed.")
+
     def test_update_learning_preference(self):
         """Test updating user learning preference."""
         self.engine.update_learning_preference("video")
@@ -0,0 +1,94 @@
+"""
+Unit tests for the text ingestor to validate batched spaCy analysis.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import spacy
+
+from adaptive_learning.ingestion import text_ingestor
+
+
+class TestTextIngestor(unittest.TestCase):
+    def setUp(self):
+        """Use a blank English pipeline with sentence boundaries as the spaCy model."""
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("sentencizer")
+        ruler = self.nlp.add_pipe("attribute_ruler")
+        for word in ("recursão", "código"):
+            ruler.add([[{"LOWER": word}]], {"POS": "NOUN"})
+        self.nlp.add_pipe("entity_ruler").add_patterns(
+            [{"label": "LANGUAGE", "pattern": "Python"}]
+        )
+        patcher = mock.patch.object(text_ingestor, "_nlp", self.nlp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_contents_are_analyzed_in_one_batched_parse(self):
+        """All texts go through a single nlp.pipe call and keep their order."""
+        long_text = "Loops repeat code. Functions group code. Classes model data. " * 10
+        with mock.patch.object(self.nlp, "pipe", wraps=self.nlp.pipe) as pipe:
+            results = text_ingestor.process_text_contents(
+                [long_text, "Short text."], batch_size=8
+            )
+        # Language.pipe calls itself once more to unpack the (text, context) tuples
+        batched_calls = [c for c in pipe.call_args_list if c.kwargs.get("as_tuples")]
+        self.assertEqual(len(batched_calls), 1)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            results[0]["metadata"]["summary"],
+            "Loops repeat code. Functions group code. Classes model data.",
+        )
+        self.assertEqual(results[1]["metadata"]["token_count"], 3)
+        self.assertEqual(results[1]["metadata"]["summary"], "Short text.")
+
+    def test_long_texts_are_analyzed_in_full(self):
+        """Statistics are merged over every chunk, not just the opening."""
+        spread = "O código em Python roda. " * 4
+        content = "\n\n".join([spread, spread, spread + "recursão " * 8 + "Python"])
+        result = text_ingestor.process_text_contents(
+            [content], n_process=1, chunk_size=150
+        )[0]["metadata"]
+        self.assertEqual(result["chunk_count"], 4)
+        self.assertEqual(result["token_count"], 3 * 4 * 6 + 9)
+        # The topic runs through every chunk; it is not outranked by a rarer term that
+        # concentrates in one chunk
+        self.assertEqual(result["keywords"], ["código", "recursão"])
+        self.assertEqual(result["entities"], [("Python", "LANGUAGE")])
+
+    def test_chunks_analyzed_in_worker_processes_merge_in_order(self):
+        """Pooled analysis gives the statistics of a single-process parse."""
+        spread = "O código em Python roda. " * 4
+        contents = [
+            "\n\n".join([spread, spread + "recursão " * 8 + "Python"] * 3),
+            "Recursão em Python. " * 30,
+        ]
+        expected = text_ingestor.process_text_contents(
+            contents, batch_size=2, n_process=1, chunk_size=150
+        )
+        pool_class = mock.Mock(
+            side_effect=lambda mp_context, initializer, **kwargs: ThreadPoolExecutor(
+                **kwargs
+            )
+        )
+        with mock.patch.object(text_ingestor, "ProcessPoolExecutor", pool_class):
+            results = text_ingestor.process_text_contents(
+                contents, batch_size=2, n_process=3, chunk_size=150
+            )
+        self.assertIsNotNone(pool_class.call_args.kwargs["mp_context"])
+        self.assertEqual(results, expected)
+        self.assertGreater(results[0]["metadata"]["chunk_count"], 2 * 3)
+
+    def test_split_into_chunks_keeps_all_text(self):
+        """Chunks end at boundaries and reassemble into the original text."""
+        content = "Primeira frase. Segunda frase.\n\nOutro parágrafo aqui. " * 20
+        chunks = list(text_ingestor.split_into_chunks(content, 100))
+        self.assertEqual("".join(chunks), content)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertTrue(all(chunk.endswith((" ", "\n")) for chunk in chunks[:-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+"""
+Unit tests for the transcription service to validate model caching, recognizer reuse,
+segmented transcription and the stored transcript format.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+from adaptive_learning.ingestion import transcription
+from adaptive_learning.ingestion.transcript import build_transcript, words_between
+from adaptive_learning.ingestion.transcription import (
+    TranscriptionService,
+    decode_audio_pcm,
+    iter_audio_segments,
+    resolve_model_path,
+)
+
+
+def tone(seconds: float, amplitude: int = 3000) -> bytes:
+    """16 kHz mono PCM of a 440 Hz tone (amplitude 0 gives silence)."""
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+class FakeRecognizer:
+    """Recognizes one word per accepted block of audio."""
+
+    def __init__(self, model, sample_rate):
+        self.position = 0.0
+
+    def SetWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, data):
+        self.position += len(data) / 2 / 16000
+        return True
+
+    def Result(self):
+        word = {"word": "olá", "start": self.position - 0.1, "end": self.position}
+        return json.dumps({"text": "olá", "result": [word]})
+
+    def FinalResult(self):
+        return json.dumps({"text": ""})
+
+    def Reset(self):
+        self.position = 0.0
+
+
+class TestTranscriptionService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.temp_dir.name, "model")
+        os.makedirs(self.model_dir)
+        self.audio_path = os.path.join(self.temp_dir.name, "audio.wav")
+        with wave.open(self.audio_path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\0\0" * 6000)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def transcribe(self, service):
+        with wave.open(self.audio_path, "rb") as wf:
+            return service.transcribe_wav(wf)
+
+    def test_model_is_loaded_once_and_recognizers_are_reused(self):
+        """Several files share one model load and one recognizer."""
+        service = TranscriptionService(self.model_dir)
+        with mock.patch("vosk.Model") as model, mock.patch(
+            "vosk.KaldiRecognizer", side_effect=FakeRecognizer
+        ) as recognizer:
+            first = self.transcribe(service)
+            second = self.transcribe(service)
+        self.assertEqual(model.call_count, 1)
+        self.assertEqual(recognizer.call_count, 1)
+        # The reused recognizer was reset, so timestamps restart at zero
+        self.assertEqual(first, second)
+        words, text = first
+        self.assertEqual(len(words), 2)
+        self.assertAlmostEqual(words[0]["start"], 0.15)
+        self.assertEqual(text, "olá olá")
+
+    def test_audio_is_decoded_to_16khz_mono_on_a_pipe(self):
+        """A stereo 44.1 kHz file is decoded to 16 kHz mono blocks and transcribed."""
+        stereo_path = os.path.join(self.temp_dir.name, "stereo.wav")
+        with wave.open(stereo_path, "wb") as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(44100)
+            wf.writeframes(b"\0\0\0\0" * 44100)
+        blocks = list(decode_audio_pcm(stereo_path, frames_per_read=4000))
+        self.assertEqual(sum(len(block) for block in blocks), 16000 * 2)
+        self.assertEqual(len(blocks[0]), 8000)
+
+        service = TranscriptionService(self.model_dir)
+        with mock.patch("vosk.Model"), mock.patch(
+            "vosk.KaldiRecognizer", side_effect=FakeRecognizer
+        ):
+            words, _ = service.transcribe_file(stereo_path)
+        self.assertEqual(len(words), 4)
+
+    def test_long_audio_is_cut_in_silences(self):
+        """Segments end in the silences and together cover the whole audio."""
+        pcm = tone(1.2) + tone(0.5, 0) + tone(1.0) + tone(0.4, 0) + tone(0.9)
+        blocks = [pcm[i : i + 8000] for i in range(0, len(pcm), 8000)]
+        segments = list(
+            iter_audio_segments(blocks, segment_seconds=1.0, max_segment_seconds=2.0)
+        )
+        self.assertEqual(b"".join(segment for _, segment in segments), pcm)
+        self.assertEqual(len(segments), 3)
+        self.assertAlmostEqual(segments[1][0], 1.45, delta=0.05)
+        self.assertAlmostEqual(segments[2][0], 2.9, delta=0.05)
+
+    def test_parallel_segments_keep_absolute_timestamps(self):
+        """Segment words get absolute timestamps; the pool is kept for later videos."""
+        audio_path = os.path.join(self.temp_dir.name, "lecture.wav")
+        with wave.open(audio_path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(tone(1.2) + tone(0.5, 0) + tone(1.0))
+        self.addCleanup(transcription.shutdown_segment_pools)
+        pool_class = mock.Mock(
+            side_effect=lambda mp_context, **kwargs: ThreadPoolExecutor(**kwargs)
+        )
+        with mock.patch("vosk.Model"), mock.patch(
+            "vosk.KaldiRecognizer", side_effect=FakeRecognizer
+        ), mock.patch.multiple(
+            transcription,
+            ProcessPoolExecutor=pool_class,
+            SEGMENT_SECONDS=1.0,
+            MAX_SEGMENT_SECONDS=2.0,
+        ):
+            for _ in range(2):
+                words, _ = transcription.transcribe_media(
+                    audio_path, max_workers=2, model_path=self.model_dir
+                )
+        starts = [word["start"] for word in words]
+        self.assertEqual(starts, sorted(starts))
+        # Without the offset of the second segment, its last word would start at ~1.2 s
+        self.assertGreater(starts[-1], 2.4)
+        # Later videos reuse the workers, which loaded the model when they started
+        pool_class.assert_called_once()
+        self.assertIs(
+            pool_class.call_args.kwargs["initializer"],
+            transcription._load_segment_model,
+        )
+        self.assertIsNotNone(pool_class.call_args.kwargs["mp_context"])
+
+    def test_undecodable_audio_raises(self):
+        """ffmpeg errors surface instead of producing an empty transcript."""
+        broken_path = os.path.join(self.temp_dir.name, "broken.mp4")
+        with open(broken_path, "wb") as f:
+            f.write(b"not a video")
+        with self.assertRaises(RuntimeError):
+            list(decode_audio_pcm(broken_path))
+
+    def test_verbose_ffmpeg_output_does_not_stall_decoding(self):
+        """More error output than a pipe holds is drained while samples are read."""
+        noisy_path = os.path.join(self.temp_dir.name, "noisy-ffmpeg")
+        with open(noisy_path, "w") as f:
+            f.write(
+                "#!/bin/sh\n"
+                "head -c 1000000 /dev/zero | tr '\\0' 'x' >&2\n"
+                "head -c 32000 /dev/zero\n"
+            )
+        os.chmod(noisy_path, 0o755)
+        with mock.patch.object(
+            transcription, "ffmpeg_executable", return_value=noisy_path
+        ):
+            blocks = list(decode_audio_pcm("lecture.mp4"))
+        self.assertEqual(sum(len(block) for block in blocks), 32000)
+
+    def test_first_existing_configured_model_is_selected(self):
+        """Model candidates are tried in the configured order."""
+        missing = os.path.join(self.temp_dir.name, "large-model")
+        self.assertEqual(
+            resolve_model_path(os.pathsep.join([missing, self.model_dir])),
+            self.model_dir,
+        )
+        with self.assertRaises(FileNotFoundError):
+            resolve_model_path(missing)
+
+
+class TestTranscript(unittest.TestCase):
+    def test_words_are_stored_as_columns_with_phrase_text(self):
+        """Repeated words share a vocabulary id and pauses start new phrases."""
+        words = [
+            {"word": "o", "start": 0.0, "end": 0.1},
+            {"word": "laço", "start": 0.12, "end": 0.5},
+            {"word": "while", "start": 2.0, "end": 2.3},
+            {"word": "o", "start": 2.31, "end": 2.4},
+        ]
+        content, columns, phrases = build_transcript(words)
+        self.assertEqual(content, "o laço\nwhile o")
+        self.assertEqual(columns["vocabulary"], ["o", "laço", "while"])
+        self.assertEqual(columns["ids"], [0, 1, 2, 0])
+        self.assertEqual(columns["starts"], [0, 12, 200, 231])
+        self.assertEqual(
+            [(p["start"], p["end"], p["word"], p["time_start"]) for p in phrases],
+            [(0, 6, 0, 0.0), (7, 14, 2, 2.0)],
+        )
+        self.assertEqual(
+            [w["word"] for w in words_between(columns, 0.1, 2.0)], ["laço", "while"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()